@@ -0,0 +1,197 @@
+"""
+bytecode.py — Compact postfix encoding of network ASTs and library files
+
+An AST is encoded as postfix bytecode with one byte per opcode: each
+element is pushed, and each operator pops its operands (two for series and
+parallel, five for a bridge, in the order a, b, c, d, e). The encoding is
+lossless: `decode_ast(encode_ast(ast)) == ast`.
+
+A library file holds many encoded networks followed by an offset index, so
+that any network can be read straight out of a memory-mapped file without
+deserialising the rest:
+
+    magic | code 0 | code 1 | ... | offsets (count + 1) | index start | count
+
+Offsets and the two trailing fields are little-endian unsigned 64-bit
+integers; offsets are measured from the start of the file.
+"""
+
+import mmap
+import struct
+import weakref
+from array import array
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+OP_R, OP_L, OP_C, OP_SERIES, OP_PARALLEL, OP_BRIDGE = range(1, 7)
+
+OPCODES = {'R': OP_R, 'L': OP_L, 'C': OP_C, '+': OP_SERIES,
+           '|': OP_PARALLEL, '/': OP_BRIDGE}
+ATOMS = {OP_R: 'R', OP_L: 'L', OP_C: 'C'}
+
+MAGIC = b'PYNNTTL1'
+FOOTER = struct.Struct('<QQ')
+OFFSET = struct.Struct('<Q')
+
+
+def encode_ast(expr: Any) -> bytes:
+    """
+    Encodes a network descriptor (AST) as postfix bytecode.
+
+    Raises:
+        ValueError: If an unrecognized structure is encountered.
+    """
+    code = bytearray()
+    # Entries are subtrees to visit, or opcodes to emit once they are done
+    stack: list[Any] = [expr]
+    while stack:
+        e = stack.pop()
+        if isinstance(e, int):
+            code.append(e)
+        elif isinstance(e, str) and e in ATOMS.values():
+            code.append(OPCODES[e])
+        elif isinstance(e, tuple) and len(e) == 3 and e[0] in ('+', '|'):
+            stack.extend((OPCODES[e[0]], e[2], e[1]))
+        elif isinstance(e, tuple) and len(e) == 4 and e[0] == '/':
+            (_, a, b), (_, c, d), x = e[1], e[2], e[3]
+            stack.extend((OP_BRIDGE, x, d, c, b, a))
+        else:
+            raise ValueError(f"Unrecognized structure: {e}")
+    return bytes(code)
+
+
+def decode_ast(code: bytes | memoryview) -> Any:
+    """
+    Decodes postfix bytecode back into a network descriptor (AST).
+
+    Raises:
+        ValueError: If the bytecode is malformed.
+    """
+    stack: list[Any] = []
+    for op in bytes(code):
+        if op in ATOMS:
+            stack.append(ATOMS[op])
+        elif op in (OP_SERIES, OP_PARALLEL):
+            if len(stack) < 2:
+                raise ValueError("Malformed bytecode: operator underflow")
+            rhs = stack.pop()
+            lhs = stack.pop()
+            stack.append(('+' if op == OP_SERIES else '|', lhs, rhs))
+        elif op == OP_BRIDGE:
+            if len(stack) < 5:
+                raise ValueError("Malformed bytecode: operator underflow")
+            a, b, c, d, x = stack[-5:]
+            del stack[-5:]
+            stack.append(('/', ('&', a, b), ('&', c, d), x))
+        else:
+            raise ValueError(f"Malformed bytecode: unknown opcode {op}")
+    if len(stack) != 1:
+        raise ValueError("Malformed bytecode: expected a single network")
+    return stack[0]
+
+
+def write_library(path: str | Path, asts: Iterable[Any]) -> int:
+    """
+    Writes networks to a library file, returning the number written.
+
+    The networks are encoded and written as they are read from asts, so
+    only the offset index is held in memory.
+    """
+    offsets = array('Q')
+    with open(path, 'wb') as f:
+        f.write(MAGIC)
+        position = len(MAGIC)
+        for ast in asts:
+            code = encode_ast(ast)
+            offsets.append(position)
+            f.write(code)
+            position += len(code)
+        offsets.append(position)
+        for offset in offsets:
+            f.write(OFFSET.pack(offset))
+        f.write(FOOTER.pack(position, len(offsets) - 1))
+    return len(offsets) - 1
+
+
+class NetworkLibrary:
+    """
+    Read-only, memory-mapped view of a library file.
+
+    Indexing returns decoded ASTs; `code` returns a zero-copy view of the
+    bytecode. Worker processes that open the same file share its pages.
+    Closing the library releases every view it handed out, so those must
+    be copied (`bytes(view)`) to outlive it.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self._file = open(self.path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0,
+                                  access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"Not a network library: {self.path}")
+        self._view = memoryview(self._map)
+        # Keyed by id: read-only memoryviews hash (and compare) by content
+        self._views: weakref.WeakValueDictionary[int, memoryview] = \
+            weakref.WeakValueDictionary()
+        size = len(self._map)
+        if size < len(MAGIC) + OFFSET.size + FOOTER.size or \
+           self._map[:len(MAGIC)] != MAGIC:
+            self.close()
+            raise ValueError(f"Not a network library: {self.path}")
+        self._index, self._count = FOOTER.unpack_from(
+            self._map, size - FOOTER.size)
+
+    def __enter__(self) -> 'NetworkLibrary':
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _offset(self, i: int) -> int:
+        return OFFSET.unpack_from(self._map,
+                                  self._index + i * OFFSET.size)[0]
+
+    def code(self, i: int) -> memoryview:
+        """Returns a zero-copy view of the bytecode of network i."""
+        if not -self._count <= i < self._count:
+            raise IndexError("Network library index out of range")
+        i %= self._count
+        view = self._view[self._offset(i):self._offset(i + 1)]
+        self._views[id(view)] = view
+        return view
+
+    def __getitem__(self, i: int) -> Any:
+        return decode_ast(self.code(i))
+
+    def __iter__(self) -> Iterator[Any]:
+        for i in range(self._count):
+            yield self[i]
+
+    def iter_codes(self) -> Iterator[memoryview]:
+        """Yields zero-copy views of the bytecode of every network."""
+        start = self._offset(0) if self._count else 0
+        for i in range(1, self._count + 1):
+            end = self._offset(i)
+            view = self._view[start:end]
+            self._views[id(view)] = view
+            yield view
+            start = end
+
+    def close(self) -> None:
+        """
+        Releases the views handed out and the memory map, and closes the
+        file.
+        """
+        try:
+            for view in list(self._views.values()):
+                view.release()
+            self._view.release()
+            self._map.close()
+        finally:
+            self._file.close()
@@ -0,0 +1,151 @@
+"""
+cache.py — Hash-consed subtree impedance cache
+
+Catalogue entries share many substructures, such as `(R|C)`, `(L+R)` or
+whole bridge arms. `ImpedanceCache` memoises the impedance of each subtree
+by its canonical structural form, so that structurally equivalent subtrees
+in any row of a catalogue are evaluated once. Each entry keeps the symbols
+of its leaves in canonical leaf order, and a hit renumbers them into the
+symbols `eval_impedance` would have allocated at that point of the caller's
+tree.
+
+Two-port descriptors are folded into one-port combinations of their arms
+as `eval_impedance` does; the arms are cached, the two-ports themselves
+are not.
+"""
+
+import sympy as sp
+from collections import OrderedDict
+from typing import Any
+from pynntt import hooks
+from pynntt.canonical import canonical_leaf_orders
+from pynntt.networks import (TWOPORT_OPS, is_atomic, combine_series,
+                             combine_parallel, combine_bridge, s)
+
+
+# An impedance and the symbols of its leaves in canonical leaf order
+Entry = tuple[sp.Expr, tuple[sp.Symbol, ...]]
+
+
+class ImpedanceCache:
+    """
+    Bounded LRU memo of subtree impedances keyed by canonical descriptor.
+    """
+
+    def __init__(self, maxsize: int = 4096):
+        if maxsize < 1:
+            raise ValueError("Cache size must be at least 1")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, Entry] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Entry | None:
+        """Returns the cached entry for a key, recording a hit or miss."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key: str, entry: Entry) -> None:
+        """Stores an entry, evicting the least recently used one."""
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Removes all entries and resets the statistics."""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> dict[str, Any]:
+        """Returns hit/miss statistics for the cache."""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'size': len(self._entries),
+            'maxsize': self.maxsize,
+        }
+
+
+def _symbol(label: str, index: int) -> sp.Symbol:
+    return sp.Symbol(f"{label}{index}", positive=True)
+
+
+@hooks.stage
+def eval_impedance_cached(expr: Any, cache: ImpedanceCache) -> sp.Expr:
+    """
+    Evaluates a network descriptor (AST) reusing cached subtree impedances.
+
+    The result is equal to `eval_impedance(expr)`, with the same symbol
+    numbering.
+
+    Args:
+        expr: The network descriptor (AST).
+        cache: The cache to consult and fill.
+
+    Returns:
+        A SymPy expression representing the impedance.
+
+    Raises:
+        ValueError: If an unrecognized structure is encountered.
+    """
+    counter = {'R': 0, 'L': 0, 'C': 0}
+    # Keys of subtrees, each built from those of its children
+    leaf_order = canonical_leaf_orders()
+
+    def eval_recursive(e: Any) -> sp.Expr:
+        if is_atomic(e):
+            counter[e] += 1
+            sym = _symbol(e, counter[e])
+            if e == 'R':
+                return sym
+            if e == 'L':
+                return sym * s
+            return 1 / (sym * s)
+
+        if isinstance(e, tuple) and e and e[0] in TWOPORT_OPS:
+            from pynntt.twoport import fold_impedance
+            return sp.sympify(fold_impedance(
+                e, eval_recursive, combine_series, combine_parallel))
+
+        key, leaves = leaf_order(e)
+        syms = tuple(_symbol(label, counter[label] + i)
+                     for label, i in leaves)
+        entry = cache.get(key)
+        if entry is not None:
+            for label, _ in leaves:
+                counter[label] += 1
+            Z, cached_syms = entry
+            if cached_syms == syms:
+                return Z
+            return Z.xreplace(dict(zip(cached_syms, syms)))
+
+        op, *args = e
+        if op == '+':
+            Z = combine_series(eval_recursive(args[0]),
+                               eval_recursive(args[1]))
+        elif op == '|':
+            Z = combine_parallel(eval_recursive(args[0]),
+                                 eval_recursive(args[1]))
+        else:
+            za = eval_recursive(args[0][1])
+            zb = eval_recursive(args[0][2])
+            zc = eval_recursive(args[1][1])
+            zd = eval_recursive(args[1][2])
+            ze = eval_recursive(args[2])
+            Z = combine_bridge(za, zb, zc, zd, ze)
+        cache.put(key, (Z, syms))
+        return Z
+
+    return eval_recursive(expr)
@@ -0,0 +1,225 @@
+"""
+canonical.py — Structural canonicalisation and hashing of network ASTs
+
+Two descriptors denote the same network structure when they differ only by
+the order of series or parallel operands, the grouping of associative
+chains, or one of the symmetric orderings of a bridge's arms. The canonical
+AST removes these differences without any symbolic evaluation, and is the
+same form in which `pynntt.enumeration` produces networks.
+"""
+
+import hashlib
+from typing import Any, Callable, Iterable, Iterator
+from pynntt.networks import is_atomic
+
+
+def bridge_orderings(a: Any, b: Any, c: Any, d: Any) -> list[tuple]:
+    """
+    Lists the four arm orderings (a, b, c, d) describing the same bridge.
+
+    These are the identity, swapping the two arms, reversing the ports, and
+    both together.
+    """
+    return [(a, b, c, d), (c, d, a, b), (b, a, d, c), (d, c, b, a)]
+
+
+def wrap_descriptor(expr: Any, desc: str) -> str:
+    """
+    Parenthesises the descriptor of a series or parallel operand if needed.
+    """
+    if isinstance(expr, tuple) and expr[0] != '/':
+        return f"({desc})"
+    return desc
+
+
+Leaves = list[tuple[str, int]]
+
+
+def _shift(leaves: Leaves, offsets: dict[str, int]) -> Leaves:
+    # Renumber a subtree's leaves after those of the operands before it
+    shifted = [(label, i + offsets[label]) for label, i in leaves]
+    for label, _ in leaves:
+        offsets[label] += 1
+    return shifted
+
+
+def _chain(op: str, operands: list[tuple[Any, str, Leaves]]
+           ) -> tuple[Any, str, Leaves]:
+    # Canonical form of a flattened series or parallel chain, from the
+    # canonical forms of its operands in their original order
+    offsets = {'R': 0, 'L': 0, 'C': 0}
+    shifted = [(x, d, _shift(leaves, offsets)) for x, d, leaves in operands]
+    shifted.sort(key=lambda item: item[1])
+    ast = shifted[0][0]
+    for item in shifted[1:]:
+        ast = (op, ast, item[0])
+    desc = op.join(wrap_descriptor(x, d) for x, d, _ in shifted)
+    return ast, desc, [leaf for item in shifted for leaf in item[2]]
+
+
+def _bridge(arms: list[tuple[Any, str, Leaves]]) -> tuple[Any, str, Leaves]:
+    # Canonical form of a bridge, from the canonical forms of its arms
+    # a, b, c, d and e
+    offsets = {'R': 0, 'L': 0, 'C': 0}
+    arms = [(x, d, _shift(leaves, offsets)) for x, d, leaves in arms]
+    a, b, c, d = min(bridge_orderings(*arms[:4]),
+                     key=lambda o: tuple(item[1] for item in o))
+    x = arms[4]
+    ast = ('/', ('&', a[0], b[0]), ('&', c[0], d[0]), x[0])
+    desc = f"<({a[1]}&{b[1]})@({c[1]}&{d[1]})/{x[1]}>"
+    leaves = [leaf for item in (a, b, c, d, x) for leaf in item[2]]
+    return ast, desc, leaves
+
+
+def _bridge_arms(e: tuple) -> tuple[Any, Any, Any, Any, Any]:
+    return e[1][1], e[1][2], e[2][1], e[2][2], e[3]
+
+
+def _canonical(e: Any) -> tuple[Any, str, Leaves]:
+    # Returns the canonical AST, its descriptor, and its leaves in canonical
+    # order, each numbered by its position among same-label leaves in e
+    if is_atomic(e):
+        return e, e, [(e, 1)]
+
+    if isinstance(e, tuple) and e:
+        op = e[0]
+        if op in ('+', '|') and len(e) == 3:
+            # Flatten the associative chain rooted here
+            operands, stack = [], [e]
+            while stack:
+                x = stack.pop()
+                if isinstance(x, tuple) and x and x[0] == op and len(x) == 3:
+                    stack.append(x[2])
+                    stack.append(x[1])
+                else:
+                    operands.append(_canonical(x))
+            return _chain(op, operands)
+        elif op == '/' and len(e) == 4:
+            return _bridge([_canonical(x) for x in _bridge_arms(e)])
+
+    raise ValueError(f"Unrecognized structure: {e}")
+
+
+def canonical_ast(expr: Any) -> Any:
+    """
+    Converts a network descriptor (AST) into its canonical structural form.
+
+    Series and parallel chains are flattened, their operands sorted by
+    canonical descriptor string and folded left; each bridge takes the
+    smallest of its four equivalent arm orderings.
+
+    Args:
+        expr: The network descriptor (AST).
+
+    Returns:
+        The canonical AST, which `eval_impedance` and `format_descriptor`
+        accept like any other.
+
+    Raises:
+        ValueError: If an unrecognized structure is encountered.
+    """
+    return _canonical(expr)[0]
+
+
+def canonical_descriptor(expr: Any) -> str:
+    """
+    Formats the canonical structural form of a network (AST) as a string.
+    """
+    return _canonical(expr)[1]
+
+
+def canonical_leaf_order(expr: Any) -> tuple[str, Leaves]:
+    """
+    Relates the leaves of a network (AST) to those of its canonical form.
+
+    Returns:
+        The canonical descriptor, and for each leaf of the canonical AST in
+        `eval_impedance` order, a (label, index) pair giving the leaf of
+        `expr` it came from; index counts leaves with the same label in
+        `expr` from 1, so 'R', 3 is the leaf `eval_impedance` calls R3.
+    """
+    _, desc, leaves = _canonical(expr)
+    return desc, leaves
+
+
+def canonical_leaf_orders() -> Callable[[Any], tuple[str, Leaves]]:
+    """
+    Returns a memoised `canonical_leaf_order` for the subtrees of a network.
+
+    The result for each subtree is built from those of its children, so
+    calling it on every node of a tree, as `pynntt.cache` does, takes time
+    about linear in the size of the tree rather than quadratic. Results
+    are memoised by node identity: use one function per AST, while the AST
+    is alive.
+    """
+    # id(node) -> (canonical form, operands of its flattened chain or None)
+    memo: dict[int, tuple[tuple[Any, str, Leaves], list | None]] = {}
+
+    def node(e: Any) -> tuple[tuple[Any, str, Leaves], list | None]:
+        if is_atomic(e):
+            return (e, e, [(e, 1)]), None
+        found = memo.get(id(e))
+        if found is not None:
+            return found
+        if isinstance(e, tuple) and e and e[0] in ('+', '|') and len(e) == 3:
+            op = e[0]
+            operands = []
+            for x in e[1:]:
+                form, chain = node(x)
+                if chain is not None and form[0][0] == op:
+                    operands.extend(chain)
+                else:
+                    operands.append(form)
+            result: tuple[tuple[Any, str, Leaves], list | None] = \
+                (_chain(op, operands), operands)
+        elif isinstance(e, tuple) and e and e[0] == '/' and len(e) == 4:
+            result = _bridge([node(x)[0] for x in _bridge_arms(e)]), None
+        else:
+            raise ValueError(f"Unrecognized structure: {e}")
+        memo[id(e)] = result
+        return result
+
+    def leaf_order(e: Any) -> tuple[str, Leaves]:
+        (_, desc, leaves), _ = node(e)
+        return desc, leaves
+
+    return leaf_order
+
+
+def structural_hash(expr: Any, bits: int = 64) -> int:
+    """
+    Computes a stable structural hash of a network descriptor (AST).
+
+    Structurally equivalent networks hash equal. The hash is a BLAKE2b
+    digest of the canonical descriptor, so it is the same in every process
+    and on every platform.
+
+    Args:
+        expr: The network descriptor (AST).
+        bits: The hash width, 64 or 128.
+
+    Returns:
+        The hash as a non-negative integer.
+
+    Raises:
+        ValueError: If bits is unsupported or the AST is unrecognized.
+    """
+    if bits not in (64, 128):
+        raise ValueError(f"Unsupported hash width: {bits}")
+    digest = hashlib.blake2b(canonical_descriptor(expr).encode('ascii'),
+                             digest_size=bits // 8).digest()
+    return int.from_bytes(digest, 'big')
+
+
+def unique_networks(asts: Iterable[Any], bits: int = 64) -> Iterator[Any]:
+    """
+    Yields the first of each structurally distinct network (AST).
+
+    Only the hashes of networks already seen are retained.
+    """
+    seen = set()
+    for ast in asts:
+        h = structural_hash(ast, bits)
+        if h not in seen:
+            seen.add(h)
+            yield ast
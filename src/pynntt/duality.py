@@ -0,0 +1,139 @@
+"""
+duality.py — Duality and frequency-inversion transforms of network ASTs
+
+Three transforms of a network leave necessary regularity unchanged:
+
+* the dual swaps series and parallel and inductors with capacitors, and
+  turns a bridge <(a&b)@(c&d)/e> into <(a'&c')@(b'&d')/e'>; its impedance
+  is the admittance of the original with each R, L and C value inverted;
+* the inverse swaps inductors with capacitors, giving Z(1/s) with each L
+  and C value inverted;
+* the dual-inverse does both, swapping only series and parallel.
+
+With the identity these form the orbit of a network. Regularity is decided
+by the least of Re Z(jω) and Re Y(jω) at ω = 0 and ω = ∞, which the dual
+swaps with each other and the inverse swaps between the two ends, so every
+member of an orbit has the same verdict. `OrbitVerdicts` records one
+verdict per orbit so the rest can reuse it.
+"""
+
+from typing import Any
+from pynntt.canonical import canonical_descriptor
+
+_SWAP = {'L': 'C', 'C': 'L', 'R': 'R'}
+
+
+def _transform(expr: Any, swap_ops: bool, swap_reactive: bool) -> Any:
+    if isinstance(expr, str) and expr in _SWAP:
+        return _SWAP[expr] if swap_reactive else expr
+    if isinstance(expr, tuple) and len(expr) == 3 and expr[0] in ('+', '|'):
+        op = expr[0]
+        if swap_ops:
+            op = '|' if op == '+' else '+'
+        return (op, _transform(expr[1], swap_ops, swap_reactive),
+                _transform(expr[2], swap_ops, swap_reactive))
+    if isinstance(expr, tuple) and len(expr) == 4 and expr[0] == '/':
+        (_, a, b), (_, c, d), e = expr[1], expr[2], expr[3]
+        a, b, c, d, e = (_transform(x, swap_ops, swap_reactive)
+                         for x in (a, b, c, d, e))
+        if swap_ops:
+            b, c = c, b
+        return ('/', ('&', a, b), ('&', c, d), e)
+    raise ValueError(f"Unrecognized structure: {expr}")
+
+
+def dual_ast(expr: Any) -> Any:
+    """
+    Returns the dual of a network descriptor (AST).
+
+    Raises:
+        ValueError: If an unrecognized structure is encountered.
+    """
+    return _transform(expr, swap_ops=True, swap_reactive=True)
+
+
+def inverse_ast(expr: Any) -> Any:
+    """
+    Returns the frequency inverse of a network descriptor (AST).
+
+    Raises:
+        ValueError: If an unrecognized structure is encountered.
+    """
+    return _transform(expr, swap_ops=False, swap_reactive=True)
+
+
+def dual_inverse_ast(expr: Any) -> Any:
+    """
+    Returns the dual of the frequency inverse of a network (AST).
+
+    Raises:
+        ValueError: If an unrecognized structure is encountered.
+    """
+    return _transform(expr, swap_ops=True, swap_reactive=False)
+
+
+def orbit(expr: Any) -> dict[str, Any]:
+    """
+    Lists a network (AST) and its transforms, keyed 'identity', 'dual',
+    'inverse' and 'dual_inverse'. Members may coincide structurally.
+    """
+    return {
+        'identity': expr,
+        'dual': dual_ast(expr),
+        'inverse': inverse_ast(expr),
+        'dual_inverse': dual_inverse_ast(expr),
+    }
+
+
+def orbit_key(expr: Any) -> str:
+    """
+    Returns the least canonical descriptor over the orbit of a network
+    (AST), which is the same for every member of the orbit.
+
+    Raises:
+        ValueError: If an unrecognized structure is encountered.
+    """
+    return min(canonical_descriptor(member) for member in orbit(expr).values())
+
+
+class OrbitVerdicts:
+    """
+    Regularity verdicts shared by the members of each orbit.
+
+    `tested` counts verdicts recorded with `put`, and `reused` counts those
+    handed out again by `get`.
+    """
+
+    def __init__(self):
+        self._verdicts: dict[str, bool] = {}
+        self.tested = 0
+        self.reused = 0
+
+    def __len__(self) -> int:
+        return len(self._verdicts)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._verdicts
+
+    def get(self, key: str) -> bool | None:
+        """Returns the verdict of the orbit with key, or None if unknown."""
+        verdict = self._verdicts.get(key)
+        if verdict is not None:
+            self.reused += 1
+        return verdict
+
+    def put(self, key: str, regular: bool) -> None:
+        """Records the verdict of the orbit with key."""
+        self._verdicts[key] = regular
+        self.tested += 1
+
+    def stats(self) -> dict[str, Any]:
+        """Reports the orbits, tests run, verdicts reused and the fraction
+        of regularity tests saved."""
+        total = self.tested + self.reused
+        return {
+            'orbits': len(self._verdicts),
+            'tested': self.tested,
+            'reused': self.reused,
+            'saved': self.reused / total if total else 0.0,
+        }
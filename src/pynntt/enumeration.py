@@ -0,0 +1,148 @@
+"""
+enumeration.py — Streaming enumeration of two-pole network descriptors
+
+Networks are generated directly in a canonical form, so commutative and
+associative duplicates are never produced:
+
+* a series (parallel) network is a multiset of two or more components, none
+  of which is itself a series (parallel) network; components are ordered by
+  their descriptor string and folded left, as `parse_descriptor` would;
+* a bridge is the lexicographically smallest of the four arm orderings that
+  describe the same bridge (swapping the two arms, reversing the ports, or
+  both).
+
+Everything is produced by nested generators, so memory use depends only on
+the network size, not on how many networks have been produced. Every
+network produced is already in the form returned by `canonical_ast`.
+"""
+
+from typing import Any, Iterator
+from pynntt.canonical import bridge_orderings, wrap_descriptor
+
+# Each item is (ast, descriptor, reactive element count)
+Item = tuple[Any, str, int]
+
+ATOMS: list[Item] = [('C', 'C', 1), ('L', 'L', 1), ('R', 'R', 0)]
+
+
+def partitions(n: int, max_part: int) -> Iterator[list[int]]:
+    """
+    Yields partitions of n into non-increasing parts no larger than max_part.
+    """
+    if n == 0:
+        yield []
+        return
+    for part in range(min(n, max_part), 0, -1):
+        for rest in partitions(n - part, part):
+            yield [part] + rest
+
+
+def _networks(n: int, k: int, bridges: bool,
+              exclude: str | None = None) -> Iterator[Item]:
+    if n == 1:
+        for atom in ATOMS:
+            if atom[2] <= k:
+                yield atom
+        return
+    for op in ('+', '|'):
+        if op != exclude:
+            yield from _compositions(op, n, k, bridges)
+    if bridges and n >= 5:
+        yield from _bridges(n, k)
+
+
+def _compositions(op: str, n: int, k: int, bridges: bool) -> Iterator[Item]:
+    for parts in partitions(n, n - 1):
+        for items in _choose(parts, 0, k, bridges, op, None):
+            items = sorted(items, key=lambda item: item[1])
+            ast = items[0][0]
+            for item in items[1:]:
+                ast = (op, ast, item[0])
+            desc = op.join(wrap_descriptor(*item[:2]) for item in items)
+            yield ast, desc, sum(item[2] for item in items)
+
+
+def _choose(parts: list[int], i: int, k: int, bridges: bool, exclude: str,
+            lower: str | None) -> Iterator[list[Item]]:
+    # Components of equal size are chosen in non-decreasing descriptor order
+    if i == len(parts):
+        yield []
+        return
+    if i == 0 or parts[i] != parts[i - 1]:
+        lower = None
+    for item in _networks(parts[i], k, bridges, exclude):
+        if lower is not None and item[1] < lower:
+            continue
+        for rest in _choose(parts, i + 1, k - item[2], bridges, exclude,
+                            item[1]):
+            yield [item] + rest
+
+
+def _bridges(n: int, k: int) -> Iterator[Item]:
+    # Arm a must be no larger than any other arm, so prune on it first
+    for na in range(1, n - 3):
+        for a in _networks(na, k, True):
+            ka = k - a[2]
+            for nb in range(1, n - na - 2):
+                for b in _networks(nb, ka, True):
+                    if b[1] < a[1]:
+                        continue
+                    kb = ka - b[2]
+                    for nc in range(1, n - na - nb - 1):
+                        for c in _networks(nc, kb, True):
+                            if c[1] < a[1]:
+                                continue
+                            kc = kb - c[2]
+                            for nd in range(1, n - na - nb - nc):
+                                for d in _networks(nd, kc, True):
+                                    if d[1] < a[1]:
+                                        continue
+                                    yield from _bridge_items(
+                                        a, b, c, d, n - na - nb - nc - nd,
+                                        kc - d[2])
+
+
+def _bridge_items(a: Item, b: Item, c: Item, d: Item, ne: int,
+                  k: int) -> Iterator[Item]:
+    arms = (a[1], b[1], c[1], d[1])
+    if any(arms > other for other in bridge_orderings(*arms)):
+        return
+    for e in _networks(ne, k, True):
+        ast = ('/', ('&', a[0], b[0]), ('&', c[0], d[0]), e[0])
+        desc = f"<({a[1]}&{b[1]})@({c[1]}&{d[1]})/{e[1]}>"
+        yield ast, desc, a[2] + b[2] + c[2] + d[2] + e[2]
+
+
+def enumerate_networks(max_elements: int, max_reactive: int | None = None,
+                       bridges: bool = False,
+                       min_elements: int = 1) -> Iterator[tuple[Any, str]]:
+    """
+    Lazily yields every distinct network up to a given number of elements.
+
+    Args:
+        max_elements: The largest number of R, L and C elements.
+        max_reactive: The largest number of L and C elements, or None for
+            no limit.
+        bridges: Whether to include bridge ('/') networks.
+        min_elements: The smallest number of elements.
+
+    Returns:
+        An iterator of (AST, descriptor string) pairs, in order of
+        increasing size.
+    """
+    k = max_elements if max_reactive is None else max_reactive
+    for n in range(max(1, min_elements), max_elements + 1):
+        for ast, desc, _ in _networks(n, k, bridges):
+            yield ast, desc
+
+
+def enumerate_descriptors(max_elements: int,
+                          max_reactive: int | None = None,
+                          bridges: bool = False,
+                          min_elements: int = 1) -> Iterator[str]:
+    """
+    Lazily yields every distinct descriptor string up to a given size.
+    """
+    for _, desc in enumerate_networks(max_elements, max_reactive, bridges,
+                                      min_elements):
+        yield desc
@@ -0,0 +1,312 @@
+"""
+equivalence.py — Grouping networks that realise the same impedance
+
+Two networks are equivalent when their impedances Z(s) are equal after some
+relabelling of component symbols that maps resistors to resistors,
+inductors to inductors and capacitors to capacitors.
+
+`impedance_fingerprint` hashes values of Z evaluated straight from the AST
+modulo a large prime, at random points chosen so the values do not depend
+on how the symbols are numbered:
+
+* every component of a type takes one common value (the type values);
+* for each component in turn, that component alone takes a second value of
+  its type, and the multiset of the resulting values is kept per type.
+
+Equivalent networks therefore always share a fingerprint, and networks
+with different impedances share one only by coincidence. `EquivalenceIndex`
+groups a catalogue by fingerprint in one pass. Within a group,
+`find_relabelling` searches for a relabelling with the per-component values
+as a guide, and `are_equivalent` confirms it symbolically.
+"""
+
+import hashlib
+import random
+from typing import Any, Hashable, Iterable
+
+ELEMENTS = ['R', 'L', 'C']
+
+# The Mersenne prime 2**61 - 1; values live in the integers modulo PRIME
+PRIME = (1 << 61) - 1
+
+# A pair (N, D) modulo PRIME stands for the value N / D; D = 0 is infinite
+Fraction = tuple[int, int]
+
+
+def _leaves(expr: Any) -> list[str]:
+    # The element labels of an AST in the left-to-right order in which
+    # `eval_impedance` numbers them
+    labels = []
+    stack = [expr]
+    while stack:
+        e = stack.pop()
+        if isinstance(e, str) and e in ELEMENTS:
+            labels.append(e)
+        elif isinstance(e, tuple) and e and e[0] in ('+', '|', '/', '&'):
+            stack.extend(reversed(e[1:]))
+        else:
+            raise ValueError(f"Unrecognized structure: {e}")
+    return labels
+
+
+def _leaf_names(expr: Any) -> list[str]:
+    # The `eval_impedance` symbol name of each leaf, in leaf order
+    counter = {'R': 0, 'L': 0, 'C': 0}
+    names = []
+    for label in _leaves(expr):
+        counter[label] += 1
+        names.append(f"{label}{counter[label]}")
+    return names
+
+
+def _add(a: Fraction, b: Fraction) -> Fraction:
+    return (a[0] * b[1] + b[0] * a[1]) % PRIME, a[1] * b[1] % PRIME
+
+
+def _mul(a: Fraction, b: Fraction) -> Fraction:
+    return a[0] * b[0] % PRIME, a[1] * b[1] % PRIME
+
+
+def _evaluate(expr: Any, values: list[int], s: int) -> int:
+    # Z(s) modulo PRIME with the i-th leaf taking values[i], or PRIME if
+    # the point is a pole; denominators are only inverted at the end
+    leaf = iter(values)
+
+    def walk(e: Any) -> Fraction:
+        if isinstance(e, str):
+            x = next(leaf)
+            if e == 'R':
+                return x, 1
+            if e == 'L':
+                return x * s % PRIME, 1
+            return 1, x * s % PRIME
+        op = e[0]
+        if op == '+':
+            return _add(walk(e[1]), walk(e[2]))
+        if op == '|':
+            (n1, d1), (n2, d2) = walk(e[1]), walk(e[2])
+            return n1 * n2 % PRIME, (n1 * d2 + n2 * d1) % PRIME
+        za, zb = walk(e[1][1]), walk(e[1][2])
+        zc, zd = walk(e[2][1]), walk(e[2][2])
+        ze = walk(e[3])
+        num = _add(_add(_mul(_mul(za, zb), _add(zc, zd)),
+                        _mul(_mul(zc, zd), _add(za, zb))),
+                   _mul(_mul(_add(za, zb), _add(zc, zd)), ze))
+        den = _add(_mul(_add(za, zc), _add(zb, zd)),
+                   _mul(_add(_add(za, zb), _add(zc, zd)), ze))
+        return num[0] * den[1] % PRIME, num[1] * den[0] % PRIME
+
+    n, d = walk(expr)
+    if d == 0:
+        return PRIME
+    return n * pow(d, PRIME - 2, PRIME) % PRIME
+
+
+def _points(count: int, seed: Any) -> list[dict[str, int]]:
+    # Random points: s, plus a common and a distinguished value per type
+    rng = random.Random(seed)
+    return [{key: rng.randrange(1, PRIME)
+             for key in ['s', 'R', 'L', 'C', 'R*', 'L*', 'C*']}
+            for _ in range(count)]
+
+
+def _component_values(expr: Any, labels: list[str],
+                      points: list[dict[str, int]]) -> list[tuple[int, ...]]:
+    # For each component, Z at each point with that component alone taking
+    # the distinguished value of its type
+    common = [[point[label] for label in labels] for point in points]
+    signatures = []
+    for i, label in enumerate(labels):
+        values = []
+        for point, row in zip(points, common):
+            row = row.copy()
+            row[i] = point[label + '*']
+            values.append(_evaluate(expr, row, point['s']))
+        signatures.append(tuple(values))
+    return signatures
+
+
+def impedance_fingerprint(expr: Any, points: int = 2, seed: Any = 0,
+                          bits: int = 64) -> int:
+    """
+    Computes a relabelling-invariant fingerprint of a network's impedance.
+
+    Networks whose impedances are equal up to a type-preserving relabelling
+    of component symbols fingerprint equal. Networks with different
+    impedances fingerprint equal with probability about degree / 2**61 per
+    point, plus the chance of a hash collision. Fingerprints are comparable
+    only between calls with the same points and seed.
+
+    Args:
+        expr: The network descriptor (AST).
+        points: The number of random evaluation points.
+        seed: Seed for the evaluation points.
+        bits: The hash width, 64 or 128.
+
+    Returns:
+        The fingerprint as a non-negative integer.
+
+    Raises:
+        ValueError: If bits is unsupported or the AST is unrecognized.
+    """
+    if bits not in (64, 128):
+        raise ValueError(f"Unsupported hash width: {bits}")
+    labels = _leaves(expr)
+    chosen = _points(points, seed)
+    signatures = _component_values(expr, labels, chosen)
+    parts: list[Any] = [tuple(labels.count(label) for label in ELEMENTS)]
+    for point in chosen:
+        parts.append(_evaluate(expr, [point[label] for label in labels],
+                               point['s']))
+    for label in ELEMENTS:
+        parts.append(sorted(sig for sig, lab in zip(signatures, labels)
+                            if lab == label))
+    digest = hashlib.blake2b(repr(parts).encode('ascii'),
+                             digest_size=bits // 8).digest()
+    return int.from_bytes(digest, 'big')
+
+
+def find_relabelling(expr_a: Any, expr_b: Any, points: int = 2,
+                     seed: Any = 0) -> dict[str, str] | None:
+    """
+    Searches for a relabelling of the components of expr_b under which its
+    impedance equals that of expr_a.
+
+    Components may only be matched when their per-component values agree,
+    which usually leaves one candidate each. A complete matching is
+    accepted when the impedances agree at further random points, so the
+    result is correct with high probability; `are_equivalent` confirms it
+    exactly.
+
+    Returns:
+        A dict mapping each component name of expr_a to the name of the
+        matched component of expr_b, or None if there is none.
+
+    Raises:
+        ValueError: If an unrecognized structure is encountered.
+    """
+    labels_a, labels_b = _leaves(expr_a), _leaves(expr_b)
+    if sorted(labels_a) != sorted(labels_b):
+        return None
+    chosen = _points(points, seed)
+    sig_a = _component_values(expr_a, labels_a, chosen)
+    sig_b = _component_values(expr_b, labels_b, chosen)
+    candidates = [[j for j, lab in enumerate(labels_b)
+                   if lab == label and sig_b[j] == sig]
+                  for label, sig in zip(labels_a, sig_a)]
+    if not all(candidates):
+        return None
+
+    rng = random.Random(f"{seed}/check")
+    check = [[rng.randrange(1, PRIME) for _ in range(len(labels_a) + 1)]
+             for _ in range(points)]
+    expected = [_evaluate(expr_a, values[1:], values[0]) for values in check]
+    order = sorted(range(len(labels_a)), key=lambda i: len(candidates[i]))
+    matched = [0] * len(labels_a)
+    used = set()
+
+    def search(k: int) -> bool:
+        if k == len(order):
+            for values, value in zip(check, expected):
+                permuted = [0] * len(labels_b)
+                for i, j in enumerate(matched):
+                    permuted[j] = values[1 + i]
+                if _evaluate(expr_b, permuted, values[0]) != value:
+                    return False
+            return True
+        i = order[k]
+        for j in candidates[i]:
+            if j not in used:
+                used.add(j)
+                matched[i] = j
+                if search(k + 1):
+                    return True
+                used.discard(j)
+        return False
+
+    if not search(0):
+        return None
+    names_a, names_b = _leaf_names(expr_a), _leaf_names(expr_b)
+    return {names_a[i]: names_b[j] for i, j in enumerate(matched)}
+
+
+def are_equivalent(expr_a: Any, expr_b: Any, points: int = 2,
+                   seed: Any = 0) -> bool:
+    """
+    Decides exactly whether two networks realise the same impedance up to a
+    type-preserving relabelling of component symbols.
+
+    A relabelling is found with `find_relabelling` and then confirmed by
+    cancelling the difference of the two SymPy impedances. A False result
+    may, with probability about degree / 2**61, miss an equivalence.
+    """
+    import sympy as sp
+    from pynntt.networks import eval_impedance
+
+    mapping = find_relabelling(expr_a, expr_b, points, seed)
+    if mapping is None:
+        return False
+    Za, Zb = eval_impedance(expr_a), eval_impedance(expr_b)
+    renamed = Zb.xreplace({sp.Symbol(b, positive=True):
+                           sp.Symbol(a, positive=True)
+                           for a, b in mapping.items()})
+    return sp.cancel(Za - renamed) == 0
+
+
+class EquivalenceIndex:
+    """
+    Groups networks by impedance fingerprint.
+
+    Each added network costs one fingerprint, so a catalogue is grouped in
+    time linear in its length. Networks in different groups are never
+    equivalent; `classes` can confirm the groups exactly.
+    """
+
+    def __init__(self, points: int = 2, seed: Any = 0):
+        self.points = points
+        self.seed = seed
+        self._groups: dict[int, list[Hashable]] = {}
+        self._asts: dict[Hashable, Any] = {}
+
+    def __len__(self) -> int:
+        return len(self._asts)
+
+    def add(self, key: Hashable, expr: Any) -> int:
+        """Adds a network under key, returning its fingerprint."""
+        fingerprint = impedance_fingerprint(expr, self.points, self.seed)
+        self._groups.setdefault(fingerprint, []).append(key)
+        self._asts[key] = expr
+        return fingerprint
+
+    def update(self, items: Iterable[tuple[Hashable, Any]]) -> None:
+        """Adds each (key, AST) pair."""
+        for key, expr in items:
+            self.add(key, expr)
+
+    def groups(self) -> list[list[Hashable]]:
+        """Lists the keys with equal fingerprints, in order of addition."""
+        return [list(keys) for keys in self._groups.values()]
+
+    def classes(self, confirm: bool = False) -> list[list[Hashable]]:
+        """
+        Lists the equivalence classes of the added networks.
+
+        Without confirm these are the fingerprint groups. With confirm,
+        each group of two or more is split by checking every member against
+        a representative of each class found so far with `are_equivalent`.
+        """
+        if not confirm:
+            return self.groups()
+        classes = []
+        for keys in self._groups.values():
+            found: list[list[Hashable]] = []
+            for key in keys:
+                for cls in found:
+                    if are_equivalent(self._asts[cls[0]], self._asts[key],
+                                      self.points, self.seed):
+                        cls.append(key)
+                        break
+                else:
+                    found.append([key])
+            classes.extend(found)
+        return classes
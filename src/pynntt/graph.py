@@ -0,0 +1,361 @@
+"""
+graph.py — Driving-point impedance of arbitrary one-port graphs
+
+A network is given as an edge list: each edge joins two integer nodes
+through an R, L or C element, written as text like "0-2:R, 2-1:L, 0-1:C".
+Any topology may be described, not just series-parallel networks and the
+five-element bridge.
+
+The impedance between the port nodes a and b is the ratio of cofactors of
+the admittance-weighted Laplacian Y,
+
+    Z = det Y[a, b] / det Y[a],
+
+where Y[a] deletes row and column a and Y[a, b] deletes both. It is
+computed over ZZ[R1.., L1.., C1.., s] in one of two ways:
+
+* 'trees' — by the matrix-tree theorem, det Y[a] sums the admittance
+  products of the spanning trees, and det Y[a, b] those of the two-tree
+  forests separating a from b. One backtracking search over edges, with
+  a union-find to reject cycles, lists both, and each forest contributes
+  a single monomial.
+* 'berkowitz' — both determinants of s Y are taken by Berkowitz's
+  division-free algorithm, with the R and L generators standing for 1/R
+  and 1/L so that every entry is a polynomial; as the cofactors are linear
+  in each edge's weight, the generators are then flipped back exactly.
+
+The number of forests grows with the number of spanning trees, so 'auto'
+enumerates while the graph has at most `TREE_LIMIT` spanning trees and
+uses Berkowitz otherwise. Symbols are numbered in edge order, so an edge list
+from `ast_edges` evaluates with the same symbols as `eval_impedance`.
+"""
+
+import re
+from typing import Any
+import sympy as sp
+from sympy.polys.domains import ZZ
+from sympy.polys.matrices import DomainMatrix
+from sympy.polys.rings import PolyElement, PolyRing
+from pynntt.networks import ELEMENTS, is_atomic, s
+from pynntt.polyring import cancel_monomial
+
+Edge = tuple[int, int, str]
+Fraction = tuple[PolyElement, PolyElement]
+
+# 'auto' enumerates forests while there are at most this many spanning trees
+TREE_LIMIT = 100000
+
+_EDGE = re.compile(r"(\d+)\s*-\s*(\d+)\s*:\s*([RLC])")
+
+
+def parse_edge_list(text: str) -> list[Edge]:
+    """
+    Parses an edge list such as "0-2:R, 2-1:L, 0-1:C".
+
+    Edges are separated by commas, semicolons or newlines.
+
+    Raises:
+        ValueError: If an edge is malformed.
+    """
+    edges = []
+    for item in re.split(r"[,;\n]", text):
+        item = item.strip()
+        if not item:
+            continue
+        match = _EDGE.fullmatch(item)
+        if match is None:
+            raise ValueError(f"Malformed edge: {item!r}")
+        edges.append((int(match[1]), int(match[2]), match[3]))
+    return edges
+
+
+def format_edge_list(edges: list[Edge]) -> str:
+    """
+    Formats an edge list as text accepted by `parse_edge_list`.
+    """
+    return ', '.join(f"{u}-{v}:{label}" for u, v, label in edges)
+
+
+def ast_edges(expr: Any) -> list[Edge]:
+    """
+    Converts a network descriptor (AST) into an edge list with port nodes
+    0 and 1, listing edges in the left-to-right order of its elements.
+
+    A bridge <(a&b)@(c&d)/e> joins the port through a then b and through c
+    then d, with e between the two midpoints.
+
+    Raises:
+        ValueError: If an unrecognized structure is encountered.
+    """
+    edges: list[Edge] = []
+    nodes = [2]
+
+    def new_node() -> int:
+        nodes[0] += 1
+        return nodes[0] - 1
+
+    def build(e: Any, a: int, b: int) -> None:
+        if is_atomic(e):
+            edges.append((a, b, e))
+        elif isinstance(e, tuple) and len(e) == 3 and e[0] == '+':
+            m = new_node()
+            build(e[1], a, m)
+            build(e[2], m, b)
+        elif isinstance(e, tuple) and len(e) == 3 and e[0] == '|':
+            build(e[1], a, b)
+            build(e[2], a, b)
+        elif isinstance(e, tuple) and len(e) == 4 and e[0] == '/':
+            m1, m2 = new_node(), new_node()
+            build(e[1][1], a, m1)
+            build(e[1][2], m1, b)
+            build(e[2][1], a, m2)
+            build(e[2][2], m2, b)
+            build(e[3], m1, m2)
+        else:
+            raise ValueError(f"Unrecognized structure: {e}")
+
+    build(expr, 0, 1)
+    return edges
+
+
+def edge_symbols(edges: list[Edge]) -> list[sp.Symbol]:
+    """
+    Lists the component symbols of an edge list, numbered in edge order and
+    grouped as R1.., L1.., C1...
+
+    Raises:
+        ValueError: If an edge has an unknown element.
+    """
+    counts = {label: 0 for label in ELEMENTS}
+    for _, _, label in edges:
+        if label not in counts:
+            raise ValueError(f"Unknown element: {label}")
+        counts[label] += 1
+    return [sp.Symbol(f"{label}{i}", positive=True)
+            for label in ELEMENTS for i in range(1, counts[label] + 1)]
+
+
+def _edge_gens(edges: list[Edge],
+               ring: PolyRing) -> list[tuple[str, PolyElement]]:
+    # The element label and ring generator of each edge
+    gens = dict(zip(ring.symbols, ring.gens))
+    counter = {label: 0 for label in ELEMENTS}
+    result = []
+    for _, _, label in edges:
+        counter[label] += 1
+        symbol = sp.Symbol(f"{label}{counter[label]}", positive=True)
+        result.append((label, gens[symbol]))
+    return result
+
+
+def _port_component(edges: list[Edge], a: int, b: int) -> list[int]:
+    # Indices of the non-loop edges in the component holding a, which must
+    # also hold b
+    adjacent: dict[int, list[int]] = {}
+    for i, (u, v, _) in enumerate(edges):
+        if u != v:
+            adjacent.setdefault(u, []).append(v)
+            adjacent.setdefault(v, []).append(u)
+    seen, stack = {a}, [a]
+    while stack:
+        for v in adjacent.get(stack.pop(), []):
+            if v not in seen:
+                seen.add(v)
+                stack.append(v)
+    if b not in seen:
+        raise ValueError(f"Port nodes {a} and {b} are not connected")
+    return [i for i, (u, v, _) in enumerate(edges) if u != v and u in seen]
+
+
+def _laplacian(edges: list[Edge], weights: list[Any], zero: Any,
+               nodes: list[int]) -> list[list[Any]]:
+    # The weighted Laplacian over nodes, in their order
+    index = {node: i for i, node in enumerate(nodes)}
+    matrix = [[zero] * len(nodes) for _ in nodes]
+    for (u, v, _), weight in zip(edges, weights):
+        i, j = index[u], index[v]
+        matrix[i][i] += weight
+        matrix[j][j] += weight
+        matrix[i][j] -= weight
+        matrix[j][i] -= weight
+    return matrix
+
+
+def _minor(matrix: list[list[Any]], nodes: list[int],
+           removed: set[int]) -> list[list[Any]]:
+    kept = [i for i, node in enumerate(nodes) if node not in removed]
+    return [[matrix[i][j] for j in kept] for i in kept]
+
+
+def spanning_tree_count(edges: list[Edge]) -> int:
+    """
+    Counts the spanning trees of the multigraph of an edge list, by the
+    matrix-tree theorem; 0 if it is not connected.
+    """
+    edges = [(u, v, label) for u, v, label in edges if u != v]
+    nodes = sorted({u for u, _, _ in edges} | {v for _, v, _ in edges})
+    if len(nodes) < 2:
+        return 1
+    matrix = _laplacian(edges, [1] * len(edges), 0, nodes)
+    minor = _minor(matrix, nodes, {nodes[0]})
+    return int(DomainMatrix(minor, (len(minor), len(minor)), ZZ).det())
+
+
+def _cofactors_trees(edges: list[Edge], kept: list[int], a: int, b: int,
+                     ring: PolyRing) -> Fraction:
+    # Each term of the cofactors is the product of the admittances of a
+    # forest's edges; multiplied by the denominators of all other edges it
+    # is a monomial, built by adding exponent vectors as the search goes
+    position = {g: i for i, g in enumerate(ring.gens)}
+    zs = ring.symbols.index(s)
+    steps, base = [], [0] * ring.ngens
+    for i, (label, g) in enumerate(_edge_gens(edges, ring)):
+        if i not in kept:
+            continue
+        # The admittances 1/R, 1/(L s) and C s as numerator and
+        # denominator exponents
+        num, den = [0] * ring.ngens, [0] * ring.ngens
+        if label == 'C':
+            num[position[g]] = num[zs] = 1
+        else:
+            den[position[g]] = 1
+            den[zs] = int(label == 'L')
+        base = [x + y for x, y in zip(base, den)]
+        steps.append(tuple(x - y for x, y in zip(num, den)))
+
+    edges = [edges[i] for i in kept]
+    nodes = sorted({u for u, _, _ in edges} | {v for _, v, _ in edges})
+    index = {node: i for i, node in enumerate(nodes)}
+    ends = [(index[u], index[v]) for u, v, _ in edges]
+    ia, ib = index[a], index[b]
+    parent = list(range(len(nodes)))
+    size = len(nodes) - 1
+    num_terms: dict[tuple[int, ...], int] = {}
+    den_terms: dict[tuple[int, ...], int] = {}
+
+    def find(x: int) -> int:
+        while parent[x] != x:
+            x = parent[x]
+        return x
+
+    def search(start: int, chosen: int, monom: tuple[int, ...]) -> None:
+        if chosen == size - 1 and find(ia) != find(ib):
+            num_terms[monom] = num_terms.get(monom, 0) + 1
+        if chosen == size:
+            den_terms[monom] = den_terms.get(monom, 0) + 1
+            return
+        for k in range(start, len(ends)):
+            if len(ends) - k < size - 1 - chosen:
+                return
+            ru, rv = find(ends[k][0]), find(ends[k][1])
+            if ru == rv:
+                continue
+            parent[ru] = rv
+            search(k + 1, chosen + 1,
+                   tuple(x + y for x, y in zip(monom, steps[k])))
+            parent[ru] = ru
+
+    search(0, 0, tuple(base))
+    return ring.from_dict(num_terms), ring.from_dict(den_terms)
+
+
+def _flip(p: PolyElement, flipped: list[int]) -> PolyElement:
+    # Replace each generator x in flipped by 1/x and multiply through by
+    # all of them; p has degree at most one in each
+    terms = {}
+    for monom, coeff in p.terms():
+        monom = list(monom)
+        for i in flipped:
+            monom[i] = 1 - monom[i]
+        terms[tuple(monom)] = coeff
+    return p.ring.from_dict(terms)
+
+
+def _cofactors_berkowitz(edges: list[Edge], kept: list[int], a: int, b: int,
+                         ring: PolyRing) -> Fraction:
+    # Take the cofactors of s Y, whose entries are polynomials once the R
+    # and L generators stand for conductances 1/R and reciprocal
+    # inductances 1/L: R, L and C edges weigh G s, 1/L and C s^2. Both
+    # cofactors are linear in every edge weight, so flipping those
+    # generators back and clearing denominators by all of them is exact.
+    gs = ring.gens[ring.symbols.index(s)]
+    weights = [g * gs if label == 'R' else g if label == 'L' else g * gs**2
+               for label, g in _edge_gens(edges, ring)]
+    edges = [edges[i] for i in kept]
+    weights = [weights[i] for i in kept]
+    nodes = sorted({u for u, _, _ in edges} | {v for _, v, _ in edges})
+    matrix = _laplacian(edges, weights, ring.zero, nodes)
+    domain = ring.to_domain()
+
+    def det(removed: set[int]) -> PolyElement:
+        minor = _minor(matrix, nodes, removed)
+        n = len(minor)
+        if n == 0:
+            return ring.one
+        # The constant term of the characteristic polynomial, which
+        # Berkowitz's algorithm finds without any division
+        charpoly = DomainMatrix(minor, (n, n), domain).charpoly()
+        return charpoly[-1] * (-1) ** n
+
+    flipped = [i for i, sym in enumerate(ring.symbols)
+               if sym != s and str(sym)[0] in 'RL']
+    return (_flip(det({a, b}) * gs, flipped), _flip(det({a}), flipped))
+
+
+def eval_graph_fraction(edges: list[Edge], port: tuple[int, int] = (0, 1),
+                        method: str = 'auto',
+                        ring: PolyRing | None = None) -> Fraction:
+    """
+    Evaluates the driving-point impedance of an edge list at port into a
+    cancelled polynomial pair.
+
+    Args:
+        edges: The edge list.
+        port: The two port nodes.
+        method: 'trees', 'berkowitz' or 'auto' (see the module docstring).
+        ring: The ring to evaluate in. Defaults to ZZ[edge symbols, s].
+
+    Returns:
+        A (numerator, denominator) pair of ring elements with no common
+        factor and a positive leading coefficient in the denominator.
+
+    Raises:
+        ValueError: If the method is unknown, the port nodes are equal or
+            not connected, or an edge has an unknown element.
+    """
+    if method not in ('auto', 'berkowitz', 'trees'):
+        raise ValueError(f"Unknown method: {method}")
+    a, b = port
+    if a == b:
+        raise ValueError("Port nodes must differ")
+    if ring is None:
+        ring = PolyRing(edge_symbols(edges) + [s], ZZ)
+    kept = _port_component(edges, a, b)
+    if method == 'auto':
+        trees = spanning_tree_count([edges[i] for i in kept])
+        method = 'trees' if trees <= TREE_LIMIT else 'berkowitz'
+    if method == 'trees':
+        num, den = _cofactors_trees(edges, kept, a, b, ring)
+    else:
+        num, den = _cofactors_berkowitz(edges, kept, a, b, ring)
+    num, den = cancel_monomial(num, den)
+    num, den = num.cancel(den)
+    if den.LC < 0:
+        num, den = -num, -den
+    return num, den
+
+
+def eval_graph_impedance(edges: list[Edge], port: tuple[int, int] = (0, 1),
+                         method: str = 'auto') -> sp.Expr:
+    """
+    Evaluates the driving-point impedance of an edge list as canonical
+    N(s)/D(s).
+
+    For the edge list of a descriptor from `ast_edges`, the result equals
+    `canonical_form(eval_impedance(ast))` as a rational function.
+
+    Raises:
+        ValueError: As for `eval_graph_fraction`.
+    """
+    num, den = eval_graph_fraction(edges, port, method)
+    return num.as_expr() / den.as_expr()
@@ -0,0 +1,73 @@
+"""
+hooks.py — Event hooks for tracing evaluation
+
+Library functions report what they are doing as named events, and any tool
+can subscribe to them:
+
+* 'stage' — a stage of evaluation finished; the payload holds 'stage' (the
+  function name, such as 'parse_descriptor' or 'eval_impedance') and
+  'seconds' (its wall time);
+* 'regularity_path' — `is_necessarily_regular` settled on a test; the
+  payload holds 'path': 'root_isolation', 'biquadratic', 'definition' or
+  'exception_fallback'.
+
+Callbacks are called as `callback(event, payload)` in the thread that
+raised the event. Events cost one dictionary lookup while nothing is
+subscribed to them.
+"""
+
+import time
+from functools import wraps
+from typing import Any, Callable
+
+Callback = Callable[[str, dict[str, Any]], None]
+
+_subscribers: dict[str, list[Callback]] = {}
+
+
+def subscribe(event: str, callback: Callback) -> Callback:
+    """
+    Calls callback for every future occurrence of event, returning it.
+    """
+    _subscribers.setdefault(event, []).append(callback)
+    return callback
+
+
+def unsubscribe(event: str, callback: Callback) -> None:
+    """
+    Stops calling callback for event.
+
+    Raises:
+        ValueError: If callback is not subscribed to event.
+    """
+    callbacks = _subscribers.get(event, [])
+    callbacks.remove(callback)
+    if not callbacks:
+        _subscribers.pop(event, None)
+
+
+def emit(event: str, **payload: Any) -> None:
+    """
+    Calls every subscriber of event with the payload.
+    """
+    for callback in _subscribers.get(event, ()):
+        callback(event, payload)
+
+
+def stage(func: Callable) -> Callable:
+    """
+    Decorates a function to emit a 'stage' event with its wall time each
+    time it returns.
+    """
+    name = func.__name__
+
+    @wraps(func)
+    def timed(*args: Any, **kwargs: Any) -> Any:
+        if 'stage' not in _subscribers:
+            return func(*args, **kwargs)
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        emit('stage', stage=name, seconds=time.perf_counter() - start)
+        return result
+
+    return timed
@@ -1,14 +1,33 @@
 """
 networks.py — Core logic for parsing, AST evaluation, impedance computation, and canonicalization
+
+SymPy is imported on first use, so parsing and formatting descriptors (and
+the numeric path in `pynntt.numeric`) never import it. The Laplace variable
+`s` is created then too, when first read from this module.
 """
 
-import sympy as sp
-import re
-from typing import Any
-from pynntt.regularity import is_necessarily_regular
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator
+from pynntt import hooks
+
+if TYPE_CHECKING:
+    import sympy as sp
 
 ELEMENTS = ['R', 'L', 'C']
-s = sp.Symbol('s')
+
+
+def _laplace_symbol() -> sp.Symbol:
+    import sympy as sp
+    return sp.Symbol('s')
+
+
+def __getattr__(name: str) -> Any:
+    # Module attributes that need SymPy are created when first read
+    if name == 's':
+        globals()['s'] = _laplace_symbol()
+        return globals()['s']
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def is_atomic(expr: Any) -> bool:
@@ -32,6 +51,22 @@ def combine_parallel(Z1: sp.Expr, Z2: sp.Expr) -> sp.Expr:
     return 1 / (1 / Z1 + 1 / Z2)
 
 
+def combine_bridge(za: sp.Expr, zb: sp.Expr, zc: sp.Expr, zd: sp.Expr,
+                   ze: sp.Expr) -> sp.Expr:
+    """
+    Combines five impedances as a bridge with arms (za & zb) @ (zc & zd)
+    and cross-branch ze.
+    """
+    # Impedance formula for a specific bridge configuration (e.g.,
+    # Wheatstone bridge-like). This formula might need to be generalized or
+    # made more robust for other bridge types.
+    num = (za * zb * zc + za * zb * zd + za * zc * zd +
+           zb * zc * zd + (za + zb) * (zc + zd) * ze)
+    den = (za + zc) * (zb + zd) + (za + zb + zc + zd) * ze
+    return num / den
+
+
+@hooks.stage
 def eval_impedance(expr: Any) -> sp.Expr:
     """
     Evaluates a network descriptor (AST) into a symbolic impedance expression.
@@ -43,8 +78,17 @@ def eval_impedance(expr: Any) -> sp.Expr:
         A SymPy expression representing the impedance.
 
     Raises:
-        ValueError: If an unrecognized structure is encountered.
+        ValueError: If an unrecognized structure is encountered, or a
+            two-port's input is an open circuit.
     """
+    return _impedance_evaluator()(expr)
+
+
+def _impedance_evaluator() -> Callable[[Any], sp.Expr]:
+    # Evaluates ASTs with one symbol counter, so successive calls number
+    # their components on from each other
+    import sympy as sp
+    s = _laplace_symbol()
     counter = {'R': 0, 'L': 0, 'C': 0}
 
     def make_symbol(label: str) -> sp.Symbol:
@@ -79,80 +123,304 @@ def eval_impedance(expr: Any) -> sp.Expr:
                 zd = eval_recursive(zd_expr)
                 ze = eval_recursive(ze_expr)
 
-                # Impedance formula for a specific bridge configuration (e.g., Wheatstone bridge-like)
-                # This formula might need to be generalized or made more robust for other bridge types.
-                num = (za * zb * zc + za * zb * zd + za * zc * zd +
-                       zb * zc * zd + (za + zb) * (zc + zd) * ze)
-                den = (za + zc) * (zb + zd) + (za + zb + zc + zd) * ze
-                return num / den
+                return combine_bridge(za, zb, zc, zd, ze)
+            elif op in TWOPORT_OPS:
+                # Two-port cascade with port 2 open
+                from pynntt.twoport import fold_impedance
+                return sp.sympify(fold_impedance(
+                    e, eval_recursive, combine_series, combine_parallel))
 
         raise ValueError(f"Unrecognized structure: {e}")
 
-    return eval_recursive(expr)
+    return eval_recursive
+
+
+class DescriptorError(ValueError):
+    """
+    A malformed descriptor string, with the position at which it failed.
+    """
+
+    def __init__(self, reason: str, position: int, descriptor: str = ''):
+        super().__init__(f"{reason} at position {position}")
+        self.reason = reason
+        self.position = position
+        self.descriptor = descriptor
 
 
+TOKEN_CHARS = frozenset('RLC()+|/<>@&TPOS[],:')
+
+# Open and short circuits, which may only stand as a whole two-port arm
+TERMINALS = ['O', 'S']
+
+# Cascade, Tee, Pi, series-arm and shunt-arm two-port operators
+TWOPORT_OPS = (':', 'T', 'P', '[&]', '[/]')
+
+# Tokens expected after each of the five parts of a bridge
+BRIDGE_STEPS = [
+    [('&', "Expected '&' after first element in bridge")],
+    [(')', "Expected ')' after second element in bridge"),
+     ('@', "Expected '@' after bridge arm 1"),
+     ('(', "Expected '(' after '@'")],
+    [('&', "Expected '&' after third element in bridge")],
+    [(')', "Expected ')' after fourth element in bridge"),
+     ('/', "Expected '/' after bridge arm 2")],
+    [('>', "Expected '>' after bridge expression")],
+]
+
+
+def tokenize_descriptor(s: str) -> tuple[list[str], list[int]]:
+    """
+    Splits a descriptor string into tokens and their positions.
+
+    Raises:
+        DescriptorError: If the string contains an unknown character.
+    """
+    tokens, positions = [], []
+    for pos, ch in enumerate(s):
+        if ch in TOKEN_CHARS:
+            tokens.append(ch)
+            positions.append(pos)
+        elif not ch.isspace():
+            raise DescriptorError(f"Unexpected character '{ch}'", pos, s)
+    return tokens, positions
+
+
+class _Tokens:
+    # A token list with a cursor, shared by the one-port and two-port
+    # parsers
+
+    def __init__(self, s: str):
+        self.text = s
+        self.tokens, self.positions = tokenize_descriptor(s)
+        self.i = 0
+
+    def peek(self) -> str | None:
+        return self.tokens[self.i] if self.i < len(self.tokens) else None
+
+    def fail(self, reason: str, at: int | None = None) -> DescriptorError:
+        at = self.i if at is None else at
+        position = self.positions[at] if at < len(self.tokens) \
+            else len(self.text)
+        return DescriptorError(reason, position, self.text)
+
+    def expect(self, token: str, reason: str) -> None:
+        if self.peek() != token:
+            raise self.fail(reason)
+        self.i += 1
+
+
+def _parse_oneport(toks: _Tokens) -> Any:
+    # Parses one one-port descriptor from the cursor, leaving it on the
+    # first token after it
+    tokens = toks.tokens
+    n = len(tokens)
+    i = toks.i
+
+    # Frames are [kind, operand so far, pending operator, bridge parts]
+    stack: list[list] = [['top', None, None, []]]
+    while True:
+        if i == n:
+            raise toks.fail("Unexpected end of descriptor", i)
+        tok = tokens[i]
+        i += 1
+        if tok == '(':
+            stack.append(['paren', None, None, []])
+            continue
+        if tok == '<':
+            if i == n or tokens[i] != '(':
+                raise toks.fail("Expected '(' after '<'", i)
+            i += 1
+            stack.append(['bridge', None, None, []])
+            continue
+        if tok not in ELEMENTS:
+            raise toks.fail(f"Unexpected token: {tok}", i - 1)
+
+        value: Any = tok
+        while True:
+            frame = stack[-1]
+            if frame[2] is not None:
+                value = (frame[2], frame[1], value)
+            frame[1] = value
+            frame[2] = None
+            if i < n and tokens[i] in ('+', '|'):
+                frame[2] = tokens[i]
+                i += 1
+                break
+            kind = frame[0]
+            if kind == 'top':
+                toks.i = i
+                return frame[1]
+            if kind == 'paren':
+                if i == n or tokens[i] != ')':
+                    raise toks.fail("Mismatched parentheses in descriptor", i)
+                i += 1
+                stack.pop()
+                value = frame[1]
+                continue
+            parts = frame[3]
+            parts.append(frame[1])
+            frame[1] = None
+            for expected, reason in BRIDGE_STEPS[len(parts) - 1]:
+                if i == n or tokens[i] != expected:
+                    raise toks.fail(reason, i)
+                i += 1
+            if len(parts) < 5:
+                break
+            stack.pop()
+            a, b, c, d, e = parts
+            value = ('/', ('&', a, b), ('&', c, d), e)
+
+
+def _parse_arm(toks: _Tokens) -> Any:
+    # A two-port arm: a one-port descriptor, or O or S
+    if toks.peek() in TERMINALS:
+        toks.i += 1
+        return toks.tokens[toks.i - 1]
+    return _parse_oneport(toks)
+
+
+def _parse_block(toks: _Tokens) -> Any:
+    # One two-port block: T<l,m,r>, P<l,m,r>, [&x] or [/x]
+    tok = toks.peek()
+    if tok in ('T', 'P'):
+        toks.i += 1
+        toks.expect('<', f"Expected '<' after '{tok}'")
+        left = _parse_arm(toks)
+        toks.expect(',', f"Expected ',' after first arm of '{tok}'")
+        mutual = _parse_arm(toks)
+        toks.expect(',', f"Expected ',' after second arm of '{tok}'")
+        right = _parse_arm(toks)
+        toks.expect('>', f"Expected '>' after third arm of '{tok}'")
+        return (tok, left, mutual, right)
+    if tok == '[':
+        toks.i += 1
+        role = toks.peek()
+        if role not in ('&', '/'):
+            raise toks.fail("Expected '&' or '/' after '['")
+        toks.i += 1
+        arm = _parse_arm(toks)
+        toks.expect(']', "Expected ']' after arm")
+        return (f"[{role}]", arm)
+    if tok is None:
+        raise toks.fail("Unexpected end of descriptor")
+    raise toks.fail(f"Expected two-port block, got: {tok}")
+
+
+def _parse_cascade(toks: _Tokens) -> Any:
+    # Blocks separated by ':', nested to the right
+    blocks = [_parse_block(toks)]
+    while toks.peek() == ':':
+        toks.i += 1
+        blocks.append(_parse_block(toks))
+    value = blocks.pop()
+    while blocks:
+        value = (':', blocks.pop(), value)
+    return value
+
+
+@hooks.stage
 def parse_descriptor(s: str) -> Any:
     """
     Parses a string descriptor of a network into an Abstract Syntax Tree (AST).
 
+    Parsing is a single left-to-right pass with an explicit stack, so it
+    takes time linear in the length of the descriptor and is not limited by
+    the recursion limit however deeply the descriptor is nested. The whole
+    string must be one descriptor: tokens left over after it are an error.
+
+    A descriptor starting with 'T', 'P' or '[' is a two-port cascade (see
+    `pynntt.twoport`), whose arms are one-port descriptors, 'O' or 'S'.
+
     Args:
-        s: The string descriptor (e.g., "R+(L|C)").
+        s: The string descriptor (e.g., "R+(L|C)" or "T<R,L,R>:[/C]").
 
     Returns:
         The AST representation of the network.
 
     Raises:
-        ValueError: If the descriptor string is malformed or contains unexpected tokens.
-    """
-    s = s.strip()
-    tokens = re.findall(r'[RLC()]|[+|/<>@&]', s)
-
-    def parse_expr(tokens: list) -> Any:
-        def parse_primary() -> Any:
-            tok = tokens.pop(0)
-            if tok == '(': 
-                e = parse_expr(tokens)
-                if not tokens or tokens.pop(0) != ')':
-                    raise ValueError("Mismatched parentheses in descriptor")
-                return e
-            elif tok == '<':
-                if not tokens or tokens.pop(0) != '(':
-                    raise ValueError("Expected '(' after '<'")
-                a = parse_expr(tokens)
-                if not tokens or tokens.pop(0) != '&':
-                    raise ValueError("Expected '&' after first element in bridge")
-                b = parse_expr(tokens)
-                if not tokens or tokens.pop(0) != ')':
-                    raise ValueError("Expected ')' after second element in bridge")
-                if not tokens or tokens.pop(0) != '@':
-                    raise ValueError("Expected '@' after bridge arm 1")
-                if not tokens or tokens.pop(0) != '(':
-                    raise ValueError("Expected '(' after '@'")
-                c = parse_expr(tokens)
-                if not tokens or tokens.pop(0) != '&':
-                    raise ValueError("Expected '&' after third element in bridge")
-                d = parse_expr(tokens)
-                if not tokens or tokens.pop(0) != ')':
-                    raise ValueError("Expected ')' after fourth element in bridge")
-                if not tokens or tokens.pop(0) != '/':
-                    raise ValueError("Expected '/' after bridge arm 2")
-                e = parse_expr(tokens)
-                if not tokens or tokens.pop(0) != '>':
-                    raise ValueError("Expected '>' after bridge expression")
-                return ('/', ('&', a, b), ('&', c, d), e)
-            elif tok in ELEMENTS: return tok
-            else: raise ValueError(f"Unexpected token: {tok}")
-
-        lhs = parse_primary()
-        while tokens and tokens[0] in '+|':
-            op = tokens.pop(0)
-            rhs = parse_primary()
-            lhs = (op, lhs, rhs)
-        return lhs
-
-    return parse_expr(tokens)
+        DescriptorError: If the descriptor string is malformed or contains
+            unexpected characters or tokens. This is a ValueError carrying
+            the position of the failure.
+    """
+    toks = _Tokens(s)
+    if toks.peek() in ('T', 'P', '['):
+        ast = _parse_cascade(toks)
+    else:
+        ast = _parse_oneport(toks)
+    if toks.peek() is not None:
+        raise toks.fail(f"Unexpected token: {toks.peek()}")
+    return ast
+
 
+def parse_many(descriptors: Iterable[str]) -> Iterator[Any]:
+    """
+    Parses many descriptor strings, yielding an AST or an error for each.
+
+    Args:
+        descriptors: An iterable of descriptor strings.
+
+    Returns:
+        An iterator giving, in input order, the AST of each descriptor, or
+        the DescriptorError (with reason, position and descriptor) that
+        parsing it raised.
+    """
+    for desc in descriptors:
+        try:
+            yield parse_descriptor(desc)
+        except DescriptorError as error:
+            yield error
 
+
+def format_descriptor(expr: Any) -> str:
+    """
+    Formats a network descriptor (AST) as a descriptor string.
+
+    This is the inverse of `parse_descriptor`: parentheses are only added
+    where they are needed for the string to parse back to the same AST.
+
+    Args:
+        expr: The network descriptor (AST).
+
+    Returns:
+        The descriptor string (e.g., "R+(L|C)").
+
+    Raises:
+        ValueError: If an unrecognized structure is encountered.
+    """
+    if is_atomic(expr):
+        return expr
+
+    if isinstance(expr, tuple):
+        op, *args = expr
+        if op in ('+', '|') and len(args) == 2:
+            lhs, rhs = args
+            lhs_str = format_descriptor(lhs)
+            rhs_str = format_descriptor(rhs)
+            if isinstance(lhs, tuple) and lhs[0] not in (op, '/'):
+                lhs_str = f"({lhs_str})"
+            if isinstance(rhs, tuple) and rhs[0] != '/':
+                rhs_str = f"({rhs_str})"
+            return f"{lhs_str}{op}{rhs_str}"
+        elif op == '/' and len(args) == 3:
+            (_, a, b), (_, c, d), e = args
+            a, b, c, d, e = (format_descriptor(x) for x in (a, b, c, d, e))
+            return f"<({a}&{b})@({c}&{d})/{e}>"
+        elif op in ('T', 'P') and len(args) == 3:
+            arms = ','.join(_format_arm(x) for x in args)
+            return f"{op}<{arms}>"
+        elif op in ('[&]', '[/]') and len(args) == 1:
+            return f"{op[:2]}{_format_arm(args[0])}]"
+        elif op == ':' and len(args) == 2:
+            return ':'.join(format_descriptor(x) for x in args)
+
+    raise ValueError(f"Unrecognized structure: {expr}")
+
+
+def _format_arm(expr: Any) -> str:
+    return expr if expr in TERMINALS else format_descriptor(expr)
+
+
+@hooks.stage
 def canonical_form(Z_expr: sp.Expr) -> sp.Expr:
     """
     Converts a SymPy impedance expression into its canonical form (simplified fraction).
@@ -163,6 +431,7 @@ def canonical_form(Z_expr: sp.Expr) -> sp.Expr:
     Returns:
         A simplified SymPy expression representing the canonical form.
     """
+    import sympy as sp
     # Ensure the expression is expanded and combined
     Z_expanded = sp.together(Z_expr.expand())
     # Get numerator and denominator as SymPy expressions
@@ -0,0 +1,320 @@
+"""
+numeric.py — Compilation of network ASTs into vectorised NumPy kernels
+
+A descriptor AST is compiled once into a plain Python function of NumPy
+arrays. The kernel evaluates the complex impedance Z(jω) over an array of
+angular frequencies and a batch of component-value vectors in one call,
+using the same series, parallel and bridge semantics as `eval_impedance`.
+
+`compile_sensitivity` compiles the same evaluation together with its
+adjoint (reverse-mode) pass, giving Z(jω) and the full Jacobian
+∂Z/∂(R1.., L1.., C1..) at the cost of about two evaluations, whatever the
+number of components.
+"""
+
+import numpy as np
+from typing import Any, Callable, NamedTuple
+from pynntt.networks import ELEMENTS, TERMINALS, TWOPORT_OPS
+
+Kernel = Callable[[np.ndarray, np.ndarray], np.ndarray]
+
+
+def component_names(expr: Any) -> list[str]:
+    """
+    Lists the component names of a network descriptor (AST).
+
+    Names are numbered in the same left-to-right order as `eval_impedance`,
+    and returned grouped as R1.., L1.., C1... This is the column order of
+    the component-value arrays accepted by compiled kernels.
+
+    Raises:
+        ValueError: If an unrecognized structure is encountered.
+    """
+    counter = {'R': 0, 'L': 0, 'C': 0}
+    stack = [expr]
+    while stack:
+        e = stack.pop()
+        if isinstance(e, str) and e in ELEMENTS:
+            counter[e] += 1
+        elif e in TERMINALS:
+            continue
+        elif isinstance(e, tuple) and e and \
+                e[0] in ('+', '|', '/', '&') + TWOPORT_OPS:
+            stack.extend(reversed(e[1:]))
+        else:
+            raise ValueError(f"Unrecognized structure: {e}")
+    return [f"{label}{i}"
+            for label in ELEMENTS for i in range(1, counter[label] + 1)]
+
+
+class _Node(NamedTuple):
+    """
+    A subnetwork evaluated by the forward pass: its operator (an element
+    letter, '+', '|' or '/'), the variable holding its impedance, and the
+    variables it was computed from. For an element these are its component
+    name; for a bridge, the five arm impedances followed by the
+    intermediates (za + zb), (zc + zd) and the denominator.
+    """
+    op: str
+    z: str
+    operands: tuple[str, ...]
+
+
+def _forward_source(expr: Any, name: str
+                    ) -> tuple[list[str], str, list[_Node]]:
+    """
+    Generates the header and forward pass shared by the impedance and
+    sensitivity kernels of a network (AST).
+
+    Returns:
+        The source lines, the variable holding Z(jω), and the evaluated
+        subnetworks in the order of the forward pass.
+
+    Raises:
+        ValueError: If an unrecognized structure is encountered.
+    """
+    names = component_names(expr)
+    counter = {'R': 0, 'L': 0, 'C': 0}
+    lines = [
+        f"def {name}(omega, values):",
+        "    jw = 1j * np.asarray(omega, dtype=float)",
+        "    values = np.asarray(values, dtype=float)",
+        "    if values.ndim == 2:",
+        "        jw = jw[np.newaxis, :]",
+        "        values = values.T[:, :, np.newaxis]",
+    ]
+    for i, n in enumerate(names):
+        lines.append(f"    {n} = values[{i}]")
+    nodes: list[_Node] = []
+    temps = [0]
+
+    def emit(code: str) -> str:
+        t = f"z{temps[0]}"
+        temps[0] += 1
+        lines.append(f"    {t} = {code}")
+        return t
+
+    def compile_recursive(e: Any) -> str:
+        if isinstance(e, str) and e in ELEMENTS:
+            counter[e] += 1
+            n = f"{e}{counter[e]}"
+            if e == 'R':
+                z = n
+            elif e == 'L':
+                z = emit(f"jw * {n}")
+            else:
+                z = emit(f"1 / (jw * {n})")
+            nodes.append(_Node(e, z, (n,)))
+            return z
+
+        if isinstance(e, tuple):
+            op, *args = e
+            if op == '+':
+                z1 = compile_recursive(args[0])
+                z2 = compile_recursive(args[1])
+                z = emit(f"{z1} + {z2}")
+                nodes.append(_Node(op, z, (z1, z2)))
+                return z
+            elif op == '|':
+                z1 = compile_recursive(args[0])
+                z2 = compile_recursive(args[1])
+                z = emit(f"{z1} * {z2} / ({z1} + {z2})")
+                nodes.append(_Node(op, z, (z1, z2)))
+                return z
+            elif op == '/':
+                za = compile_recursive(args[0][1])
+                zb = compile_recursive(args[0][2])
+                zc = compile_recursive(args[1][1])
+                zd = compile_recursive(args[1][2])
+                ze = compile_recursive(args[2])
+                ab = emit(f"{za} + {zb}")
+                cd = emit(f"{zc} + {zd}")
+                num = emit(f"{za} * {zb} * {cd} + {zc} * {zd} * {ab} + "
+                           f"{ab} * {cd} * {ze}")
+                den = emit(f"({za} + {zc}) * ({zb} + {zd}) + "
+                           f"({ab} + {cd}) * {ze}")
+                z = emit(f"{num} / {den}")
+                nodes.append(_Node(op, z, (za, zb, zc, zd, ze, ab, cd, den)))
+                return z
+
+        raise ValueError(f"Unrecognized structure: {e}")
+
+    result = compile_recursive(expr)
+    return lines, result, nodes
+
+
+def impedance_source(expr: Any, name: str = 'impedance') -> str:
+    """
+    Generates the Python source of a NumPy kernel for a network (AST).
+
+    Raises:
+        ValueError: If an unrecognized structure is encountered.
+    """
+    lines, result, nodes = _forward_source(expr, name)
+    if any(node.op in ('L', 'C') for node in nodes):
+        lines.append(f"    return {result}")
+    else:
+        # Purely resistive: broadcast to the full output shape
+        lines.append(f"    return {result} + 0j * jw")
+    return "\n".join(lines) + "\n"
+
+
+def sensitivity_source(expr: Any, name: str = 'sensitivity') -> str:
+    """
+    Generates the Python source of a NumPy kernel for a network (AST) that
+    returns Z(jω) and its derivatives with respect to each component.
+
+    The forward pass is that of `impedance_source`; the reverse pass then
+    carries the adjoint ∂Z/∂z of each subnetwork impedance z from the root
+    down to the elements, using the local derivatives of the series,
+    parallel and bridge rules. Each subnetwork has exactly one parent, so
+    every adjoint is assigned once.
+
+    Raises:
+        ValueError: If an unrecognized structure is encountered.
+    """
+    lines, result, nodes = _forward_source(expr, name)
+    names = component_names(expr)
+    derivatives: dict[str, str] = {}
+    lines.append("    shape = np.broadcast_shapes(np.shape(jw), "
+                 "np.shape(values[0]))")
+    lines.append(f"    g_{result} = 1")
+    for op, z, operands in reversed(nodes):
+        if op == 'R':
+            derivatives[operands[0]] = f"g_{z}"
+        elif op == 'L':
+            derivatives[operands[0]] = f"g_{z} * jw"
+        elif op == 'C':
+            n = operands[0]
+            derivatives[n] = f"-g_{z} * {z} / {n}"
+        elif op == '+':
+            z1, z2 = operands
+            lines.append(f"    g_{z1} = g_{z}")
+            lines.append(f"    g_{z2} = g_{z}")
+        elif op == '|':
+            z1, z2 = operands
+            lines.append(f"    g_{z1} = g_{z} * ({z2} / ({z1} + {z2})) ** 2")
+            lines.append(f"    g_{z2} = g_{z} * ({z1} / ({z1} + {z2})) ** 2")
+        else:
+            za, zb, zc, zd, ze, ab, cd, den = operands
+            # ∂z/∂x = (∂num/∂x - z·∂den/∂x) / den
+            h = f"h_{z}"
+            lines.extend(f"    {line}" for line in [
+                f"{h} = g_{z} / {den}",
+                f"g_{za} = {h} * ({zb} * {cd} + {zc} * {zd} + "
+                f"{cd} * {ze} - {z} * ({zb} + {zd} + {ze}))",
+                f"g_{zb} = {h} * ({za} * {cd} + {zc} * {zd} + "
+                f"{cd} * {ze} - {z} * ({za} + {zc} + {ze}))",
+                f"g_{zc} = {h} * ({zd} * {ab} + {za} * {zb} + "
+                f"{ab} * {ze} - {z} * ({zb} + {zd} + {ze}))",
+                f"g_{zd} = {h} * ({zc} * {ab} + {za} * {zb} + "
+                f"{ab} * {ze} - {z} * ({za} + {zc} + {ze}))",
+                f"g_{ze} = {h} * ({ab} * {cd} - {z} * ({ab} + {cd}))",
+            ])
+    lines.append("    Z = np.empty(shape, dtype=complex)")
+    lines.append(f"    Z[...] = {result}")
+    lines.append(f"    J = np.empty(shape + ({len(names)},), dtype=complex)")
+    for i, n in enumerate(names):
+        lines.append(f"    J[..., {i}] = {derivatives[n]}")
+    lines.append("    return Z, J")
+    return "\n".join(lines) + "\n"
+
+
+def compile_impedance(expr: Any) -> Kernel:
+    """
+    Compiles a network descriptor (AST) into a vectorised NumPy kernel.
+
+    The kernel is called as `kernel(omega, values)`. `omega` is a 1-D array
+    of angular frequencies. `values` is either a 1-D vector of component
+    values, giving a result of shape [n_freqs], or a 2-D batch of shape
+    [n_samples, n_components], giving a result of shape
+    [n_samples, n_freqs]. Columns follow `component_names(expr)`.
+
+    Args:
+        expr: The network descriptor (AST).
+
+    Returns:
+        The compiled kernel. Its `components` attribute lists the
+        component names and its `source` attribute holds the generated
+        code.
+
+    A two-port descriptor gives the impedance at port 1 with port 2 open,
+    from `pynntt.twoport.compile_twoport_impedance`.
+
+    Raises:
+        ValueError: If an unrecognized structure is encountered.
+    """
+    if isinstance(expr, tuple) and expr and expr[0] in TWOPORT_OPS:
+        from pynntt.twoport import compile_twoport_impedance
+        return compile_twoport_impedance(expr)
+    source = impedance_source(expr)
+    namespace: dict[str, Any] = {'np': np}
+    exec(compile(source, '<pynntt.numeric>', 'exec'), namespace)
+    kernel = namespace['impedance']
+    kernel.components = component_names(expr)
+    kernel.source = source
+    return kernel
+
+
+def compile_sensitivity(expr: Any) -> Callable[[np.ndarray, np.ndarray],
+                                               tuple[np.ndarray, np.ndarray]]:
+    """
+    Compiles a network descriptor (AST) into a vectorised NumPy kernel of
+    its impedance and the impedance's sensitivities to component values.
+
+    The kernel is called as `kernel(omega, values)`, with the arguments of
+    a `compile_impedance` kernel, and returns `(Z, J)`. Z is as from
+    `compile_impedance`; J has one more trailing axis, of length
+    n_components, with J[..., i] = ∂Z/∂x_i for the i-th name of
+    `component_names(expr)`. Both come from one forward and one reverse
+    pass over the AST.
+
+    Args:
+        expr: The network descriptor (AST).
+
+    Returns:
+        The compiled kernel, with `components` and `source` attributes as
+        for `compile_impedance`.
+
+    Raises:
+        ValueError: If an unrecognized structure is encountered, or expr
+            is a two-port descriptor.
+    """
+    if isinstance(expr, tuple) and expr and expr[0] in TWOPORT_OPS:
+        raise ValueError("Sensitivities of two-port descriptors are not "
+                         "supported")
+    source = sensitivity_source(expr)
+    namespace: dict[str, Any] = {'np': np}
+    exec(compile(source, '<pynntt.numeric>', 'exec'), namespace)
+    kernel = namespace['sensitivity']
+    kernel.components = component_names(expr)
+    kernel.source = source
+    return kernel
+
+
+def eval_impedance_numeric(expr: Any, omega: Any, values: Any) -> np.ndarray:
+    """
+    Evaluates Z(jω) of a network descriptor (AST) for the given values.
+    """
+    return compile_impedance(expr)(omega, values)
+
+
+def sweep_impedance(kernel: Kernel, omega: Any, values: Any,
+                    block_size: int = 1 << 16) -> np.ndarray:
+    """
+    Evaluates a compiled kernel over a large batch in bounded-size blocks.
+
+    Rows of `values` are processed in blocks of about `block_size` output
+    elements, so that temporaries stay small however many samples and
+    frequencies are requested.
+
+    Returns:
+        A complex array of shape [n_samples, n_freqs].
+    """
+    omega = np.asarray(omega, dtype=float)
+    values = np.atleast_2d(np.asarray(values, dtype=float))
+    out = np.empty((values.shape[0], omega.shape[0]), dtype=complex)
+    step = max(1, block_size // max(1, omega.shape[0]))
+    for start in range(0, values.shape[0], step):
+        out[start:start + step] = kernel(omega, values[start:start + step])
+    return out
@@ -0,0 +1,232 @@
+"""
+polyring.py — Impedance evaluation over sparse polynomial rings
+
+Every subnetwork is carried as a (numerator, denominator) pair of sparse
+polynomials over ZZ[R1..Rn, L1..Lm, C1..Ck, s]. Series, parallel and bridge
+compositions combine these pairs directly and cancel common factors as they
+go, so the canonical N(s)/D(s) is produced without building nested SymPy
+fractions or running an expand/together pass. Two-port cascades are
+multiplied out as division-free ABCD matrices and cancelled once.
+"""
+
+import sympy as sp
+from typing import Any, Callable
+from sympy.polys.domains import ZZ
+from sympy.polys.rings import PolyElement, PolyRing
+from pynntt import hooks
+from pynntt.networks import ELEMENTS, TERMINALS, TWOPORT_OPS, is_atomic, s
+from pynntt.twoport import chain_matrix, projective_section_matrix, \
+    twoport_sections
+
+Fraction = tuple[PolyElement, PolyElement]
+
+
+def impedance_symbols(expr: Any) -> list[sp.Symbol]:
+    """
+    Lists the component symbols of a network descriptor (AST).
+
+    Symbols are numbered in the same left-to-right order as
+    `eval_impedance`, and returned grouped as R1.., L1.., C1...
+
+    Raises:
+        ValueError: If an unrecognized structure is encountered.
+    """
+    counter = {'R': 0, 'L': 0, 'C': 0}
+    stack = [expr]
+    while stack:
+        e = stack.pop()
+        if is_atomic(e):
+            counter[e] += 1
+        elif e in TERMINALS:
+            continue
+        elif isinstance(e, tuple) and e and \
+                e[0] in ('+', '|', '/', '&') + TWOPORT_OPS:
+            stack.extend(reversed(e[1:]))
+        else:
+            raise ValueError(f"Unrecognized structure: {e}")
+    return [sp.Symbol(f"{label}{i}", positive=True)
+            for label in ELEMENTS for i in range(1, counter[label] + 1)]
+
+
+def impedance_ring(expr: Any) -> PolyRing:
+    """
+    Builds the polynomial ring ZZ[R1..Rn, L1.., C1.., s] for a network.
+    """
+    return PolyRing(impedance_symbols(expr) + [s], ZZ)
+
+
+def series_fraction(z1: Fraction, z2: Fraction) -> Fraction:
+    """
+    Combines two impedance fractions in series.
+    """
+    (n1, d1), (n2, d2) = z1, z2
+    if d1 == d2:
+        return (n1 + n2).cancel(d1)
+    return (n1 * d2 + n2 * d1).cancel(d1 * d2)
+
+
+def parallel_fraction(z1: Fraction, z2: Fraction) -> Fraction:
+    """
+    Combines two impedance fractions in parallel.
+    """
+    (n1, d1), (n2, d2) = z1, z2
+    return (n1 * n2).cancel(n1 * d2 + n2 * d1)
+
+
+def bridge_fraction(za: Fraction, zb: Fraction, zc: Fraction,
+                    zd: Fraction, ze: Fraction) -> Fraction:
+    """
+    Combines five impedance fractions using the bridge formula.
+
+    This is the formula used by `eval_impedance`, with numerator and
+    denominator both multiplied through by the product of the arm
+    denominators.
+    """
+    (na, da), (nb, db), (nc, dc), (nd, dd), (ne, de) = za, zb, zc, zd, ze
+    ab = na * db + da * nb
+    cd = nc * dd + dc * nd
+    num = (na * nb * cd + nc * nd * ab) * de + ab * cd * ne
+    den = ((na * dc + da * nc) * (nb * dd + db * nd) * de +
+           (ab * dc * dd + da * db * cd) * ne)
+    return num.cancel(den)
+
+
+def cancel_monomial(num: PolyElement, den: PolyElement) -> Fraction:
+    """
+    Divides out the greatest monomial common to num and den, which
+    `cancel` handles slowly when the polynomials are large.
+    """
+    monoms = list(num.monoms()) + list(den.monoms())
+    common = tuple(min(exps) for exps in zip(*monoms))
+    ring = num.ring
+
+    def divide(p: PolyElement) -> PolyElement:
+        return ring.from_dict({tuple(x - y for x, y in zip(monom, common)): c
+                               for monom, c in p.terms()})
+
+    return divide(num), divide(den)
+
+
+def twoport_fraction(expr: Any, evaluate: Callable[[Any], Fraction],
+                     ring: PolyRing) -> Fraction:
+    """
+    Evaluates the impedance fraction at port 1 of a two-port descriptor
+    (AST) with port 2 open, from the division-free ABCD matrix product
+    of `pynntt.twoport.projective_section_matrix`.
+
+    Each section's matrix is a multiple of one with determinant 1, so a
+    factor common to A and C must divide the numerator or denominator of
+    an arm. Only those factors are tried, after the common monomial, and
+    A and C are never put through a gcd. An open series or shorted shunt
+    arm makes the product singular, and then A and C are cancelled fully.
+
+    Args:
+        expr: The two-port descriptor (AST).
+        evaluate: Called on each one-port arm, from port 1 to port 2, to
+            give its impedance fraction.
+        ring: The ring to evaluate in.
+
+    Raises:
+        ValueError: If an unrecognized structure is encountered, or the
+            input is an open circuit whatever the component values.
+    """
+    arms: list[Fraction] = []
+
+    def evaluate_arm(arm: Any) -> Fraction:
+        arms.append(evaluate(arm))
+        return arms[-1]
+
+    (a, _), (c, _) = chain_matrix(expr, evaluate_arm,
+                                  projective_section_matrix)
+    if isinstance(c, int) and c == 0:
+        raise ValueError("Two-port input is an open circuit")
+    num, den = ring(a), ring(c)
+    if not num:
+        return ring.zero, ring.one
+    if ('&', 'O') in twoport_sections(expr) or \
+            ('/', 'S') in twoport_sections(expr):
+        num, den = num.cancel(den)
+    else:
+        num, den = cancel_monomial(num, den)
+        factors = {f for z in arms for p in z if p.is_ground is False
+                   for f, _ in p.factor_list()[1] if len(f.terms()) > 1}
+        for f in factors:
+            while True:
+                q1, r1 = divmod(num, f)
+                q2, r2 = divmod(den, f) if not r1 else (None, r1)
+                if r1 or r2:
+                    break
+                num, den = q1, q2
+    if den.LC < 0:
+        num, den = -num, -den
+    return num, den
+
+
+def eval_impedance_fraction(expr: Any,
+                            ring: PolyRing | None = None) -> Fraction:
+    """
+    Evaluates a network descriptor (AST) into a cancelled polynomial pair.
+
+    Args:
+        expr: The network descriptor (AST).
+        ring: The ring to evaluate in. Defaults to `impedance_ring(expr)`.
+
+    Returns:
+        A (numerator, denominator) pair of ring elements with no common
+        factor and a positive leading coefficient in the denominator.
+
+    Raises:
+        ValueError: If an unrecognized structure is encountered.
+    """
+    if ring is None:
+        ring = impedance_ring(expr)
+    gens = dict(zip(ring.symbols, ring.gens))
+    gs = gens[s]
+    counter = {'R': 0, 'L': 0, 'C': 0}
+
+    def make_gen(label: str) -> PolyElement:
+        counter[label] += 1
+        return gens[sp.Symbol(f"{label}{counter[label]}", positive=True)]
+
+    def eval_recursive(e: Any) -> Fraction:
+        if is_atomic(e):
+            g = make_gen(e)
+            if e == 'R':
+                return (g, ring.one)
+            if e == 'L':
+                return (g * gs, ring.one)
+            return (ring.one, g * gs)
+
+        if isinstance(e, tuple):
+            op, *args = e
+            if op == '+':
+                return series_fraction(eval_recursive(args[0]),
+                                       eval_recursive(args[1]))
+            elif op == '|':
+                return parallel_fraction(eval_recursive(args[0]),
+                                         eval_recursive(args[1]))
+            elif op == '/':
+                za = eval_recursive(args[0][1])
+                zb = eval_recursive(args[0][2])
+                zc = eval_recursive(args[1][1])
+                zd = eval_recursive(args[1][2])
+                ze = eval_recursive(args[2])
+                return bridge_fraction(za, zb, zc, zd, ze)
+            elif op in TWOPORT_OPS:
+                return twoport_fraction(e, eval_recursive, ring)
+
+        raise ValueError(f"Unrecognized structure: {e}")
+
+    return eval_recursive(expr)
+
+
+@hooks.stage
+def eval_canonical_impedance(expr: Any) -> sp.Expr:
+    """
+    Evaluates a network descriptor (AST) directly into canonical N(s)/D(s).
+
+    The result is equal, as a rational function, to
+    `canonical_form(eval_impedance(expr))`.
+    """
+    num, den = eval_impedance_fraction(expr)
+    return num.as_expr() / den.as_expr()
@@ -1,100 +1,116 @@
 import sympy as sp  # type: ignore
 from typing import Any
+from pynntt import hooks
+from pynntt import regularity_conditions
 
 s = sp.Symbol("s", positive=True, real=True)
 
 def is_positive_real_rational_function(Z_expr: sp.Expr) -> bool:
     """
-    Determines if a given SymPy expression is a positive-real rational
-    function. For now, this is a placeholder that only checks if it's a
-    rational function.
+    Determines if a given SymPy expression may be a positive-real rational
+    function, using `is_positive_real`. Only inputs proven not PR are
+    rejected; those left undecided by symbolic coefficients are accepted.
     """
-    return Z_expr.is_rational_function(s)
+    return is_positive_real(Z_expr) is not False
 
-def is_necessarily_regular(Z_expr: sp.Expr) -> bool:
+
+@hooks.stage
+def is_necessarily_regular(Z_expr: sp.Expr) -> bool | None:
     """
     Determines if a given impedance expression is necessarily regular.
-    """
-    # Guard against non-SymPy expressions or non-rational functions
-    if not isinstance(Z_expr, sp.Expr) or \
-       not is_positive_real_rational_function(Z_expr):
-        return False
 
-    # First, try the biquadratic test if applicable
-    try:
-        num, den = sp.fraction(Z_expr)
-        num = sp.expand(num)
-        den = sp.expand(den)
-
-        # Check if numerator and denominator are polynomials in s
-        if num.is_polynomial(s) and den.is_polynomial(s):
-            ndeg = sp.degree(num, s)
-            ddeg = sp.degree(den, s)
-            if max(ndeg, ddeg) <= 2:
-                return is_necessarily_regular_biquadratic(Z_expr)
-            else:
-                return is_necessarily_regular_by_definition_optimised(Z_expr)
-        else:
-            return is_necessarily_regular_by_definition_optimised(Z_expr)
-
-    except Exception: # Catch errors if Z_expr is not a valid polynomial for degree check
-        return is_necessarily_regular_by_definition_optimised(Z_expr)
+    Third-order functions are first tested against the precompiled
+    conditions of `is_necessarily_regular_triquadratic`. Otherwise, or if
+    those are undecided, the exact root-isolation test is tried; the
+    biquadratic and definition-based tests are only used when it is
+    undecided. Each test tried is reported as a 'regularity_path' event
+    (see `pynntt.hooks`).
 
-    # Fallback to definition-based test for non-biquadratic or complex cases
-    return is_necessarily_regular_by_definition_optimised(Z_expr)
+    Z is split into its numerator and denominator once, and the
+    positive-real test runs at most once: the third-order conditions only
+    run it when their verdict needs it, and otherwise it runs here before
+    the other tests, which take Z to be PR.
 
-def is_necessarily_regular_biquadratic(Z_expr: sp.Expr) -> bool:
+    Returns:
+        True if the function is necessarily regular, False if it is not
+        (including when it is not a PR rational function), and None if no
+        test decides it.
+    """
+    polys = _impedance_polys(Z_expr)
+    if polys is None:
+        return False
+    degree = max(p.degree() for p in polys)
+    if degree == 3:
+        hooks.emit('regularity_path', path='triquadratic')
+        decided = _triquadratic_regularity(*polys)
+        if decided is not None:
+            return decided
+
+    if _positive_real(*polys) is False:
+        return False
+    hooks.emit('regularity_path', path='root_isolation')
+    decided = _root_isolation_regularity(*polys)
+    if decided is not None:
+        return decided
+
+    if degree <= 2:
+        hooks.emit('regularity_path', path='biquadratic')
+        return _biquadratic_regularity(*polys)
+    # The definition-based test works in this module's s, and cannot
+    # compare symbolic minima
+    Z_expr = Z_expr.xreplace({polys[0].gen: s})
+    if Z_expr.free_symbols - {s}:
+        return None
+    hooks.emit('regularity_path', path='definition')
+    return is_necessarily_regular_by_definition_optimised(Z_expr,
+                                                          maybe_pr=True)
+
+
+def is_necessarily_regular_biquadratic(
+        Z_expr: sp.Expr, maybe_pr: bool | None = None) -> bool | None:
     """
     Tests whether a biquadratic PR function Z(s) is regular using the Morelli & Smith algebraic test.
 
     Args:
         Z_expr: The SymPy expression for the impedance.
+        maybe_pr: Whether Z may be PR (`is_positive_real_rational_function`)
+            if the caller already knows; otherwise it is tested here.
 
     Returns:
-        True if the function is necessarily regular, False otherwise.
+        True if the function is necessarily regular, False otherwise, and
+        None if the signs of symbolic coefficients do not decide it.
     """
-    if not isinstance(Z_expr, sp.Expr) or \
-       not is_positive_real_rational_function(Z_expr):
+    polys = _impedance_polys(Z_expr)
+    if polys is None:
         return False
+    if maybe_pr is None:
+        maybe_pr = _positive_real(*polys) is not False
+    if not maybe_pr:
+        return False
+    return _biquadratic_regularity(*polys)
 
-    num, den = sp.fraction(Z_expr)
-
-    num = sp.expand(num)
-    den = sp.expand(den)
 
-    ndeg = sp.degree(num, s)
-    ddeg = sp.degree(den, s)
-    if max(ndeg, ddeg) > 2:
+def _biquadratic_regularity(num: sp.Poly, den: sp.Poly) -> bool | None:
+    """
+    The test of `is_necessarily_regular_biquadratic` on Z = num/den, taken
+    to be PR.
+    """
+    if max(num.degree(), den.degree()) > 2:
         return False  # Not a biquadratic
 
-    # Ensure coefficients are extracted correctly, padding with zeros if necessary
-    # For a biquadratic, the polynomials are of degree at most 2.
-    # sp.Poly(poly, var).all_coeffs() returns coeffs from highest to lowest degree.
-    # We need to ensure we have A, B, C and D, E, F for degree 2 polynomials.
-    # If degree is less than 2, sp.Poly will return fewer coefficients.
-    # We need to pad them to ensure A,B,C and D,E,F are always present.
-
-    num_coeffs = sp.Poly(num, s).all_coeffs()
-    den_coeffs = sp.Poly(den, s).all_coeffs()
-
-    A, B, C = (sp.sympify(0), sp.sympify(0), sp.sympify(0))
-    D, E, F = (sp.sympify(0), sp.sympify(0), sp.sympify(0))
+    # Pad the coefficients, highest degree first, so that A, B, C and D,
+    # E, F are always present
+    A, B, C = ([sp.S.Zero] * 3 + num.all_coeffs())[-3:]
+    D, E, F = ([sp.S.Zero] * 3 + den.all_coeffs())[-3:]
 
-    if len(num_coeffs) == 3: A, B, C = num_coeffs
-    elif len(num_coeffs) == 2: B, C = num_coeffs
-    elif len(num_coeffs) == 1: C = num_coeffs[0]
-
-    if len(den_coeffs) == 3: D, E, F = den_coeffs
-    elif len(den_coeffs) == 2: E, F = den_coeffs
-    elif len(den_coeffs) == 1: F = den_coeffs[0]
-
-    # Convert to SymPy expressions to ensure proper symbolic operations
-    A, B, C = sp.sympify(A), sp.sympify(B), sp.sympify(C)
-    D, E, F = sp.sympify(D), sp.sympify(E), sp.sympify(F)
-
-    sigma = sp.simplify(B*E - (sp.sqrt(A*F) - sp.sqrt(C*D))**2)
-    if sigma < 0:
+    # Simplifying symbolic sigma rarely settles its sign and is slow
+    sigma = B*E - (sp.sqrt(A*F) - sp.sqrt(C*D))**2
+    if sigma.is_nonnegative is None and not sigma.free_symbols:
+        sigma = sp.simplify(sigma)
+    if sigma.is_negative:
         return False
+    if sigma.is_nonnegative is None:
+        return None
 
     Delta = A*F - C*D
     K = (A*F - C*D)**2 - (A*E - B*D)*(B*F - C*E)
@@ -107,26 +123,200 @@ def is_necessarily_regular_biquadratic(Z_expr: sp.Expr) -> bool:
     Lambda3 = D*Delta - E*(A*E - B*D)
     Lambda4 = C*Delta - B*(B*F - C*E)
 
-    cond1 = Delta.is_nonnegative and Lambda1.is_nonnegative
-    cond2 = Delta.is_nonnegative and Lambda2.is_nonnegative
-    cond3 = Delta.is_nonpositive and Lambda3.is_nonnegative
-    cond4 = Delta.is_nonpositive and Lambda4.is_nonnegative
+    cond1 = _and(Delta.is_nonnegative, Lambda1.is_nonnegative)
+    cond2 = _and(Delta.is_nonnegative, Lambda2.is_nonnegative)
+    cond3 = _and(Delta.is_nonpositive, Lambda3.is_nonnegative)
+    cond4 = _and(Delta.is_nonpositive, Lambda4.is_nonnegative)
+
+    return _or(cond1, cond2, cond3, cond4)
+
+
+def _condition_sign(factors: list[tuple[Any, int]]) -> bool | None:
+    """
+    Decides whether a product of (factor, multiplicity) pairs is
+    non-negative for all positive component values: True if it is, False
+    if it is negative for all of them, and None if neither is known.
+    """
+    sign, maybe_zero = 1, False
+    for factor, multiplicity in factors:
+        factor_sign = _domain_sign(factor)
+        if factor_sign == 0:
+            return True
+        if multiplicity % 2 == 0:
+            maybe_zero = maybe_zero or factor_sign is None
+            continue
+        if factor_sign is None:
+            return None
+        sign *= factor_sign
+    if sign > 0:
+        return True
+    return None if maybe_zero else False
+
+
+def _triquadratic_coefficients(
+        num: sp.Poly, den: sp.Poly) -> tuple[list, list] | None:
+    """
+    Returns the coefficients (a0..a3, b0..b3) of a third-order N/D, or None
+    if it is not of third order or its coefficients are not rational or
+    polynomials in positive symbols.
+    """
+    num, den = num.unify(den)
+    domain = num.domain
+    if not (domain.is_ZZ or domain.is_QQ or (
+            domain.is_PolynomialRing and
+            all(x.is_positive for x in domain.symbols))):
+        return None
+    if max(num.degree(), den.degree()) != 3:
+        return None
+    a = (num.rep.to_list()[::-1] + [domain.zero] * 4)[:4]
+    b = (den.rep.to_list()[::-1] + [domain.zero] * 4)[:4]
+    return a, b
+
+
+def _triquadratic_verdict(a: list, b: list) -> bool | None:
+    """
+    Decides the regularity of a PR third-order N/D with coefficients a and
+    b from the precompiled conditions in `pynntt.regularity_conditions`,
+    or returns None.
+    """
+    # A pole or zero at s = 0 or ∞ puts the minimum 0 of Re Z or Re Y at
+    # that end
+    if not (a[0] and a[3] and b[0] and b[3]):
+        return True
+    verdicts = []
+    for test in regularity_conditions.TESTS:
+        h0, h1, h2, disc = (_condition_sign(factors)
+                            for factors in test(*a, *b))
+        ends = _and(h0, h2)
+        verdicts.append(_and(ends, _or(h1, disc)))
+    return _or(*verdicts)
+
+
+def _triquadratic_implies_pr(a: list, b: list) -> bool:
+    """
+    Whether the coefficients show a third-order N/D, with a True verdict of
+    `_triquadratic_verdict`, to be positive real without the full test.
+
+    D, less a factor s, must have positive coefficients and be strictly
+    Hurwitz, and the poles at s = 0 and ∞ must have positive residues, so
+    that Z is analytic in the right half-plane with simple axis poles. Re
+    Z(jω) ≥ 0 then follows from the verdict when a0, a3, b0 and b3 are
+    positive, as the condition that held bounds it below by a positive
+    multiple of |D|² or |N|², and otherwise from the coefficients of its
+    numerator A(w) all being non-negative.
+    """
+    pole_at_zero = not b[0]
+    d = b[1:] if pole_at_zero else list(b)
+    while d and not d[-1]:
+        d.pop()
+    if not d or any(_domain_sign(x) != 1 for x in d):
+        return False
+    if len(d) == 4 and _domain_sign(d[1] * d[2] - d[0] * d[3]) != 1:
+        return False
+    if pole_at_zero and _domain_sign(a[0]) != 1:
+        return False
+    deg_num = max(k for k in range(4) if a[k])
+    deg_den = len(d) - (0 if pole_at_zero else 1)
+    if deg_num > deg_den + 1 or (
+            deg_num == deg_den + 1 and _domain_sign(a[deg_num]) != 1):
+        return False
+    if all(_domain_sign(x) == 1 for x in (a[0], a[3], b[0], b[3])):
+        return True
+    # A(w) = Ne·De + w·No·Do with N(jω) = Ne + jω·No, D(jω) = De + jω·Do
+    # and w = ω²
+    real_part = (
+        a[0] * b[0],
+        a[1] * b[1] - a[0] * b[2] - a[2] * b[0],
+        a[2] * b[2] - a[1] * b[3] - a[3] * b[1],
+        a[3] * b[3],
+    )
+    return all(_domain_sign(x) in (0, 1) for x in real_part)
+
+
+def _triquadratic_regularity(num: sp.Poly, den: sp.Poly) -> bool | None:
+    """
+    Decides the regularity of a third-order Z = N/D by the precompiled
+    conditions, running the full positive-real test only when their
+    verdict does not settle it, or returns None.
+    """
+    coefficients = _triquadratic_coefficients(num, den)
+    if coefficients is None:
+        return None
+    verdict = _triquadratic_verdict(*coefficients)
+    if verdict is None:
+        return None
+    # Not regular if PR, and a function that is not PR is reported as not
+    # regular either
+    if verdict is False:
+        return False
+    if _triquadratic_implies_pr(*coefficients):
+        return True
+    return _positive_real(num, den) is not False
+
+
+def _and(*verdicts: bool | None) -> bool | None:
+    if False in verdicts:
+        return False
+    return None if None in verdicts else True
+
+
+def _or(*verdicts: bool | None) -> bool | None:
+    if True in verdicts:
+        return True
+    return None if None in verdicts else False
+
+
+def is_necessarily_regular_triquadratic(Z_expr: sp.Expr) -> bool | None:
+    """
+    Tests whether a third-order PR function Z(s) is necessarily regular
+    from precompiled conditions on its coefficients.
+
+    With N and D of degree at most 3, Re Z(jω) or Re Y(jω) attains its
+    minimum at ω = 0 or ∞ exactly when one of four quadratics in ω² is
+    non-negative for ω > 0, which the discriminant conditions generated in
+    `pynntt.regularity_conditions` decide. Symbolic coefficients are
+    decided from the signs of the factors of each condition, taking the
+    component symbols to be positive.
+
+    The full positive-real test is only run when the verdict depends on
+    it: a function that is not PR is reported as not regular, and when
+    the ends of Re Z are positive and D is a strictly Hurwitz cubic, the
+    condition that holds already shows Z to be PR.
+
+    Args:
+        Z_expr: The SymPy expression for the impedance.
+
+    Returns:
+        True if the function is necessarily regular, False if it is not
+        (including when Z is not a rational function or not PR), and None
+        if Z is not of third order or the signs of its conditions are not
+        determined.
+    """
+    polys = _impedance_polys(Z_expr)
+    if polys is None:
+        return False
+    return _triquadratic_regularity(*polys)
 
-    return cond1 or cond2 or cond3 or cond4
 
-def is_necessarily_regular_by_definition_optimised(Z_expr: sp.Expr) -> bool:
+def is_necessarily_regular_by_definition_optimised(
+        Z_expr: sp.Expr, maybe_pr: bool | None = None) -> bool:
     """
     Optimized symbolic test for regularity of Z(s) based on the definition.
     Avoids full Re[Z(jω)] calculation by using ω → √w substitution.
 
     Args:
         Z_expr: The SymPy expression for the impedance.
+        maybe_pr: Whether Z may be PR (`is_positive_real_rational_function`)
+            if the caller already knows; otherwise it is tested here.
 
     Returns:
         True if the function is necessarily regular, False otherwise.
     """
-    if not isinstance(Z_expr, sp.Expr) or \
-       not is_positive_real_rational_function(Z_expr):
+    if not isinstance(Z_expr, sp.Expr):
+        return False
+    if maybe_pr is None:
+        maybe_pr = is_positive_real_rational_function(Z_expr)
+    if not maybe_pr:
         return False
 
     try:
@@ -221,4 +411,440 @@ def is_necessarily_regular_by_definition(Z_expr: sp.Expr) -> bool:
     z_reg = (min_Z_re is None) or (min_Z_re >= Z_lim_0 or min_Z_re >= Z_lim_inf)
     y_reg = (min_Y_re is None) or (min_Y_re >= Y_lim_0 or min_Y_re >= Y_lim_inf)
 
-    return z_reg or y_reg
\ No newline at end of file
+    return z_reg or y_reg
+
+
+def _impedance_polys(Z_expr: sp.Expr) -> tuple[sp.Poly, sp.Poly] | None:
+    """
+    Splits Z(s) into numerator and denominator polynomials in s, or returns
+    None if Z is not a rational function of s. Any free symbol named 's' is
+    taken to be the frequency variable.
+    """
+    if not isinstance(Z_expr, sp.Expr):
+        return None
+    var = next((x for x in Z_expr.free_symbols if x.name == 's'), s)
+    floats = Z_expr.atoms(sp.Float)
+    if floats:
+        Z_expr = Z_expr.xreplace({f: sp.Rational(f) for f in floats})
+    if not Z_expr.is_rational_function(var):
+        return None
+    num, den = sp.fraction(sp.cancel(sp.together(Z_expr)))
+    return sp.Poly(num, var), sp.Poly(den, var)
+
+
+def _even_odd_parts(p: sp.Poly, w: sp.Symbol) -> tuple[sp.Poly, sp.Poly]:
+    """
+    Returns (Pe, Po) as polynomials in w such that P(jω) = Pe + jω·Po,
+    where w = ω².
+    """
+    even, odd = sp.S.Zero, sp.S.Zero
+    for (k,), a in p.terms():
+        term = a * (-w) ** (k // 2)
+        if k % 2:
+            odd += term
+        else:
+            even += term
+    return sp.Poly(even, w), sp.Poly(odd, w)
+
+
+def _end_values(P: sp.Poly, Q: sp.Poly) -> tuple[Any, Any]:
+    """
+    Reads lim P/Q as w → 0 and w → ∞ from the coefficients, for Q ≥ 0.
+
+    Infinite limits are ±oo when the sign of the dominant coefficient of P
+    is known, and None otherwise.
+    """
+    def ratio(p_coeff, q_coeff, p_order, q_order, towards_zero):
+        if P.is_zero:
+            return sp.S.Zero
+        if p_order == q_order:
+            return sp.cancel(p_coeff / q_coeff)
+        if (p_order > q_order) == towards_zero:
+            return sp.S.Zero
+        if p_coeff.is_positive:
+            return sp.oo
+        if p_coeff.is_negative:
+            return -sp.oo
+        return None
+
+    def lowest(poly):
+        (k,), a = poly.terms()[-1]
+        return k, a
+
+    if P.is_zero:
+        return sp.S.Zero, sp.S.Zero
+    p_low, p_low_coeff = lowest(P)
+    q_low, q_low_coeff = lowest(Q)
+    at_zero = ratio(p_low_coeff, q_low_coeff, p_low, q_low, True)
+    at_inf = ratio(P.LC(), Q.LC(), P.degree(), Q.degree(), False)
+    return at_zero, at_inf
+
+
+def _nonnegative_for_positive_w(G: sp.Poly) -> bool | None:
+    """
+    Decides whether G(w) ≥ 0 for all w > 0.
+
+    Rational coefficients are decided exactly: G keeps its sign on (0, ∞)
+    unless a factor of odd multiplicity has a root there, which is counted
+    by Sturm sequences. Symbolic coefficients are only decided when every
+    coefficient is known to be non-negative; otherwise None is returned.
+    """
+    if G.is_zero:
+        return True
+    if not G.domain.is_Numerical:
+        if all(c.is_nonnegative for c in G.coeffs()):
+            return True
+        return None
+    if G.domain.is_QQ or G.domain.is_ZZ:
+        # Discard roots at w = 0, which lie outside (0, ∞)
+        _, G = G.terms_gcd()
+        for factor, multiplicity in G.sqf_list()[1]:
+            if multiplicity % 2 and factor.count_roots(0, None) > 0:
+                return False
+        return bool(G.LC() > 0)
+    return None
+
+
+def _bounded_below_by_end_values(P: sp.Poly, Q: sp.Poly) -> bool | None:
+    """
+    Decides whether P/Q on (0, ∞) never falls below the smaller of its
+    end-point values, i.e. whether its infimum is reached at an end.
+    """
+    at_zero, at_inf = _end_values(P, Q)
+    ends = [v for v in (at_zero, at_inf) if v is not None]
+    if -sp.oo in ends:
+        return True
+    if len(ends) == 2 and all(v.is_number for v in ends):
+        m = min(ends)
+        if m == sp.oo:
+            return False
+        return _nonnegative_for_positive_w(P - Q * m)
+    # Symbolic end values: try to prove P/Q ≥ each finite end value
+    for m in ends:
+        if m != sp.oo and _nonnegative_for_positive_w(P - Q * m):
+            return True
+    return None
+
+
+def is_necessarily_regular_by_root_isolation(
+        Z_expr: sp.Expr, maybe_pr: bool | None = None) -> bool | None:
+    """
+    Tests whether Z(s) is regular by exact root isolation, without limits.
+
+    With w = ω², Re Z(jω) = A(w)/|D(jω)|² and Re Y(jω) = A(w)/|N(jω)|²
+    for the same even polynomial A(w) = Re N(jω)·D(-jω). Re Z has its
+    infimum at an end point exactly when A - m·|D|² ≥ 0 for w > 0, where m
+    is the smaller end-point value read from the coefficients; likewise for
+    Re Y with |N|².
+
+    Args:
+        Z_expr: The SymPy expression for the impedance.
+        maybe_pr: Whether Z may be PR (`is_positive_real_rational_function`)
+            if the caller already knows; otherwise it is tested here.
+
+    Returns:
+        True if the function is necessarily regular, False if it is not,
+        and None if this could not be decided (symbolic coefficients whose
+        signs are not determined by the symbols' assumptions).
+    """
+    # Regularity is only defined for PR functions
+    polys = _impedance_polys(Z_expr)
+    if polys is None:
+        return False
+    if maybe_pr is None:
+        maybe_pr = _positive_real(*polys) is not False
+    if not maybe_pr:
+        return False
+    return _root_isolation_regularity(*polys)
+
+
+def _root_isolation_regularity(num: sp.Poly, den: sp.Poly) -> bool | None:
+    """
+    The root-isolation test of `is_necessarily_regular_by_root_isolation`
+    on Z = num/den, taken to be PR.
+    """
+    w = sp.Dummy('w', positive=True)
+    Ne, No = _even_odd_parts(num, w)
+    De, Do = _even_odd_parts(den, w)
+    w_poly = sp.Poly(w, w)
+    A = Ne * De + w_poly * No * Do
+    B = De * De + w_poly * Do * Do
+    C = Ne * Ne + w_poly * No * No
+
+    z_reg = _bounded_below_by_end_values(A, B)
+    if z_reg:
+        return True
+    y_reg = _bounded_below_by_end_values(A, C)
+    if y_reg:
+        return True
+    if z_reg is False and y_reg is False:
+        return False
+    return None
+
+
+def _sign(x: sp.Expr) -> int | None:
+    """
+    Returns the sign of x as 1, -1 or 0, or None if the assumptions on its
+    symbols do not determine it.
+    """
+    num, den = sp.fraction(sp.cancel(x))
+    num, den = sp.expand(num), sp.expand(den)
+    if num.is_zero:
+        return 0
+    sign = 1
+    for part in (num, den):
+        if part.is_negative:
+            sign = -sign
+        elif not part.is_positive:
+            return None
+    return sign
+
+
+def _domain_sign(x: Any) -> int | None:
+    """
+    Returns the sign of a rational number, of a polynomial or fraction in
+    the positive component symbols, or of an EX element, as 1, -1 or 0, or
+    None if undetermined.
+    """
+    if not x:
+        return 0
+    if hasattr(x, 'ex'):
+        return _sign(x.ex)
+    if hasattr(x, 'numer') and hasattr(x, 'denom'):
+        num, den = _domain_sign(x.numer), _domain_sign(x.denom)
+        return None if num is None or den is None else num * den
+    if hasattr(x, 'coeffs'):
+        coeffs = x.coeffs()
+        if all(c > 0 for c in coeffs):
+            return 1
+        if all(c < 0 for c in coeffs):
+            return -1
+        return None
+    return 1 if x > 0 else -1
+
+
+# Symbolic Routh entries swell quickly with the degree, and past this they
+# are almost never of provable sign
+ROUTH_SYMBOLIC_MAX_DEGREE = 4
+
+
+def _routh_test(p: sp.Poly) -> bool | None:
+    """
+    Tests whether p is strictly Hurwitz by the Routh criterion: True if the
+    first column of its Routh table has no sign change or zero.
+
+    The table is built fraction-free: each row is scaled by the pivot of
+    the row before, and divided exactly by the pivot two rows before that,
+    so entries stay polynomials in the coefficients. While every pivot is
+    positive the scaling preserves the signs of the first column.
+    """
+    leading = _domain_sign(p.rep.to_list()[0])
+    if leading is None:
+        return None
+    if leading < 0:
+        p = -p
+    # Necessary condition: no missing or negative coefficients
+    signs = [_domain_sign(c) for c in p.rep.to_list()]
+    if any(x is not None and x <= 0 for x in signs):
+        return False
+    if not p.domain.is_Numerical and p.degree() > ROUTH_SYMBOLIC_MAX_DEGREE:
+        return None
+
+    ring = p.domain
+    zero = ring.zero
+
+    def entry(row: list[Any], i: int) -> Any:
+        return row[i] if i < len(row) else zero
+
+    coeffs = p.rep.to_list()
+    upper, lower = coeffs[0::2], coeffs[1::2]
+    divisor = ring.one
+    for step in range(p.degree()):
+        sign = _domain_sign(lower[0])
+        if sign is None:
+            return None
+        if sign <= 0:
+            return False
+        upper, lower, divisor = lower, [
+            ring.exquo(lower[0] * entry(upper, i + 1) -
+                       upper[0] * entry(lower, i + 1), divisor)
+            for i in range(len(upper) - 1)
+        ], upper[0] if step >= 1 else ring.one
+    return True
+
+
+def _axis_factor(p: sp.Poly) -> tuple[sp.Poly, sp.Poly]:
+    """
+    Splits p into (M, Q) with p = M·Q, where M = gcd of the even and odd
+    parts of p holds every root that p shares with p(-s), and so all of its
+    roots on the imaginary axis.
+    """
+    even = sp.Poly.from_dict({k: a for k, a in p.terms() if k[0] % 2 == 0},
+                             p.gen, domain=p.domain)
+    odd = sp.Poly.from_dict({k: a for k, a in p.terms() if k[0] % 2},
+                            p.gen, domain=p.domain)
+    if p.domain.is_PolynomialRing:
+        # A multivariate gcd over ZZ is far faster than subresultants over
+        # the polynomial ring of the component symbols
+        M = even.inject().gcd(odd.inject()).eject(*p.domain.symbols)
+    else:
+        M = even.gcd(odd)
+    if M.is_zero:
+        M = p
+    return M, p.exquo(M)
+
+
+def _axis_roots(M: sp.Poly, w: sp.Symbol) -> sp.Poly | None:
+    """
+    Returns m(w) with M(s) = m(-s²), w = ω², for an even M, or None if M is
+    not even.
+    """
+    if any(k % 2 for (k,), _ in M.terms()):
+        return None
+    return sp.Poly(sum(a * (-w) ** (k // 2) for (k,), a in M.terms()), w)
+
+
+def _simple_positive_roots(m: sp.Poly) -> bool | None:
+    """
+    Decides whether every root of m is real, positive and simple.
+    """
+    if m.degree() <= 0:
+        return True
+    if m.domain.is_QQ or m.domain.is_ZZ:
+        return m.gcd(m.diff()).degree() == 0 and \
+            m.count_roots(0, None) == m.degree()
+    if m.degree() == 1:
+        a, b = m.all_coeffs()
+        sign = _sign(-b / a)
+        return None if sign is None else sign > 0
+    return None
+
+
+def is_hurwitz(p: sp.Poly) -> bool | None:
+    """
+    Tests whether a polynomial is Hurwitz in the broad sense: no roots in
+    the open right half-plane, and only simple roots on the imaginary axis.
+
+    The factor of p with roots symmetric about the origin is split off as
+    the gcd of its even and odd parts, and must have only simple imaginary
+    roots; the rest must pass the Routh test with no sign change in the
+    first column.
+
+    Args:
+        p: The polynomial, in s.
+
+    Returns:
+        True or False, or None if the signs of symbolic coefficients leave
+        it undecided.
+    """
+    if p.is_zero:
+        return False
+    (k,), p = p.terms_gcd()
+    if k > 1:
+        return False
+    if p.degree() <= 0:
+        return True
+    M, Q = _axis_factor(p)
+    w = sp.Dummy('w', positive=True)
+    m = _axis_roots(M, w)
+    axis = False if m is None else _simple_positive_roots(m)
+    if axis is False:
+        return False
+    strict = _routh_test(Q) if Q.degree() > 0 else True
+    if strict is False:
+        return False
+    return None if None in (axis, strict) else True
+
+
+def _axis_residues_positive(num: sp.Poly, den: sp.Poly) -> bool | None:
+    """
+    Tests that every pole of num/den on the imaginary axis, including at
+    zero and infinity, has a positive residue. Assumes the poles are simple
+    and num, den coprime.
+    """
+    verdicts = []
+    if num.degree() == den.degree() + 1:
+        verdicts.append(_sign(num.LC() / den.LC()))
+    (k,), rest = den.terms_gcd()
+    if k == 1:
+        verdicts.append(_sign(num.eval(0) / rest.eval(0)))
+
+    M, D1 = _axis_factor(rest)
+    D1 = D1 * sp.Poly(den.gen ** k, den.gen)
+    w = sp.Dummy('w', positive=True)
+    m = _axis_roots(M, w)
+    if m is not None and m.degree() > 0:
+        # At s = jω0, w0 = ω0², the residue has the sign of F(w0) below
+        Ne, No = _even_odd_parts(num, w)
+        D1e, D1o = _even_odd_parts(D1, w)
+        F = (Ne * D1o - No * D1e) * m.diff()
+        if m.domain.is_QQ or m.domain.is_ZZ:
+            for root in sp.Poly(m, w).real_roots():
+                value = sp.N(F.as_expr().subs(w, root), 30)
+                verdicts.append(1 if value > 0 else -1)
+        elif m.degree() == 1:
+            a, b = m.all_coeffs()
+            verdicts.append(_sign(F.as_expr().subs(w, -b / a)))
+        else:
+            verdicts.append(None)
+
+    if any(v is not None and v <= 0 for v in verdicts):
+        return False
+    return None if None in verdicts else True
+
+
+def is_positive_real(Z_expr: sp.Expr) -> bool | None:
+    """
+    Tests whether Z(s) is a positive-real rational function.
+
+    Z = N/D, in lowest terms, is PR when N and D are Hurwitz in the broad
+    sense, the poles of Z and of 1/Z on the imaginary axis (including zero
+    and infinity) are simple with positive residues, and Re Z(jω) ≥ 0,
+    i.e. the numerator A(w) of Re Z(jω) is non-negative for w = ω² > 0.
+    Cheap degree checks run first, so most non-PR inputs are rejected
+    before any root counting.
+
+    Args:
+        Z_expr: The SymPy expression for the impedance.
+
+    Returns:
+        True if Z is PR, False if it is not, and None if this could not be
+        decided (symbolic coefficients whose signs are not determined by
+        the symbols' assumptions).
+    """
+    polys = _impedance_polys(Z_expr)
+    if polys is None:
+        return False
+    return _positive_real(*polys)
+
+
+def _positive_real(num: sp.Poly, den: sp.Poly) -> bool | None:
+    """
+    The positive-real test of `is_positive_real` on Z = num/den.
+    """
+    if num.is_zero:
+        return True
+    # Poles and zeros at infinity and at zero must be simple
+    if abs(num.degree() - den.degree()) > 1:
+        return False
+    if abs(num.terms()[-1][0][0] - den.terms()[-1][0][0]) > 1:
+        return False
+
+    verdicts = []
+    for check, args in ((is_hurwitz, (num,)), (is_hurwitz, (den,)),
+                        (_axis_residues_positive, (num, den)),
+                        (_axis_residues_positive, (den, num))):
+        verdict = check(*args)
+        if verdict is False:
+            return False
+        verdicts.append(verdict)
+
+    w = sp.Dummy('w', positive=True)
+    Ne, No = _even_odd_parts(num, w)
+    De, Do = _even_odd_parts(den, w)
+    A = Ne * De + sp.Poly(w, w) * No * Do
+    verdict = _nonnegative_for_positive_w(A)
+    if verdict is False:
+        return False
+    verdicts.append(verdict)
+    return None if None in verdicts else True
@@ -0,0 +1,150 @@
+"""
+regularity_conditions.py — Coefficient conditions for third-order regularity
+
+Generated by pynntt.tools.generate_regularity_conditions; do not edit.
+
+For Z(s) = N(s)/D(s) with N = a0 + a1 s + a2 s² + a3 s³ and
+D = b0 + b1 s + b2 s² + b3 s³, and w = ω², Re Z(jω) = A(w)/B(w) and
+Re Y(jω) = A(w)/C(w) with B = |D(jω)|² and C = |N(jω)|². When a0, a3, b0
+and b3 are all nonzero, the end values of Re Z are a0/b0 (w → 0) and
+a3/b3 (w → ∞), and of Re Y are b0/a0 and b3/a3. Re Z never falls below
+its value at an end exactly when the matching polynomial
+
+    z_at_zero:      b0·A − a0·B
+    z_at_infinity:  b3·A − a3·B
+    y_at_zero:      a0·A − b0·C
+    y_at_infinity:  a3·A − b3·C
+
+is non-negative for w > 0. The first and third vanish at w = 0 and the
+others have degree 2, so each is w^k·(h0 + h1·w + h2·w²), which is
+non-negative for w > 0 exactly when
+
+    h0 ≥ 0, h2 ≥ 0 and (h1 ≥ 0 or 4·h0·h2 − h1² ≥ 0),
+
+the last being the discriminant condition for no positive root. Each
+function returns (h0, h1, h2, 4·h0·h2 − h1²), each as a list of
+(factor, multiplicity) pairs whose product it is, so that the sign of each
+can be read from the signs of its factors. Arguments may be numbers or
+polynomial-ring elements.
+"""
+
+
+def z_at_zero(a0, a1, a2, a3, b0, b1, b2, b3):
+    return (
+        # h0
+        [
+            (a0*b0*b2 - a0*b1**2 + a1*b0*b1 - a2*b0**2, 1),
+        ],
+        # h1
+        [
+            (2*a0*b1*b3 - a0*b2**2 - a1*b0*b3 + a2*b0*b2 - a3*b0*b1, 1),
+        ],
+        # h2
+        [
+            (-1, 1),
+            (b3, 1),
+            (a0*b3 - a3*b0, 1),
+        ],
+        # disc
+        [
+            (-1, 1),
+            (4*a0**2*b0*b2*b3**2 - 4*a0**2*b1*b2**2*b3 + a0**2*b2**4 +
+             2*a0*a1*b0*b2**2*b3 - 4*a0*a2*b0**2*b3**2 + 4*a0*a2*b0*b1*b2*b3 -
+             2*a0*a2*b0*b2**3 - 4*a0*a3*b0**2*b2*b3 + 2*a0*a3*b0*b1*b2**2 +
+             a1**2*b0**2*b3**2 - 2*a1*a2*b0**2*b2*b3 - 2*a1*a3*b0**2*b1*b3 +
+             a2**2*b0**2*b2**2 + 4*a2*a3*b0**3*b3 - 2*a2*a3*b0**2*b1*b2 +
+             a3**2*b0**2*b1**2, 1),
+        ],
+    )
+
+
+def z_at_infinity(a0, a1, a2, a3, b0, b1, b2, b3):
+    return (
+        # h0
+        [
+            (b0, 1),
+            (a0*b3 - a3*b0, 1),
+        ],
+        # h1
+        [
+            (-1, 1),
+            (a0*b2*b3 - a1*b1*b3 + a2*b0*b3 - 2*a3*b0*b2 + a3*b1**2, 1),
+        ],
+        # h2
+        [
+            (-1, 1),
+            (a1*b3**2 - a2*b2*b3 - a3*b1*b3 + a3*b2**2, 1),
+        ],
+        # disc
+        [
+            (-1, 1),
+            (a0**2*b2**2*b3**2 + 4*a0*a1*b0*b3**3 - 2*a0*a1*b1*b2*b3**2 -
+             2*a0*a2*b0*b2*b3**2 - 4*a0*a3*b0*b1*b3**2 + 2*a0*a3*b1**2*b2*b3 +
+             a1**2*b1**2*b3**2 - 2*a1*a2*b0*b1*b3**2 - 4*a1*a3*b0**2*b3**2 +
+             4*a1*a3*b0*b1*b2*b3 - 2*a1*a3*b1**3*b3 + a2**2*b0**2*b3**2 +
+             2*a2*a3*b0*b1**2*b3 + 4*a3**2*b0**2*b1*b3 - 4*a3**2*b0*b1**2*b2 +
+             a3**2*b1**4, 1),
+        ],
+    )
+
+
+def y_at_zero(a0, a1, a2, a3, b0, b1, b2, b3):
+    return (
+        # h0
+        [
+            (-1, 1),
+            (a0**2*b2 - a0*a1*b1 - a0*a2*b0 + a1**2*b0, 1),
+        ],
+        # h1
+        [
+            (-1, 1),
+            (a0*a1*b3 - a0*a2*b2 + a0*a3*b1 - 2*a1*a3*b0 + a2**2*b0, 1),
+        ],
+        # h2
+        [
+            (a3, 1),
+            (a0*b3 - a3*b0, 1),
+        ],
+        # disc
+        [
+            (-1, 1),
+            (4*a0**3*a3*b2*b3 + a0**2*a1**2*b3**2 - 2*a0**2*a1*a2*b2*b3 -
+             2*a0**2*a1*a3*b1*b3 + a0**2*a2**2*b2**2 - 4*a0**2*a2*a3*b0*b3 -
+             2*a0**2*a2*a3*b1*b2 - 4*a0**2*a3**2*b0*b2 + a0**2*a3**2*b1**2 +
+             2*a0*a1*a2**2*b0*b3 + 4*a0*a1*a2*a3*b0*b2 - 2*a0*a2**3*b0*b2 +
+             2*a0*a2**2*a3*b0*b1 + 4*a0*a2*a3**2*b0**2 - 4*a1*a2**2*a3*b0**2 +
+             a2**4*b0**2, 1),
+        ],
+    )
+
+
+def y_at_infinity(a0, a1, a2, a3, b0, b1, b2, b3):
+    return (
+        # h0
+        [
+            (-1, 1),
+            (a0, 1),
+            (a0*b3 - a3*b0, 1),
+        ],
+        # h1
+        [
+            (2*a0*a2*b3 - a0*a3*b2 - a1**2*b3 + a1*a3*b1 - a2*a3*b0, 1),
+        ],
+        # h2
+        [
+            (a1*a3*b3 - a2**2*b3 + a2*a3*b2 - a3**2*b1, 1),
+        ],
+        # disc
+        [
+            (-1, 1),
+            (4*a0**2*a1*a3*b3**2 - 4*a0**2*a3**2*b1*b3 + a0**2*a3**2*b2**2 -
+             4*a0*a1**2*a2*b3**2 + 2*a0*a1**2*a3*b2*b3 + 4*a0*a1*a2*a3*b1*b3 -
+             4*a0*a1*a3**2*b0*b3 - 2*a0*a1*a3**2*b1*b2 - 2*a0*a2*a3**2*b0*b2 +
+             4*a0*a3**3*b0*b1 + a1**4*b3**2 - 2*a1**3*a3*b1*b3 +
+             2*a1**2*a2*a3*b0*b3 + a1**2*a3**2*b1**2 - 2*a1*a2*a3**2*b0*b1 +
+             a2**2*a3**2*b0**2, 1),
+        ],
+    )
+
+
+TESTS = (z_at_zero, z_at_infinity, y_at_zero, y_at_infinity)
@@ -0,0 +1,297 @@
+"""
+results.py — Typed, columnar catalogue results
+
+`save_results_columnar` writes evaluated catalogue rows as Parquet or Arrow
+IPC (Feather) files. Instead of the SymPy string that `save_results_csv`
+writes for Zcanon, each row keeps its numerator and denominator as data:
+
+* `symbols` lists the component symbols, R1.., L1.., C1..;
+* `num` and `den` list, for each power of s present, the integer
+  coefficients of its monomials and their exponents over `symbols`.
+
+The AST (as a string), the regularity verdict, the counterexample and error
+messages, and the per-row timings recorded by evaluating with a profile
+(`time_total`, `stage_times` and, for a full profile, `peak_memory`) are
+ordinary columns, so a result set loads in bulk with
+`load_results` and filters with pandas without touching SymPy.
+`impedance_expr`, `impedance_fraction` and `row_ast` rebuild the SymPy
+expression, the ring fraction or the AST of one row only when asked;
+`evaluate_coefficients` evaluates the coefficients numerically without
+SymPy at all.
+
+Rows are written in batches as they arrive, so results stream to disk
+while a run continues. Coefficients must fit in 64-bit integers.
+"""
+
+from __future__ import annotations
+
+import ast as _ast
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Iterable, Mapping
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from pynntt.networks import ELEMENTS
+
+if TYPE_CHECKING:
+    import sympy as sp
+
+FORMATS = ('parquet', 'arrow')
+
+# Per power of s, the coefficients of its monomials and their exponents
+POLYNOMIAL = pa.list_(pa.struct([
+    ('power', pa.int32()),
+    ('coeffs', pa.list_(pa.int64())),
+    ('exponents', pa.list_(pa.list_(pa.int32()))),
+]))
+
+SCHEMA = pa.schema([
+    ('id', pa.string()),
+    ('desc', pa.string()),
+    ('ast', pa.string()),
+    ('symbols', pa.list_(pa.string())),
+    ('num', POLYNOMIAL),
+    ('den', POLYNOMIAL),
+    ('regular', pa.bool_()),
+    ('counterexample', pa.string()),
+    ('error', pa.string()),
+    ('time_total', pa.float64()),
+    ('stage_times', pa.map_(pa.string(), pa.float64())),
+    ('peak_memory', pa.int64()),
+])
+
+
+def format_for_path(path: str | Path) -> str | None:
+    """
+    Picks the columnar format for an output path from its suffix, or
+    returns None if the suffix names neither (CSV is then the default).
+    """
+    suffix = Path(path).suffix.lower()
+    if suffix in ('.parquet', '.pq'):
+        return 'parquet'
+    if suffix in ('.arrow', '.feather', '.ipc'):
+        return 'arrow'
+    return None
+
+
+def _symbol_key(name: str) -> tuple[int, int]:
+    return ELEMENTS.index(name[0]), int(name[1:])
+
+
+def _polynomial(poly: Any, n: int) -> list[dict[str, Any]]:
+    # A SymPy Poly over (components.., s) as per-power-of-s records
+    powers: dict[int, dict[str, list]] = {}
+    for monom, coeff in poly.terms():
+        record = powers.setdefault(monom[n], {'coeffs': [], 'exponents': []})
+        record['coeffs'].append(int(coeff))
+        record['exponents'].append(list(monom[:n]))
+    return [{'power': k, **powers[k]} for k in sorted(powers)]
+
+
+def impedance_columns(Z: sp.Expr | str) -> dict[str, Any]:
+    """
+    Splits a canonical impedance N(s)/D(s) into the `symbols`, `num` and
+    `den` columns, with integer coefficients.
+
+    Args:
+        Z: The impedance, as a SymPy expression or its string.
+
+    Returns:
+        A dict with 'symbols', 'num' and 'den'.
+    """
+    import sympy as sp
+    from pynntt.networks import s
+    if isinstance(Z, str):
+        Z = sp.sympify(Z)
+    names = sorted((str(x) for x in Z.free_symbols if x.name != 's'),
+                   key=_symbol_key)
+    symbols = [sp.Symbol(name, positive=True) for name in names]
+    Z = Z.xreplace({x: sp.Symbol(x.name, positive=True)
+                    for x in Z.free_symbols if x.name != 's'})
+    Z = Z.xreplace({x: s for x in Z.free_symbols if x.name == 's'})
+    num, den = sp.fraction(Z)
+    gens = symbols + [s]
+    num_factor, num = sp.Poly(num, *gens).clear_denoms()
+    den_factor, den = sp.Poly(den, *gens).clear_denoms()
+    # N/D = (num / num_factor) / (den / den_factor)
+    num, den = num * int(den_factor), den * int(num_factor)
+    return {'symbols': names, 'num': _polynomial(num, len(names)),
+            'den': _polynomial(den, len(names))}
+
+
+def result_record(row: Mapping[str, Any]) -> dict[str, Any]:
+    """
+    Converts an enriched catalogue row (see `evaluate_catalogue`) into a
+    record of the columnar schema, with None for missing values.
+    """
+    record: dict[str, Any] = {name: None for name in SCHEMA.names}
+    for key in ('id', 'desc', 'ast', 'counterexample', 'error'):
+        if row.get(key) not in (None, ''):
+            record[key] = str(row[key])
+    if row.get('regular') not in (None, ''):
+        record['regular'] = bool(row['regular'])
+    if row.get('Zcanon') not in (None, ''):
+        record.update(impedance_columns(row['Zcanon']))
+    profile = row.get('profile')
+    if profile:
+        record['time_total'] = profile.get('total')
+        record['stage_times'] = list(profile.get('stages', {}).items())
+        record['peak_memory'] = profile.get('peak_memory')
+    return record
+
+
+class _Writer:
+    # Appends record batches to a Parquet or Arrow IPC file
+    def __init__(self, path: str | Path, fmt: str):
+        if fmt == 'parquet':
+            import pyarrow.parquet as pq
+            self._writer = pq.ParquetWriter(str(path), SCHEMA)
+            self._write = self._writer.write_table
+        elif fmt == 'arrow':
+            self._sink = pa.OSFile(str(path), 'wb')
+            self._writer = pa.ipc.new_file(self._sink, SCHEMA)
+            self._write = self._writer.write_table
+        else:
+            raise ValueError(f"Unknown results format: {fmt}")
+        self._fmt = fmt
+
+    def write(self, records: list[dict[str, Any]]) -> None:
+        self._write(pa.Table.from_pylist(records, schema=SCHEMA))
+
+    def close(self) -> None:
+        self._writer.close()
+        if self._fmt == 'arrow':
+            self._sink.close()
+
+
+def save_results_columnar(rows: Iterable[Mapping[str, Any]],
+                          path: str | Path, fmt: str | None = None,
+                          flush_every: int = 1000) -> int:
+    """
+    Saves evaluated catalogue rows in a columnar file.
+
+    Args:
+        rows: Enriched rows, as from `iter_evaluate_catalogue`.
+        path: The file to write.
+        fmt: 'parquet' or 'arrow'; by default chosen from the suffix of
+            path, or 'parquet'.
+        flush_every: Rows per record batch (Parquet row group).
+
+    Returns:
+        The number of rows written.
+
+    Raises:
+        ValueError: If fmt is not a known format.
+    """
+    fmt = fmt or format_for_path(path) or 'parquet'
+    writer = _Writer(path, fmt)
+    count = 0
+    batch: list[dict[str, Any]] = []
+    try:
+        for count, row in enumerate(rows, start=1):
+            batch.append(result_record(row))
+            if len(batch) >= flush_every:
+                writer.write(batch)
+                batch = []
+        if batch or count == 0:
+            writer.write(batch)
+    finally:
+        writer.close()
+    return count
+
+
+def load_results(path: str | Path, columns: list[str] | None = None,
+                 fmt: str | None = None) -> pd.DataFrame:
+    """
+    Loads a columnar result file written by `save_results_columnar`.
+
+    Args:
+        path: The file to read.
+        columns: The columns to load, or None for all.
+        fmt: 'parquet' or 'arrow'; by default chosen from the suffix of
+            path, or 'parquet'.
+
+    Returns:
+        A DataFrame with one row per result. Nested columns hold lists and
+        dicts of plain Python and NumPy values; no SymPy object is built.
+    """
+    fmt = fmt or format_for_path(path) or 'parquet'
+    if fmt == 'parquet':
+        return pd.read_parquet(path, columns=columns)
+    if fmt == 'arrow':
+        return pd.read_feather(path, columns=columns)
+    raise ValueError(f"Unknown results format: {fmt}")
+
+
+def _terms(polynomial: Any) -> Iterable[tuple[int, Any, Any]]:
+    for record in polynomial if polynomial is not None else ():
+        yield record['power'], record['coeffs'], record['exponents']
+
+
+def impedance_fraction(row: Mapping[str, Any]) -> tuple[Any, Any]:
+    """
+    Rebuilds a result's (N, D) as elements of the ring
+    ZZ[R1.., L1.., C1.., s] used by `pynntt.polyring`.
+    """
+    import sympy as sp
+    from sympy.polys.domains import ZZ
+    from sympy.polys.rings import PolyRing
+    from pynntt.networks import s
+    symbols = [sp.Symbol(name, positive=True) for name in row['symbols']]
+    ring = PolyRing(symbols + [s], ZZ)
+    parts = []
+    for key in ('num', 'den'):
+        terms = {}
+        for power, coeffs, exponents in _terms(row[key]):
+            for coeff, exps in zip(coeffs, exponents):
+                terms[tuple(int(e) for e in exps) + (int(power),)] = \
+                    int(coeff)
+        parts.append(ring.from_dict(terms) if terms else ring.zero)
+    return parts[0], parts[1]
+
+
+def impedance_expr(row: Mapping[str, Any]) -> sp.Expr:
+    """
+    Rebuilds a result's canonical impedance N(s)/D(s) as a SymPy
+    expression, equal to the Zcanon that was saved.
+    """
+    num, den = impedance_fraction(row)
+    return num.as_expr() / den.as_expr()
+
+
+def row_ast(row: Mapping[str, Any]) -> Any:
+    """Rebuilds a result's AST from its string, or None if absent."""
+    if not isinstance(row['ast'], str):
+        return None
+    return _ast.literal_eval(row['ast'])
+
+
+def evaluate_coefficients(row: Mapping[str, Any],
+                          values: Mapping[str, float]) -> tuple[np.ndarray,
+                                                                np.ndarray]:
+    """
+    Evaluates a result's coefficients of N and D at component values,
+    without SymPy.
+
+    Args:
+        row: A result row from `load_results`.
+        values: A value for each name in the row's `symbols`.
+
+    Returns:
+        The coefficients of N and of D, lowest power of s first.
+    """
+    x = np.array([values[name] for name in row['symbols']], dtype=float)
+    arrays = []
+    for key in ('num', 'den'):
+        terms = list(_terms(row[key]))
+        degree = max((power for power, _, _ in terms), default=0)
+        out = np.zeros(degree + 1)
+        for power, coeffs, exponents in terms:
+            E = np.array([list(exps) for exps in exponents],
+                         dtype=float).reshape(len(coeffs), len(x))
+            out[power] = np.asarray(coeffs, dtype=float) @ np.prod(x ** E,
+                                                                   axis=1)
+        arrays.append(out)
+    return arrays[0], arrays[1]
@@ -0,0 +1,103 @@
+"""
+screening.py — Numeric refutation of necessary regularity
+
+A network is necessarily regular when, for every choice of positive
+component values, Re Z(jω) or Re Y(jω) attains its infimum at ω = 0 or
+ω = ∞. A single choice of values for which both real parts dip below both
+of their end-point values therefore proves the network is *not*
+necessarily regular.
+
+`screen_regularity` looks for such a counterexample by drawing random
+component values and sampling Re Z and Re Y on a log-spaced frequency grid
+with a compiled NumPy kernel. It never proves regularity: a network that
+survives screening must still go to the exact test.
+"""
+
+import numpy as np
+from typing import Any
+from pynntt import hooks
+from pynntt.numeric import compile_impedance, component_names, sweep_impedance
+
+
+def _real_parts(Z: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    # Re Z and Re Y = Re Z / |Z|^2, row-wise
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return Z.real, Z.real / (Z.real ** 2 + Z.imag ** 2)
+
+
+def _dips(re: np.ndarray, rtol: float, atol: float) -> np.ndarray:
+    # Per sample, the interior grid index where re falls below both end
+    # values by more than the tolerance, or -1
+    ends = np.minimum(re[:, 0], re[:, -1])
+    interior = re[:, 1:-1]
+    scale = np.maximum(np.abs(ends), np.nanmax(np.abs(interior), axis=1))
+    where = np.nanargmin(interior, axis=1)
+    lowest = interior[np.arange(re.shape[0]), where]
+    dips = lowest < ends - rtol * scale - atol
+    return np.where(dips, where + 1, -1)
+
+
+@hooks.stage
+def screen_regularity(expr: Any, samples: int = 64, freqs: int = 256,
+                      spread: float = 100.0, seed: Any = None,
+                      rtol: float = 1e-6,
+                      atol: float = 1e-12) -> dict[str, Any] | None:
+    """
+    Searches for component values that refute necessary regularity.
+
+    Component values are drawn log-uniformly from [1/spread, spread]. The
+    grid covers the characteristic frequencies of those values by several
+    decades either side, and its two end points are pushed far enough out
+    to stand in for the limits at ω = 0 and ω = ∞, where Re Z(jω) and
+    Re Y(jω) differ from their limits by O(ω²) and O(1/ω²).
+
+    Args:
+        expr: The network descriptor (AST).
+        samples: The number of component-value samples.
+        freqs: The number of frequencies in the grid.
+        spread: The ratio bounding component values either side of 1.
+        seed: Seed for the random generator, for reproducible screening.
+        rtol: Dips smaller than this fraction of the scale of the real part
+            are ignored, as numerical noise.
+        atol: Dips smaller than this are ignored.
+
+    Returns:
+        A counterexample dict with 'values' (component name to value) and
+        'omega' (the frequency of the dip in Re Z), or None if no sample
+        refutes regularity.
+
+    Raises:
+        ValueError: If an unrecognized structure is encountered.
+    """
+    kernel = compile_impedance(expr)
+    names = component_names(expr)
+    rng = np.random.default_rng(seed)
+    values = np.exp(rng.uniform(-np.log(spread), np.log(spread),
+                                size=(samples, len(names))))
+    decades = np.log10(spread)
+    interior = np.logspace(-3 * decades - 3, 3 * decades + 3, freqs - 2)
+    omega = np.concatenate(([interior[0] * 1e-6], interior,
+                            [interior[-1] * 1e6]))
+
+    re_z, re_y = _real_parts(sweep_impedance(kernel, omega, values))
+    z_dips = _dips(re_z, rtol, atol)
+    y_dips = _dips(re_y, rtol, atol)
+    refuted = np.flatnonzero((z_dips >= 0) & (y_dips >= 0))
+    if refuted.size == 0:
+        return None
+    i = refuted[0]
+    return {
+        'values': dict(zip(names, values[i].tolist())),
+        'omega': float(omega[z_dips[i]]),
+    }
+
+
+def format_counterexample(counterexample: dict[str, Any] | None) -> str:
+    """
+    Formats a counterexample as 'R1=..;C1=..@omega=..', or '' for None.
+    """
+    if counterexample is None:
+        return ''
+    values = ';'.join(f"{name}={value:.6g}"
+                      for name, value in counterexample['values'].items())
+    return f"{values}@omega={counterexample['omega']:.6g}"
@@ -0,0 +1,144 @@
+"""
+store.py — Persistent on-disk store of catalogue evaluation results
+
+Results are kept in a local SQLite database keyed by the normalised
+descriptor, the evaluation engine and an algorithm version. Each record
+holds the canonical impedance, the AST and, once computed, the regularity
+verdict with any counterexample found by screening. Records are committed
+in small batches as they are written, so an interrupted catalogue run loses
+at most one batch and resumes from the store when it is restarted.
+"""
+
+import sqlite3
+import sympy as sp
+from pathlib import Path
+from typing import Any
+from pynntt.networks import parse_descriptor, format_descriptor
+
+# Bump when a change to evaluation or regularity alters stored results
+ALGORITHM_VERSION = '4'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    descriptor TEXT NOT NULL,
+    engine TEXT NOT NULL,
+    version TEXT NOT NULL,
+    zcanon TEXT NOT NULL,
+    ast TEXT NOT NULL,
+    regular INTEGER,
+    counterexample TEXT,
+    PRIMARY KEY (descriptor, engine, version)
+)
+"""
+
+
+def normalise_descriptor(desc: str) -> str:
+    """
+    Normalises a descriptor string for use as a store key.
+
+    Whitespace and redundant parentheses are removed, but operand order is
+    kept, since it determines the numbering of the component symbols.
+    Descriptors that do not parse are only stripped.
+    """
+    try:
+        return format_descriptor(parse_descriptor(desc))
+    except ValueError:
+        return desc.strip()
+
+
+class ResultStore:
+    """
+    SQLite-backed store of canonical impedances and regularity verdicts.
+    """
+
+    def __init__(self, path: str | Path, version: str = ALGORITHM_VERSION,
+                 commit_every: int = 100):
+        self.path = Path(path)
+        self.version = version
+        self.commit_every = commit_every
+        self.hits = 0
+        self.misses = 0
+        self._pending = 0
+        self._conn = sqlite3.connect(str(self.path))
+        self._conn.execute(SCHEMA)
+        columns = {info[1] for info in
+                   self._conn.execute("PRAGMA table_info(results)")}
+        if 'counterexample' not in columns:
+            # Stores created before counterexamples were kept
+            self._conn.execute(
+                "ALTER TABLE results ADD COLUMN counterexample TEXT")
+        self._conn.commit()
+
+    def __enter__(self) -> 'ResultStore':
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        query = "SELECT COUNT(*) FROM results WHERE version = ?"
+        return self._conn.execute(query, (self.version,)).fetchone()[0]
+
+    def get(self, desc: str, engine: str = 'sympy') -> dict[str, Any] | None:
+        """
+        Looks up the stored result for a descriptor.
+
+        Returns:
+            A dict with 'Zcanon' (a SymPy expression), 'ast' (a string),
+            'regular' (a bool, or None if it has not been computed) and
+            'counterexample' (a string, or None), or None if the descriptor
+            is not in the store.
+        """
+        query = ("SELECT zcanon, ast, regular, counterexample FROM results "
+                 "WHERE descriptor = ? AND engine = ? AND version = ?")
+        record = self._conn.execute(
+            query, (normalise_descriptor(desc), engine, self.version)
+        ).fetchone()
+        if record is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        zcanon, ast, regular, counterexample = record
+        return {
+            'Zcanon': sp.sympify(zcanon),
+            'ast': ast,
+            'regular': None if regular is None else bool(regular),
+            'counterexample': counterexample,
+        }
+
+    def put(self, desc: str, Zcanon: sp.Expr, ast: Any,
+            regular: bool | None = None, engine: str = 'sympy',
+            counterexample: str | None = None) -> None:
+        """
+        Stores the result for a descriptor, keeping any stored regularity
+        verdict and its counterexample when regular is None.
+        """
+        query = ("INSERT INTO results "
+                 "(descriptor, engine, version, zcanon, ast, regular, "
+                 "counterexample) "
+                 "VALUES (?, ?, ?, ?, ?, ?, ?) "
+                 "ON CONFLICT (descriptor, engine, version) DO UPDATE SET "
+                 "zcanon = excluded.zcanon, ast = excluded.ast, "
+                 "counterexample = CASE WHEN excluded.regular IS NULL "
+                 "THEN results.counterexample "
+                 "ELSE excluded.counterexample END, "
+                 "regular = COALESCE(excluded.regular, results.regular)")
+        self._conn.execute(query, (
+            normalise_descriptor(desc), engine, self.version,
+            sp.srepr(Zcanon), str(ast),
+            None if regular is None else int(bool(regular)),
+            counterexample,
+        ))
+        self._pending += 1
+        if self._pending >= self.commit_every:
+            self.commit()
+
+    def commit(self) -> None:
+        """Commits pending writes to disk."""
+        self._conn.commit()
+        self._pending = 0
+
+    def close(self) -> None:
+        """Commits pending writes and closes the database."""
+        self.commit()
+        self._conn.close()
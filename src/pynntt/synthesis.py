@@ -0,0 +1,361 @@
+"""
+synthesis.py — Looking up networks that realise a target impedance
+
+A network's canonical N(s)/D(s) has coefficients, one per power of s, that
+are polynomials in its component values with positive integer
+coefficients. For positive component values no such coefficient can
+vanish, so the set of powers of s present in N and in D (the support
+pattern) is the same for every choice of values. A target impedance with
+numeric coefficients, in lowest terms, can therefore only be realised
+(without a common factor appearing at special values) by networks with
+exactly its support pattern.
+
+`impedance_invariants` computes, from the cancelled ring fraction, the
+support pattern together with the degrees of N and D in s, the McMillan
+degree max(deg N, deg D) and the R/L/C counts. `SynthesisIndex` files
+networks from a catalogue or the enumerator under their support pattern,
+so `query` is a dictionary lookup followed by an optional filter on the
+counts. `fit_components` then searches for positive component values that
+realise the target exactly, matching the coefficient ratios by damped
+Gauss-Newton steps on the logarithms of the values.
+
+SymPy is only imported to evaluate networks being added, and by
+`target_coefficients`; a saved index is loaded and queried without it.
+"""
+
+import json
+import numpy as np
+from pathlib import Path
+from typing import Any, Hashable, Iterable, NamedTuple, Sequence
+
+ELEMENTS = ['R', 'L', 'C']
+
+# The powers of s present in N and in D, each in increasing order
+Signature = tuple[tuple[int, ...], tuple[int, ...]]
+
+# The terms of a polynomial in the component values, grouped by power of s:
+# each power maps to a list of (integer coefficient, exponents) pairs, the
+# exponents listing the power of each component in `Invariants.symbols`
+Coefficients = dict[int, list[tuple[int, tuple[int, ...]]]]
+
+
+class Invariants(NamedTuple):
+    """Structural invariants of a network's canonical impedance."""
+    signature: Signature
+    num_degree: int
+    den_degree: int
+    mcmillan_degree: int
+    counts: tuple[int, int, int]
+    symbols: tuple[str, ...]
+
+
+def _coefficients(poly: Any) -> Coefficients:
+    # Split a ring element over (components.., s) by its power of s
+    coefficients: Coefficients = {}
+    for monom, coeff in poly.terms():
+        coefficients.setdefault(monom[-1], []).append((int(coeff),
+                                                       monom[:-1]))
+    return dict(sorted(coefficients.items()))
+
+
+def _invariants(symbols: Sequence[str], num: Coefficients,
+                den: Coefficients) -> Invariants:
+    signature = (tuple(num), tuple(den))
+    num_degree = max(num, default=0)
+    den_degree = max(den, default=0)
+    R, L, C = (sum(1 for name in symbols if name[0] == label)
+               for label in ELEMENTS)
+    return Invariants(signature, num_degree, den_degree,
+                      max(num_degree, den_degree), (R, L, C), tuple(symbols))
+
+
+def impedance_coefficients(expr: Any) -> tuple[Invariants, Coefficients,
+                                               Coefficients]:
+    """
+    Evaluates a network descriptor (AST) into its invariants and the
+    coefficients of N and D, grouped by power of s.
+
+    Raises:
+        ValueError: If an unrecognized structure is encountered.
+    """
+    from pynntt.polyring import eval_impedance_fraction
+    num, den = eval_impedance_fraction(expr)
+    symbols = [str(x) for x in num.ring.symbols[:-1]]
+    num_coefficients = _coefficients(num)
+    den_coefficients = _coefficients(den)
+    return (_invariants(symbols, num_coefficients, den_coefficients),
+            num_coefficients, den_coefficients)
+
+
+def impedance_invariants(expr: Any) -> Invariants:
+    """
+    Computes the structural invariants of a network descriptor (AST).
+
+    The degrees and support pattern are those of the cancelled N(s)/D(s),
+    as returned by `eval_canonical_impedance`, and hold for all positive
+    component values except those at which N and D gain a common root.
+
+    Raises:
+        ValueError: If an unrecognized structure is encountered.
+    """
+    return impedance_coefficients(expr)[0]
+
+
+def target_signature(num: Sequence[float],
+                     den: Sequence[float]) -> Signature:
+    """
+    Computes the support pattern of a target impedance N(s)/D(s).
+
+    Args:
+        num: The coefficients of N, lowest power of s first.
+        den: The coefficients of D, lowest power of s first.
+
+    Returns:
+        The powers of s with nonzero coefficients in N and in D, after
+        dividing both by the largest power of s they share.
+
+    Raises:
+        ValueError: If D is zero.
+    """
+    num_powers = [k for k, c in enumerate(num) if c != 0]
+    den_powers = [k for k, c in enumerate(den) if c != 0]
+    if not den_powers:
+        raise ValueError("Target denominator is zero")
+    shift = min(num_powers[:1] + den_powers[:1])
+    return (tuple(k - shift for k in num_powers),
+            tuple(k - shift for k in den_powers))
+
+
+def target_coefficients(Z: Any) -> tuple[list[float], list[float]]:
+    """
+    Splits a SymPy rational function of s with numeric coefficients into
+    the (num, den) coefficient lists taken by `SynthesisIndex.query`.
+    """
+    import sympy as sp
+    from pynntt.networks import s
+    num, den = sp.fraction(sp.cancel(sp.together(sp.sympify(Z))))
+    symbol = sp.Symbol('s')
+    num, den = num.subs(symbol, s), den.subs(symbol, s)
+    return ([float(c) for c in reversed(sp.Poly(num, s).all_coeffs())],
+            [float(c) for c in reversed(sp.Poly(den, s).all_coeffs())])
+
+
+def fit_components(invariants: Invariants, num_coefficients: Coefficients,
+                   den_coefficients: Coefficients, num: Sequence[float],
+                   den: Sequence[float], restarts: int = 8,
+                   max_iter: int = 100, tol: float = 1e-9,
+                   seed: Any = 0) -> dict[str, float] | None:
+    """
+    Searches for positive component values that realise a target exactly.
+
+    N and D of the network must equal those of the target up to a common
+    scale, which fixes every coefficient relative to the highest power of
+    s in D. The residuals are the differences of the logarithms of these
+    ratios, minimised over the logarithms of the component values from
+    `restarts` random starting points.
+
+    Args:
+        invariants: The network's invariants.
+        num_coefficients: The network's coefficients of N.
+        den_coefficients: The network's coefficients of D.
+        num: The target's coefficients of N, lowest power of s first.
+        den: The target's coefficients of D, lowest power of s first.
+        restarts: The number of starting points to try.
+        max_iter: The largest number of steps from each starting point.
+        tol: The largest residual accepted, a relative error.
+        seed: The seed for the starting points.
+
+    Returns:
+        A value for each component symbol, or None if none was found. None
+        is returned at once if the support patterns differ or the target's
+        coefficients do not all have the same sign.
+    """
+    if target_signature(num, den) != invariants.signature:
+        return None
+    shift = min([k for k, c in enumerate(num) if c != 0][:1] +
+                [k for k, c in enumerate(den) if c != 0][:1])
+    reference = den_coefficients[invariants.den_degree]
+    lead = den[invariants.den_degree + shift]
+    terms, log_ratios = [], []
+    for network, target in ((num_coefficients, num),
+                            (den_coefficients, den)):
+        for k, coefficient in network.items():
+            if coefficient is reference:
+                continue
+            ratio = target[k + shift] / lead
+            if ratio <= 0:
+                return None
+            terms.append(coefficient)
+            log_ratios.append(np.log(ratio))
+    targets = np.array(log_ratios)
+    n = len(invariants.symbols)
+
+    # All coefficients' terms in one matrix, the reference's first, so the
+    # logarithm of every coefficient is a segmented log-sum-exp
+    segments = [reference] + terms
+    starts = np.cumsum([0] + [len(c) for c in segments[:-1]])
+    owner = np.repeat(np.arange(len(segments)), [len(c) for c in segments])
+    log_a = np.log([float(coeff) for c in segments for coeff, _ in c])
+    E = np.array([exps for c in segments for _, exps in c],
+                 dtype=float).reshape(len(log_a), n)
+
+    def residuals(y: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        # log c(exp(y)) for each coefficient c and its gradient in y
+        t = E @ y + log_a
+        peak = np.maximum.reduceat(t, starts)
+        w = np.exp(t - peak[owner])
+        total = np.add.reduceat(w, starts)
+        log_c = peak + np.log(total)
+        grad = np.add.reduceat((w / total[owner])[:, None] * E, starts)
+        return log_c[1:] - log_c[0] - targets, grad[1:] - grad[0]
+
+    rng = np.random.default_rng(seed)
+    for _ in range(restarts):
+        y = rng.normal(scale=2.0, size=n)
+        r, J = residuals(y)
+        cost = r @ r
+        damping = 1e-3
+        for _ in range(max_iter):
+            if np.abs(r).max(initial=0.0) <= tol:
+                return {name: float(v)
+                        for name, v in zip(invariants.symbols, np.exp(y))}
+            JtJ = J.T @ J
+            step = np.linalg.solve(JtJ + damping * np.diag(np.diag(JtJ) + 1),
+                                   -J.T @ r)
+            r_new, J_new = residuals(y + step)
+            cost_new = r_new @ r_new
+            if cost_new < cost:
+                y, r, J, cost = y + step, r_new, J_new, cost_new
+                damping = max(damping / 3, 1e-12)
+            else:
+                damping *= 4
+                if damping > 1e12:
+                    break
+        if np.abs(r).max(initial=0.0) <= tol:
+            return {name: float(v)
+                    for name, v in zip(invariants.symbols, np.exp(y))}
+    return None
+
+
+class SynthesisIndex:
+    """
+    Files networks by the support pattern of their impedance.
+
+    Adding a network costs one ring evaluation; a query costs one
+    dictionary lookup, and returns every added network that can realise a
+    target without a common factor in N and D, in order of addition.
+    """
+
+    def __init__(self):
+        self._groups: dict[Signature, list[Hashable]] = {}
+        self._entries: dict[Hashable, tuple[Invariants, Coefficients,
+                                            Coefficients]] = {}
+        self._descs: dict[Hashable, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _file(self, key: Hashable,
+              entry: tuple[Invariants, Coefficients, Coefficients]) -> None:
+        self._groups.setdefault(entry[0].signature, []).append(key)
+        self._entries[key] = entry
+
+    def add(self, key: Hashable, expr: Any) -> Invariants:
+        """Adds a network under key, returning its invariants."""
+        from pynntt.networks import format_descriptor
+        entry = impedance_coefficients(expr)
+        self._file(key, entry)
+        self._descs[key] = format_descriptor(expr)
+        return entry[0]
+
+    def update(self, items: Iterable[tuple[Hashable, Any]]) -> None:
+        """Adds each (key, AST) pair."""
+        for key, expr in items:
+            self.add(key, expr)
+
+    def invariants(self, key: Hashable) -> Invariants:
+        """Returns the invariants of the network added under key."""
+        return self._entries[key][0]
+
+    def descriptor(self, key: Hashable) -> str:
+        """Returns the descriptor of the network added under key."""
+        return self._descs[key]
+
+    def signatures(self) -> dict[Signature, int]:
+        """Counts the networks added under each support pattern."""
+        return {signature: len(keys)
+                for signature, keys in self._groups.items()}
+
+    def query(self, num: Sequence[float], den: Sequence[float],
+              counts: dict[str, int] | None = None) -> list[Hashable]:
+        """
+        Lists the networks with the support pattern of N(s)/D(s).
+
+        Args:
+            num: The target's coefficients of N, lowest power of s first.
+            den: The target's coefficients of D, lowest power of s first.
+            counts: Required numbers of some element types, such as
+                {'R': 1}; other types are unconstrained.
+
+        Returns:
+            The keys of the candidate networks, in order of addition.
+
+        Raises:
+            ValueError: If D is zero.
+        """
+        keys = self._groups.get(target_signature(num, den), [])
+        if not counts:
+            return list(keys)
+        wanted = [(ELEMENTS.index(label), n) for label, n in counts.items()]
+        return [key for key in keys
+                if all(self._entries[key][0].counts[i] == n
+                       for i, n in wanted)]
+
+    def fit(self, key: Hashable, num: Sequence[float], den: Sequence[float],
+            **options: Any) -> dict[str, float] | None:
+        """Runs `fit_components` for the network added under key."""
+        return fit_components(*self._entries[key], num, den, **options)
+
+    def realisations(self, num: Sequence[float], den: Sequence[float],
+                     counts: dict[str, int] | None = None, **options: Any
+                     ) -> list[tuple[Hashable, dict[str, float]]]:
+        """
+        Lists (key, component values) for each candidate of `query` for
+        which `fit_components` finds positive values.
+        """
+        found = []
+        for key in self.query(num, den, counts):
+            values = self.fit(key, num, den, **options)
+            if values is not None:
+                found.append((key, values))
+        return found
+
+    def save(self, path: str | Path) -> None:
+        """Writes the index as JSON lines, one network per line."""
+        with open(path, 'w') as f:
+            for key, (invariants, num, den) in self._entries.items():
+                record = {
+                    'key': key,
+                    'desc': self._descs[key],
+                    'symbols': list(invariants.symbols),
+                    'num': [[k, terms] for k, terms in num.items()],
+                    'den': [[k, terms] for k, terms in den.items()],
+                }
+                f.write(json.dumps(record) + '\n')
+
+    @classmethod
+    def load(cls, path: str | Path) -> 'SynthesisIndex':
+        """Reads an index written by `save`."""
+        index = cls()
+        with open(path) as f:
+            for line in f:
+                record = json.loads(line)
+                num, den = ({k: [(coeff, tuple(exps))
+                                 for coeff, exps in terms]
+                             for k, terms in record[part]}
+                            for part in ('num', 'den'))
+                key = record['key']
+                index._file(key, (_invariants(record['symbols'], num, den),
+                                  num, den))
+                index._descs[key] = record['desc']
+        return index
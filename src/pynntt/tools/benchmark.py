@@ -0,0 +1,357 @@
+import json
+import math
+import platform
+import random
+import os
+import statistics
+import subprocess
+import sys
+import time
+import argparse
+from pathlib import Path
+import sympy as sp
+from pynntt.networks import (parse_descriptor, format_descriptor,
+                             eval_impedance, canonical_form, s)
+from pynntt import regularity
+from pynntt.tools.evaluate_catalogue import (iter_catalogue, time_limit,
+                                             RowTimeout)
+
+SRC = Path(__file__).resolve().parents[2]
+CATALOGUES = Path(__file__).resolve().parents[3] / 'catalogues'
+DEFAULT_CATALOGUES = [CATALOGUES / '2012--JS-network-descriptors.csv',
+                      CATALOGUES / '2019--MS-network-descriptors.csv']
+
+STAGES = ['parse', 'eval_impedance', 'canonical_form', 'biquadratic',
+          'definition', 'root_isolation']
+
+
+def _regularity_form(Z):
+    """Rewrite Z in the regularity module's s, so its tests do full work."""
+    return Z.xreplace({s: regularity.s})
+
+
+def _numeric_instance(Z, seed):
+    """Give Z's elements random positive rational values, reproducibly from
+    seed, as `regularity.is_necessarily_regular` only runs the
+    definition-based test on numeric coefficients."""
+    rng = random.Random(seed)
+    values = {x: sp.Rational(rng.randint(1, 20), rng.randint(1, 20))
+              for x in sorted(Z.free_symbols, key=str) if x != regularity.s}
+    return Z.xreplace(values)
+
+
+def _degree(Z):
+    """The larger degree in s of Z's numerator and denominator."""
+    num, den = sp.fraction(sp.cancel(Z))
+    return max(sp.degree(num, regularity.s), sp.degree(den, regularity.s))
+
+
+# Each stage maps the state built by the stages before it to a new value
+STAGE_FUNCTIONS = {
+    'parse': ('ast', lambda st: parse_descriptor(st['desc'])),
+    'eval_impedance': ('Z', lambda st: eval_impedance(st['ast'])),
+    'canonical_form': ('Zcanon', lambda st: canonical_form(st['Z'])),
+    'biquadratic': (
+        None, lambda st:
+        regularity.is_necessarily_regular_biquadratic(st['Zr'])),
+    'definition': (
+        None, lambda st:
+        regularity.is_necessarily_regular_by_definition_optimised(st['Zn'])),
+    'root_isolation': (
+        None, lambda st:
+        regularity.is_necessarily_regular_by_root_isolation(st['Zr'])),
+}
+
+# Stages that only apply to some rows; other rows skip them, so a suite with
+# no such rows leaves the stage out of its summary
+STAGE_APPLIES = {
+    'biquadratic': lambda st: _degree(st['Zr']) <= 2,
+}
+
+
+# Short invocations timed from a cold interpreter. All but the 'sympy'
+# reference must finish without importing SymPy.
+STARTUP_SNIPPETS = {
+    'import_networks': "import pynntt.networks",
+    'parse': "from pynntt.networks import parse_descriptor, "
+             "format_descriptor; "
+             "format_descriptor(parse_descriptor('<(R&L)@(C&R)/(R+C)>'))",
+    'numeric': "from pynntt.networks import parse_descriptor; "
+               "from pynntt.numeric import eval_impedance_numeric; "
+               "eval_impedance_numeric(parse_descriptor('R+(L|C)'), [1.0], "
+               "[[1.0, 1.0, 1.0]])",
+    'evaluate_cli': "import pynntt.tools.evaluate_catalogue",
+    'sympy': "import sympy",
+}
+SYMPY_FREE = [name for name in STARTUP_SNIPPETS if name != 'sympy']
+
+
+def measure_startup(snippets=STARTUP_SNIPPETS, repeat=5):
+    """Time each snippet in a fresh interpreter, returning per snippet the
+    median wall time of repeat runs and whether it imported SymPy."""
+    env = {**os.environ, 'PYTHONPATH': os.pathsep.join(
+        filter(None, [str(SRC), os.environ.get('PYTHONPATH')]))}
+    results = {}
+    for name, code in snippets.items():
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            out = subprocess.run(
+                [sys.executable, '-c',
+                 code + "\nimport sys; print('sympy' in sys.modules)"],
+                env=env, capture_output=True, text=True, check=True)
+            times.append(time.perf_counter() - start)
+        results[name] = {'median': statistics.median(times),
+                         'sympy': out.stdout.split()[-1] == 'True'}
+    return results
+
+
+def synthetic_descriptors(sizes, per_size, seed=0):
+    """Yield (size, descriptor) pairs for random series-parallel networks of
+    each size, reproducibly from seed."""
+    rng = random.Random(seed)
+
+    def grow(n):
+        if n == 1:
+            return rng.choice('RLC')
+        left = rng.randint(1, n - 1)
+        return (rng.choice('+|'), grow(left), grow(n - left))
+
+    for n in sizes:
+        for _ in range(per_size):
+            yield n, format_descriptor(grow(n))
+
+
+def time_row(desc, stages=STAGES, timeout=None, repeat=1):
+    """Time each stage for one descriptor.
+
+    Returns a dict mapping stage to seconds (the best of repeat runs), or
+    to 'timeout' or 'error'; stages after a failed one, and stages that do
+    not apply to the row (`STAGE_APPLIES`), are not run.
+    """
+    state = {'desc': desc}
+    times = {}
+    for stage in STAGES:
+        key, func = STAGE_FUNCTIONS[stage]
+        run = stage in stages or key in ('ast', 'Z')
+        if not run or not STAGE_APPLIES.get(stage, bool)(state):
+            continue
+        best = math.inf
+        try:
+            for _ in range(repeat):
+                with time_limit(timeout):
+                    start = time.perf_counter()
+                    value = func(state)
+                    best = min(best, time.perf_counter() - start)
+        except RowTimeout:
+            times[stage] = 'timeout'
+            if key is not None:
+                break
+            continue
+        except Exception:
+            times[stage] = 'error'
+            if key is not None:
+                break
+            continue
+        if stage in stages:
+            times[stage] = best
+        if key is not None:
+            state[key] = value
+            if key == 'Z':
+                state['Zr'] = _regularity_form(value)
+                state['Zn'] = _numeric_instance(state['Zr'], desc)
+    return times
+
+
+def summarise(rows, stages):
+    """Summarise per-row stage times into totals, medians and counts."""
+    summary = {}
+    for stage in stages:
+        if not any(stage in r for r in rows):
+            continue
+        times = [r[stage] for r in rows if isinstance(r.get(stage), float)]
+        summary[stage] = {
+            'rows': len(times),
+            'total': sum(times),
+            'median': statistics.median(times) if times else None,
+            'max': max(times) if times else None,
+            'timeouts': sum(r.get(stage) == 'timeout' for r in rows),
+            'errors': sum(r.get(stage) == 'error' for r in rows),
+        }
+    return summary
+
+
+def scaling_curves(rows_by_size, stages):
+    """Report the median time per size and the local log-log exponent
+    between consecutive sizes; an exponent well above 1 marks where a stage
+    starts to grow superlinearly."""
+    curves = {}
+    for stage in stages:
+        points = []
+        for size in sorted(rows_by_size):
+            times = [r[stage] for r in rows_by_size[size]
+                     if isinstance(r.get(stage), float)]
+            median = statistics.median(times) if times else None
+            exponent = None
+            if points and median and points[-1]['median']:
+                exponent = math.log(median / points[-1]['median']) / \
+                    math.log(size / points[-1]['size'])
+            points.append({'size': size, 'median': median,
+                           'exponent': exponent})
+        curves[stage] = points
+    return curves
+
+
+def run_benchmark(catalogues=DEFAULT_CATALOGUES, sizes=(2, 4, 6, 8),
+                  per_size=4, stages=STAGES, timeout=10.0, repeat=1,
+                  seed=0, startup_repeat=5):
+    """Run every stage over the catalogues and the synthetic networks, and
+    time startup (unless startup_repeat is 0), returning the results as a
+    JSON-serialisable dict."""
+    suites = {}
+    for path in catalogues:
+        rows = [time_row(row['desc'], stages, timeout, repeat)
+                for row in iter_catalogue(path)]
+        suites[Path(path).stem] = summarise(rows, stages)
+
+    rows_by_size = {}
+    for size, desc in synthetic_descriptors(sizes, per_size, seed):
+        rows_by_size.setdefault(size, []).append(
+            time_row(desc, stages, timeout, repeat))
+    suites['synthetic'] = summarise(
+        [r for rows in rows_by_size.values() for r in rows], stages)
+
+    results = {
+        'meta': {
+            'python': platform.python_version(),
+            'sympy': sp.__version__,
+            'platform': platform.platform(),
+            'timeout': timeout,
+            'repeat': repeat,
+        },
+        'suites': suites,
+        'scaling': scaling_curves(rows_by_size, stages),
+    }
+    if startup_repeat:
+        results['startup'] = measure_startup(repeat=startup_repeat)
+    return results
+
+
+def compare_results(current, baseline, threshold=0.25, min_seconds=0.01):
+    """List the (suite, stage, baseline, current) total times that grew by
+    more than threshold, ignoring totals below min_seconds in both runs, and
+    stages that gained timeouts or errors.
+
+    Startup snippets are listed under the suite 'startup' with their median
+    times, when they slowed by more than threshold or when a SymPy-free
+    snippet started importing SymPy."""
+    regressions = []
+    for name, now in current.get('startup', {}).items():
+        before = baseline.get('startup', {}).get(name)
+        if before is None:
+            continue
+        if (now['sympy'] and not before['sympy']) or \
+                now['median'] > before['median'] * (1 + threshold):
+            regressions.append(('startup', name, before['median'],
+                                now['median']))
+    for suite, stages in current['suites'].items():
+        for stage, now in stages.items():
+            before = baseline.get('suites', {}).get(suite, {}).get(stage)
+            if before is None:
+                continue
+            if now['timeouts'] > before['timeouts'] or \
+                    now['errors'] > before['errors']:
+                regressions.append((suite, stage, before['total'],
+                                    now['total']))
+            elif max(now['total'], before['total']) >= min_seconds and \
+                    now['total'] > before['total'] * (1 + threshold):
+                regressions.append((suite, stage, before['total'],
+                                    now['total']))
+    return regressions
+
+
+def print_report(results, regressions=None, out=sys.stdout):
+    """Print per-suite totals, scaling curves and any regressions."""
+    for suite, stages in results['suites'].items():
+        print(f"{suite}:", file=out)
+        for stage, st in stages.items():
+            median = f"{st['median'] * 1e3:.2f} ms" \
+                if st['median'] is not None else '-'
+            print(f"  {stage:<15} total {st['total']:8.3f} s  "
+                  f"median {median:>10}  "
+                  f"timeouts {st['timeouts']}  errors {st['errors']}",
+                  file=out)
+    print("scaling (median per size, local exponent):", file=out)
+    for stage, points in results['scaling'].items():
+        cells = []
+        for p in points:
+            median = f"{p['median'] * 1e3:.2f}ms" \
+                if p['median'] is not None else '-'
+            exponent = f" ^{p['exponent']:.1f}" \
+                if p['exponent'] is not None else ''
+            cells.append(f"{p['size']}:{median}{exponent}")
+        print(f"  {stage:<15} " + '  '.join(cells), file=out)
+    if 'startup' in results:
+        print("startup (median of fresh interpreters):", file=out)
+        for name, st in results['startup'].items():
+            sympy = '  imports sympy' if st['sympy'] else ''
+            print(f"  {name:<15} {st['median'] * 1e3:8.1f} ms{sympy}",
+                  file=out)
+    if regressions:
+        print("regressions:", file=out)
+        for suite, stage, before, now in regressions:
+            print(f"  {suite}/{stage}: {before:.3f} s -> {now:.3f} s",
+                  file=out)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Time each evaluation stage over the catalogues and "
+                    "synthetic networks.")
+    parser.add_argument("-o", "--output", type=str, default=None,
+                        help="Path to write the results JSON")
+    parser.add_argument("--baseline", type=str, default=None,
+                        help="Baseline results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="Relative growth in a stage's total time that "
+                             "counts as a regression")
+    parser.add_argument("--catalogue", action="append", default=None,
+                        help="Catalogue CSV to time (repeatable; default: "
+                             "the shipped JS and MS catalogues)")
+    parser.add_argument("--sizes", type=int, nargs='+', default=[2, 4, 6, 8],
+                        help="Element counts of the synthetic networks")
+    parser.add_argument("--per-size", type=int, default=4,
+                        help="Synthetic networks per size")
+    parser.add_argument("--stages", nargs='+', choices=STAGES, default=STAGES,
+                        help="Stages to time")
+    parser.add_argument("--timeout", type=float, default=10.0,
+                        help="Budget per stage per row in seconds")
+    parser.add_argument("--repeat", type=int, default=1,
+                        help="Runs per stage; the best time is kept")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="Seed for the synthetic networks")
+    parser.add_argument("--startup-repeat", type=int, default=5,
+                        help="Fresh interpreters started per startup snippet "
+                             "(0 skips the startup timings)")
+    args = parser.parse_args()
+
+    results = run_benchmark(args.catalogue or DEFAULT_CATALOGUES,
+                            sizes=args.sizes, per_size=args.per_size,
+                            stages=args.stages, timeout=args.timeout,
+                            repeat=args.repeat, seed=args.seed,
+                            startup_repeat=args.startup_repeat)
+    regressions = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare_results(results, json.load(f),
+                                          args.threshold)
+    print_report(results, regressions)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
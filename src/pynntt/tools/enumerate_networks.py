@@ -0,0 +1,47 @@
+import csv
+import sys
+import argparse
+from pynntt.enumeration import enumerate_descriptors
+
+
+def write_catalogue(descriptors, f):
+    """Write descriptors as an 'ID,Desc' catalogue CSV, returning the count."""
+    writer = csv.writer(f, lineterminator='\n')
+    writer.writerow(['ID', 'Desc'])
+    count = 0
+    for count, desc in enumerate(descriptors, start=1):
+        writer.writerow([count, desc])
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Enumerate distinct network descriptors as a "
+                    "catalogue CSV.")
+    parser.add_argument("max_elements", type=int,
+                        help="Largest number of R, L and C elements")
+    parser.add_argument("-k", "--max-reactive", type=int, default=None,
+                        help="Largest number of L and C elements")
+    parser.add_argument("--min-elements", type=int, default=1,
+                        help="Smallest number of elements")
+    parser.add_argument("--bridges", action="store_true",
+                        help="Include bridge networks")
+    parser.add_argument("-o", "--output", type=str, default=None,
+                        help="Path to write the catalogue CSV "
+                             "(default: stdout)")
+    args = parser.parse_args()
+
+    descriptors = enumerate_descriptors(args.max_elements,
+                                        max_reactive=args.max_reactive,
+                                        bridges=args.bridges,
+                                        min_elements=args.min_elements)
+    if args.output is None:
+        write_catalogue(descriptors, sys.stdout)
+        return
+    with open(args.output, 'w', newline='') as f:
+        count = write_catalogue(descriptors, f)
+    print(f"Wrote {count} descriptors to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,75 +1,595 @@
 import csv
-import sympy as sp
+import heapq
+import json
+import signal
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+from functools import partial
+from itertools import islice
 from pathlib import Path
 import argparse
+from pynntt import hooks
 from pynntt.networks import parse_descriptor, eval_impedance, canonical_form
-from pynntt.regularity import is_necessarily_regular
+from pynntt.duality import OrbitVerdicts, orbit_key
 
+# SymPy, NumPy, the modules built on them, and the process pool are imported
+# where they are first needed, so that --parse-only runs never load them.
 
-def load_catalogue(path):
-    """Read a CSV catalogue of networks. Assumes 'ID' and 'Desc' columns."""
-    rows = []
+
+def iter_catalogue(path):
+    """Yield the rows of a CSV catalogue one at a time. Assumes 'ID' and
+    'Desc' columns."""
     with open(path, encoding='utf-8-sig', newline='') as f:
         reader = csv.DictReader(f)
         for row in reader:
             if 'ID' not in row or 'Desc' not in row:
                 raise ValueError("CSV must contain 'ID' and 'Desc' headers")
-            rows.append({'id': row['ID'].strip(), 'desc': row['Desc'].strip()})
-    return rows
+            yield {'id': row['ID'].strip(), 'desc': row['Desc'].strip()}
 
 
-def evaluate_catalogue(rows, include_ast=False, include_regular=False):
-    """Evaluate each network's impedance and return enriched rows."""
-    enriched = []
-    for row in rows:
+def load_catalogue(path):
+    """Read a CSV catalogue of networks. Assumes 'ID' and 'Desc' columns."""
+    return list(iter_catalogue(path))
+
+
+class RowTimeout(BaseException):
+    """Raised inside a row evaluation when its time budget runs out.
+
+    Derives from BaseException so that the broad `except Exception`
+    fallbacks in the regularity tests cannot swallow it.
+    """
+
+
+@contextmanager
+def time_limit(seconds):
+    """Raise RowTimeout in the enclosed block after `seconds` of wall time.
+
+    Uses SIGALRM, so it only takes effect in the main thread on platforms
+    that provide it; elsewhere the block runs without a limit.
+    """
+    if not seconds or not hasattr(signal, 'setitimer') or \
+       threading.current_thread() is not threading.main_thread():
+        yield
+        return
+
+    def on_alarm(signum, frame):
+        raise RowTimeout()
+
+    previous = signal.signal(signal.SIGALRM, on_alarm)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+@contextmanager
+def _profiling(memory=True):
+    """Collect a profile of the enclosed block from the library's hooks.
+
+    Yields a dict that is filled in with the summed wall time of each stage
+    ('stages'), the regularity tests tried in order ('regularity_path'), the
+    total wall time and, with memory, the peak traced memory in bytes.
+    """
+    import tracemalloc
+    stages = {}
+    paths = []
+
+    def on_stage(event, payload):
+        stages[payload['stage']] = stages.get(payload['stage'], 0.0) + \
+            payload['seconds']
+
+    def on_path(event, payload):
+        paths.append(payload['path'])
+
+    record = {'stages': stages, 'regularity_path': paths}
+    hooks.subscribe('stage', on_stage)
+    hooks.subscribe('regularity_path', on_path)
+    started = memory and not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    if memory:
+        tracemalloc.reset_peak()
+    start = time.perf_counter()
+    try:
+        yield record
+    finally:
+        record['total'] = time.perf_counter() - start
+        if memory:
+            record['peak_memory'] = tracemalloc.get_traced_memory()[1]
+        if started:
+            tracemalloc.stop()
+        hooks.unsubscribe('stage', on_stage)
+        hooks.unsubscribe('regularity_path', on_path)
+
+
+def _expression_size(Z):
+    """Return the operation count and numerator/denominator degrees in s
+    of an impedance, with None for a degree that is not defined."""
+    import sympy as sp
+    from pynntt.networks import s
+    num, den = sp.fraction(sp.together(Z))
+    size = {'count_ops': int(sp.count_ops(Z))}
+    for key, part in (('num_degree', num), ('den_degree', den)):
         try:
-            ast = parse_descriptor(row['desc'])
-            Z = eval_impedance(ast)
-            Zcanon = canonical_form(Z)
+            size[key] = int(sp.degree(part, s))
+        except Exception:
+            size[key] = None
+    return size
+
+
+def evaluate_row(row, include_ast=False, include_regular=False,
+                 engine='sympy', cache=None, timeout=None, screen=0,
+                 profile=False):
+    """Evaluate one network's impedance and return the enriched row.
+
+    With screen > 0 and include_regular, regularity is first screened
+    numerically with that many component-value samples; a refuted row is
+    marked not regular, with its counterexample, without the exact test.
+
+    With profile, the row carries a 'profile' dict (see _profiling) that
+    also records the size of Zcanon; a row refuted by screening has the
+    regularity path ['screening']. With profile='timings', only the stage
+    and total times and the regularity path are recorded, which costs
+    little.
+    """
+    if not profile:
+        return _evaluate_row(row, include_ast, include_regular, engine,
+                             cache, timeout, screen)
+    full = profile != 'timings'
+    with _profiling(memory=full) as record:
+        result = _evaluate_row(row, include_ast, include_regular, engine,
+                               cache, timeout, screen)
+    if 'counterexample' in result:
+        record['regularity_path'] = ['screening']
+    if full and 'Zcanon' in result:
+        record.update(_expression_size(result['Zcanon']))
+    result['profile'] = record
+    return result
+
+
+def _evaluate_row(row, include_ast, include_regular, engine, cache,
+                  timeout, screen):
+    # A row may carry the AST it was already parsed to (see _evaluate_orbits)
+    row = dict(row)
+    ast = row.pop('_ast', None)
+    try:
+        with time_limit(timeout):
+            if ast is None:
+                ast = parse_descriptor(row['desc'])
+            if engine == 'ring':
+                from pynntt.polyring import eval_canonical_impedance
+                Z = Zcanon = eval_canonical_impedance(ast)
+            elif cache is not None:
+                from pynntt.cache import eval_impedance_cached
+                Z = eval_impedance_cached(ast, cache)
+                Zcanon = canonical_form(Z)
+            else:
+                Z = eval_impedance(ast)
+                Zcanon = canonical_form(Z)
             result = {**row, 'Zcanon': Zcanon}
             if include_ast:
                 result['ast'] = str(ast)
             if include_regular:
-                result['regular'] = is_necessarily_regular(Z)
-            enriched.append(result)
+                counterexample = None
+                if screen:
+                    from pynntt.screening import screen_regularity
+                    counterexample = screen_regularity(ast, samples=screen,
+                                                       seed=0)
+                if counterexample is not None:
+                    from pynntt.screening import format_counterexample
+                    result['regular'] = False
+                    result['counterexample'] = \
+                        format_counterexample(counterexample)
+                else:
+                    from pynntt.regularity import is_necessarily_regular
+                    result['regular'] = is_necessarily_regular(Z)
+            return result
+    except RowTimeout:
+        return {**row, 'error': 'timeout'}
+    except Exception as e:
+        return {**row, 'error': str(e)}
+
+
+_worker_cache = None
+
+
+def _init_worker(cache_size):
+    global _worker_cache
+    from pynntt.cache import ImpedanceCache
+    _worker_cache = ImpedanceCache(cache_size) if cache_size else None
+
+
+def _evaluate_in_worker(row, **options):
+    return evaluate_row(row, cache=_worker_cache, **options)
+
+
+@contextmanager
+def _row_evaluator(cache, jobs, chunksize, **options):
+    """Provide a function mapping a list of rows to enriched rows in order,
+    evaluated serially or by a worker pool that lives for the whole run.
+    Keyword arguments to the function override options for those rows."""
+    if jobs <= 1:
+        yield lambda rows, **overrides: (
+            evaluate_row(row, cache=cache, **{**options, **overrides})
+            for row in rows)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+    cache_size = cache.maxsize if cache is not None else 0
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                             initargs=(cache_size,)) as pool:
+        yield lambda rows, **overrides: pool.map(
+            partial(_evaluate_in_worker, **{**options, **overrides}), rows,
+            chunksize=chunksize)
+
+
+def _blocks(rows, size):
+    """Split an iterable of rows into lists of at most size rows."""
+    rows = iter(rows)
+    while True:
+        block = list(islice(rows, size))
+        if not block:
+            return
+        yield block
+
+
+def _parse_orbit(desc):
+    """The AST and orbit key of a descriptor, each None if it cannot be
+    found."""
+    try:
+        ast = parse_descriptor(desc)
+    except Exception:
+        return None, None
+    try:
+        return ast, orbit_key(ast)
+    except Exception:
+        return ast, None
+
+
+def _evaluate_orbits(evaluate, rows, orbits):
+    """Evaluate rows with regularity tested once per orbit, returning the
+    results in order.
+
+    The first row of each orbit without a verdict in orbits is tested, and
+    its verdict recorded; the other rows are evaluated without the test and
+    take the verdict of their orbit. A row whose orbit has no verdict after
+    all (its representative failed) is tested itself. Each descriptor is
+    parsed once, and its AST handed on to the row's evaluation.
+    """
+    parsed = [_parse_orbit(row['desc']) for row in rows]
+    keys = [key for _, key in parsed]
+    rows = [row if ast is None else {**row, '_ast': ast}
+            for row, (ast, _) in zip(rows, parsed)]
+    first = {}
+    tested, deferred = [], []
+    for i, key in enumerate(keys):
+        if key is None or (key not in orbits and
+                           first.setdefault(key, i) == i):
+            tested.append(i)
+        else:
+            deferred.append(i)
+
+    results = [None] * len(rows)
+
+    def test(indices):
+        for i, result in zip(indices,
+                             evaluate([rows[i] for i in indices])):
+            if keys[i] is not None and 'regular' in result:
+                orbits.put(keys[i], result['regular'])
+            results[i] = result
+
+    test(tested)
+    retry = []
+    for i, result in zip(deferred, evaluate([rows[i] for i in deferred],
+                                            include_regular=False)):
+        verdict = None if 'error' in result else orbits.get(keys[i])
+        if 'error' not in result and verdict is None:
+            retry.append(i)
+            continue
+        if verdict is not None:
+            result['regular'] = verdict
+            if 'profile' in result:
+                result['profile']['regularity_path'] = ['orbit']
+        results[i] = result
+    test(retry)
+    return results
+
+
+def _from_store(row, stored, include_ast, include_regular):
+    """Build an enriched row from a stored result, or None if incomplete."""
+    if stored is None or (include_regular and stored['regular'] is None):
+        return None
+    result = {**row, 'Zcanon': stored['Zcanon']}
+    if include_ast:
+        result['ast'] = stored['ast']
+    if include_regular:
+        result['regular'] = stored['regular']
+        if stored['counterexample'] is not None:
+            result['counterexample'] = stored['counterexample']
+    return result
+
+
+def iter_evaluate_catalogue(rows, include_ast=False, include_regular=False,
+                            engine='sympy', cache=None, jobs=1, timeout=None,
+                            chunksize=16, store=None, buffer_size=1024,
+                            screen=0, profile=False, orbits=None):
+    """Lazily evaluate each network's impedance, yielding enriched rows.
+
+    Rows are read and evaluated in blocks of buffer_size, so memory use
+    does not grow with the length of the catalogue. The other arguments
+    are as for evaluate_catalogue.
+    """
+    if engine not in ('sympy', 'ring'):
+        raise ValueError(f"Unknown engine: {engine}")
+    options = dict(include_ast=include_ast or store is not None,
+                   include_regular=include_regular, engine=engine,
+                   timeout=timeout, screen=screen, profile=profile)
+    with _row_evaluator(cache, jobs, chunksize, **options) as evaluate:
+        for block in _blocks(rows, buffer_size):
+            enriched = [None] * len(block)
+            pending = []
+            for i, row in enumerate(block):
+                if store is not None:
+                    stored = store.get(row['desc'], engine)
+                    enriched[i] = _from_store(row, stored, include_ast,
+                                              include_regular)
+                if enriched[i] is None:
+                    pending.append(i)
+
+            if orbits is not None and include_regular:
+                results = _evaluate_orbits(
+                    evaluate, [block[i] for i in pending], orbits)
+            else:
+                results = evaluate([block[i] for i in pending])
+            for i, result in zip(pending, results):
+                if store is not None and 'error' not in result:
+                    store.put(result['desc'], result['Zcanon'],
+                              result['ast'], result.get('regular'), engine,
+                              result.get('counterexample'))
+                    if not include_ast:
+                        del result['ast']
+                enriched[i] = result
+            if store is not None:
+                store.commit()
+            yield from enriched
+
+
+def evaluate_catalogue(rows, include_ast=False, include_regular=False,
+                       engine='sympy', cache=None, jobs=1, timeout=None,
+                       chunksize=16, store=None, screen=0, profile=False,
+                       orbits=None):
+    """Evaluate each network's impedance and return enriched rows.
+
+    engine selects how Zcanon is computed: 'sympy' evaluates the AST to a
+    SymPy expression and canonicalises it, 'ring' uses the polynomial-ring
+    evaluator in pynntt.polyring. With the 'sympy' engine, an
+    ImpedanceCache passed as cache is shared by all rows.
+
+    With jobs > 1, rows are dispatched in chunks of chunksize to a pool of
+    worker processes, each with its own cache of the same size (the
+    statistics of cache are then not updated). A row that runs longer than
+    timeout seconds is recorded with error 'timeout'. Results are always
+    returned in input order.
+
+    With a ResultStore as store, rows already in the store are not
+    re-evaluated, and new results are written to it as they arrive.
+
+    With screen > 0, regularity is screened numerically before the exact
+    test (see evaluate_row); refuted rows carry a 'counterexample'.
+
+    With profile, each evaluated row carries a 'profile' dict of stage
+    times, regularity path, expression size and peak memory, or with
+    profile='timings' of the times and path only; rows taken from the
+    store are not profiled.
+
+    With an OrbitVerdicts as orbits, is_necessarily_regular runs once per
+    orbit under duality and frequency inversion (see pynntt.duality), and
+    the other members of the orbit take its verdict; orbits counts the
+    tests run and the verdicts reused.
+    """
+    return list(iter_evaluate_catalogue(
+        rows, include_ast=include_ast, include_regular=include_regular,
+        engine=engine, cache=cache, jobs=jobs, timeout=timeout,
+        chunksize=chunksize, store=store, screen=screen, profile=profile,
+        orbits=orbits))
+
+
+def iter_parse_catalogue(rows):
+    """Lazily parse each network's descriptor, yielding rows with its 'ast'
+    or an 'error'. Never imports SymPy."""
+    for row in rows:
+        try:
+            yield {**row, 'ast': str(parse_descriptor(row['desc']))}
         except Exception as e:
-            enriched.append({**row, 'error': str(e)})
-    return enriched
+            yield {**row, 'error': str(e)}
+
 
+def write_profiles(rows, f, slowest=None, top=10):
+    """Yield rows unchanged, writing each row's profile to the open file f
+    as a JSON line.
+
+    If slowest is a list, it is kept as a heap of the (total, id, desc) of
+    the top slowest profiled rows.
+    """
+    for row in rows:
+        record = row.get('profile')
+        if record is not None:
+            f.write(json.dumps({'id': row['id'], 'desc': row['desc'],
+                                **record}) + '\n')
+            if slowest is not None:
+                entry = (record['total'], row['id'], row['desc'])
+                if len(slowest) < top:
+                    heapq.heappush(slowest, entry)
+                elif top > 0:
+                    heapq.heappushpop(slowest, entry)
+        yield row
 
-def save_results_csv(rows, path, include_ast=False, include_regular=False):
-    """Save canonical Z(s) results to a CSV."""
-    keys = ['id', 'desc', 'Zcanon']
+
+def save_results_csv(rows, path, include_ast=False, include_regular=False,
+                     flush_every=1000, include_counterexample=False,
+                     include_zcanon=True):
+    """Save canonical Z(s) results to a CSV, returning the number of rows.
+
+    rows may be any iterable, including a generator from
+    iter_evaluate_catalogue; the file is flushed every flush_every rows so
+    results appear on disk while the run continues.
+    """
+    keys = ['id', 'desc']
+    if include_zcanon:
+        keys.append('Zcanon')
     if include_ast:
         keys.append('ast')
     if include_regular:
         keys.append('regular')
+    if include_counterexample:
+        keys.append('counterexample')
     keys.append('error')
 
     with open(path, 'w', newline='') as f:
         writer = csv.DictWriter(f, fieldnames=keys)
         writer.writeheader()
-        for row in rows:
+        count = 0
+        for count, row in enumerate(rows, start=1):
             out = {k: row.get(k, '') for k in keys}
             writer.writerow(out)
+            if count % flush_every == 0:
+                f.flush()
+    return count
 
 
 def main():
-    parser = argparse.ArgumentParser(description="Evaluate network impedances from a descriptor CSV.")
-    parser.add_argument("input_csv", type=str, help="Path to input CSV with 'ID' and 'Desc' columns")
-    parser.add_argument("output_csv", type=str, help="Path to write output CSV with results")
-    parser.add_argument("--include-ast", action="store_true", help="Include AST in output CSV")
-    parser.add_argument("--include-regular", action="store_true", help="Include regularity test result in output CSV")
+    parser = argparse.ArgumentParser(
+        description="Evaluate network impedances from a descriptor CSV.")
+    parser.add_argument("input_csv", type=str,
+                        help="Path to input CSV with 'ID' and 'Desc' columns")
+    parser.add_argument("output_csv", type=str,
+                        help="Path to write output CSV with results")
+    parser.add_argument("--include-ast", action="store_true",
+                        help="Include AST in output CSV")
+    parser.add_argument("--include-regular", action="store_true",
+                        help="Include regularity test result in output CSV")
+    parser.add_argument("--engine", choices=['sympy', 'ring'], default='sympy',
+                        help="Impedance engine used to compute Zcanon")
+    parser.add_argument("--cache-size", type=int, default=0,
+                        help="Share a subtree impedance cache of this many "
+                             "entries across rows (0 disables)")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="Number of worker processes")
+    parser.add_argument("--chunksize", type=int, default=16,
+                        help="Rows dispatched to a worker at a time")
+    parser.add_argument("--timeout", type=float, default=None,
+                        help="Wall-clock budget per row in seconds; slower "
+                             "rows are recorded with error=timeout")
+    parser.add_argument("--store", type=str, default=None,
+                        help="SQLite result store to consult first and "
+                             "update as rows complete, so interrupted runs "
+                             "resume")
+    parser.add_argument("--screen", type=int, default=0,
+                        help="Screen regularity numerically with this many "
+                             "random component-value samples first; refuted "
+                             "rows skip the exact test (0 disables)")
+    parser.add_argument("--buffer-size", type=int, default=1024,
+                        help="Rows read and evaluated per block; bounds "
+                             "memory use")
+    parser.add_argument("--profile", action="store_true",
+                        help="Record per-row stage times, regularity path, "
+                             "expression size and peak memory as JSON lines "
+                             "next to the output CSV "
+                             "(<output>.profile.jsonl)")
+    parser.add_argument("--profile-top", type=int, default=10,
+                        help="Number of slowest rows to list after a "
+                             "profiled run")
+    parser.add_argument("--orbits", action="store_true",
+                        help="Test regularity once per orbit under duality "
+                             "and frequency inversion and reuse the verdict "
+                             "for the other members")
+    parser.add_argument("--parse-only", action="store_true",
+                        help="Only parse the descriptors, writing each AST "
+                             "or parse error; never imports SymPy, for fast "
+                             "checks in shell pipelines")
+    parser.add_argument("--format", choices=['csv', 'parquet', 'arrow'],
+                        default=None,
+                        help="Output format (default: from the output "
+                             "suffix, .parquet or .arrow/.feather, else "
+                             "csv); the columnar formats store Zcanon as "
+                             "integer coefficient data, with per-row timings")
     args = parser.parse_args()
 
     input_file = Path(args.input_csv)
     output_file = Path(args.output_csv)
     output_file.parent.mkdir(parents=True, exist_ok=True)
 
-    catalogue = load_catalogue(input_file)
-    results = evaluate_catalogue(catalogue, include_ast=args.include_ast, include_regular=args.include_regular)
-    save_results_csv(results, output_file, include_ast=args.include_ast, include_regular=args.include_regular)
-    print(f"Processed {len(results)} entries to {output_file}")
+    catalogue = iter_catalogue(input_file)
+    fmt = args.format
+    # pynntt.results loads pandas and pyarrow, which a CSV output never needs
+    if fmt is None and output_file.suffix.lower() != '.csv':
+        from pynntt.results import format_for_path
+        fmt = format_for_path(output_file)
+    fmt = fmt or 'csv'
+    if args.parse_only:
+        parsed = iter_parse_catalogue(catalogue)
+        if fmt == 'csv':
+            count = save_results_csv(parsed, output_file, include_ast=True,
+                                     include_zcanon=False)
+        else:
+            from pynntt.results import save_results_columnar
+            count = save_results_columnar(parsed, output_file, fmt)
+        print(f"Parsed {count} entries to {output_file}")
+        return
+
+    profile = args.profile or (fmt != 'csv' and 'timings')
+
+    from pynntt.cache import ImpedanceCache
+    from pynntt.store import ResultStore
+    cache = ImpedanceCache(args.cache_size) if args.cache_size > 0 else None
+    store = ResultStore(args.store) if args.store else None
+    orbits = OrbitVerdicts() if args.orbits else None
+    profile_file = output_file.with_suffix('.profile.jsonl')
+    slowest = []
+    try:
+        with ExitStack() as stack:
+            results = iter_evaluate_catalogue(
+                catalogue, include_ast=args.include_ast,
+                include_regular=args.include_regular, engine=args.engine,
+                cache=cache, jobs=args.jobs, timeout=args.timeout,
+                chunksize=args.chunksize, store=store,
+                buffer_size=args.buffer_size, screen=args.screen,
+                profile=profile, orbits=orbits)
+            if args.profile:
+                f = stack.enter_context(open(profile_file, 'w'))
+                results = write_profiles(results, f, slowest, args.profile_top)
+            if fmt == 'csv':
+                count = save_results_csv(
+                    results, output_file, include_ast=args.include_ast,
+                    include_regular=args.include_regular,
+                    include_counterexample=(args.include_regular and
+                                            args.screen > 0))
+            else:
+                from pynntt.results import save_results_columnar
+                count = save_results_columnar(results, output_file, fmt)
+    finally:
+        if store is not None:
+            store.close()
+    print(f"Processed {count} entries to {output_file}")
+    if args.profile:
+        print(f"Profiles written to {profile_file}; slowest rows:")
+        for total, row_id, desc in sorted(slowest, reverse=True):
+            print(f"  {total:8.3f} s  {row_id}  {desc}")
+    if orbits is not None:
+        stats = orbits.stats()
+        print(f"Orbits: {stats['tested']} regularity tests for "
+              f"{stats['orbits']} orbits, {stats['reused']} verdicts reused "
+              f"({stats['saved']:.1%} of tests saved)")
+    if store is not None:
+        print(f"Result store: {store.hits} hits, {store.misses} misses")
+    if cache is not None and args.jobs <= 1:
+        stats = cache.stats()
+        print(f"Subtree cache: {stats['hits']} hits, {stats['misses']} "
+              f"misses ({stats['hit_rate']:.1%}), "
+              f"{stats['size']}/{stats['maxsize']} entries")
 
 
 if __name__ == '__main__':
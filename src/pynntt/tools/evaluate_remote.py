@@ -0,0 +1,167 @@
+import argparse
+import json
+import socket
+from pathlib import Path
+from itertools import islice
+from pynntt.tools.evaluate_catalogue import (iter_catalogue,
+                                             iter_parse_catalogue,
+                                             save_results_csv)
+
+# A thin client of pynntt.tools.serve, and a drop-in replacement for
+# evaluate_catalogue.py that leaves the evaluation to a running server.
+# It never imports SymPy.
+
+DEFAULT_ADDRESS = '127.0.0.1:8765'
+
+
+class ServerError(RuntimeError):
+    """A request the evaluation server answered with an error."""
+
+
+class EvaluationClient:
+    """Blocking connection to an evaluation server.
+
+    address is 'host:port' or 'unix:path', as in EvaluationServer.address.
+    Each method sends one request and waits for its response, raising
+    ServerError if the server reports an error.
+    """
+
+    def __init__(self, address=DEFAULT_ADDRESS, timeout=None):
+        if address.startswith('unix:'):
+            self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._socket.settimeout(timeout)
+            self._socket.connect(address[len('unix:'):])
+        else:
+            host, _, port = address.rpartition(':')
+            self._socket = socket.create_connection((host, int(port)),
+                                                    timeout=timeout)
+        self._file = self._socket.makefile('rwb')
+
+    def close(self):
+        self._file.close()
+        self._socket.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def request(self, op, **params):
+        """Send one request and return its response without 'ok'."""
+        self._file.write(json.dumps({'op': op, **params}).encode() + b'\n')
+        self._file.flush()
+        line = self._file.readline()
+        if not line:
+            raise ConnectionError("Server closed the connection")
+        response = json.loads(line)
+        if not response.pop('ok', False):
+            raise ServerError(response.get('error', 'unknown error'))
+        return response
+
+    def ping(self):
+        self.request('ping')
+
+    def stats(self):
+        return self.request('stats')
+
+    def parse(self, desc):
+        """Return the AST of a descriptor, as a string."""
+        return self.request('parse', desc=desc)['ast']
+
+    def impedance(self, desc):
+        """Return the impedance from eval_impedance, as a string."""
+        return self.request('impedance', desc=desc)['Z']
+
+    def canonical(self, desc, engine='sympy'):
+        """Return the canonical impedance Zcanon, as a string."""
+        return self.request('canonical', desc=desc, engine=engine)['Zcanon']
+
+    def regularity(self, desc, engine='sympy'):
+        """Return whether a network is necessarily regular."""
+        return self.request('regularity', desc=desc, engine=engine)['regular']
+
+    def evaluate(self, rows, **options):
+        """Evaluate catalogue rows as evaluate_catalogue does with the same
+        options (include_ast, include_regular, engine, screen, timeout),
+        with Zcanon as a string."""
+        return self.request('evaluate', rows=list(rows), **options)['rows']
+
+    def batch(self, requests):
+        """Send many request objects at once, returning their responses,
+        each with 'ok' and its result or 'error'."""
+        return self.request('batch', requests=list(requests))['results']
+
+
+def iter_evaluate_remote(client, rows, batch_size=256, **options):
+    """Lazily evaluate catalogue rows on the server in batches of
+    batch_size, yielding enriched rows in order."""
+    rows = iter(rows)
+    while True:
+        block = list(islice(rows, batch_size))
+        if not block:
+            return
+        yield from client.evaluate(block, **options)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Evaluate network impedances from a descriptor CSV on a "
+                    "running evaluation server (pynntt.tools.serve).")
+    parser.add_argument("input_csv", type=str,
+                        help="Path to input CSV with 'ID' and 'Desc' columns")
+    parser.add_argument("output_csv", type=str,
+                        help="Path to write output CSV with results")
+    parser.add_argument("--server", type=str, default=DEFAULT_ADDRESS,
+                        help="Server address, as host:port or unix:path")
+    parser.add_argument("--include-ast", action="store_true",
+                        help="Include AST in output CSV")
+    parser.add_argument("--include-regular", action="store_true",
+                        help="Include regularity test result in output CSV")
+    parser.add_argument("--engine", choices=['sympy', 'ring'], default='sympy',
+                        help="Impedance engine used to compute Zcanon")
+    parser.add_argument("--timeout", type=float, default=None,
+                        help="Wall-clock budget per row in seconds; slower "
+                             "rows are recorded with error=timeout")
+    parser.add_argument("--screen", type=int, default=0,
+                        help="Screen regularity numerically with this many "
+                             "random component-value samples first (0 "
+                             "disables)")
+    parser.add_argument("--batch-size", type=int, default=256,
+                        help="Rows sent to the server per request")
+    parser.add_argument("--parse-only", action="store_true",
+                        help="Only parse the descriptors, locally, writing "
+                             "each AST or parse error")
+    args = parser.parse_args()
+
+    input_file = Path(args.input_csv)
+    output_file = Path(args.output_csv)
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+
+    catalogue = iter_catalogue(input_file)
+    if args.parse_only:
+        count = save_results_csv(iter_parse_catalogue(catalogue), output_file,
+                                 include_ast=True, include_zcanon=False)
+        print(f"Parsed {count} entries to {output_file}")
+        return
+
+    options = dict(include_ast=args.include_ast,
+                   include_regular=args.include_regular, engine=args.engine,
+                   screen=args.screen)
+    if args.timeout is not None:
+        options['timeout'] = args.timeout
+    with EvaluationClient(args.server) as client:
+        results = iter_evaluate_remote(client, catalogue, args.batch_size,
+                                       **options)
+        count = save_results_csv(
+            results, output_file, include_ast=args.include_ast,
+            include_regular=args.include_regular,
+            include_counterexample=args.include_regular and args.screen > 0)
+        stats = client.stats()
+    print(f"Processed {count} entries to {output_file}")
+    print(f"Server: {stats['hits']} result cache hits, "
+          f"{stats['misses']} misses")
+
+
+if __name__ == '__main__':
+    main()
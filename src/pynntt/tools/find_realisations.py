@@ -0,0 +1,106 @@
+import argparse
+import time
+from pynntt.networks import parse_descriptor
+from pynntt.enumeration import enumerate_networks
+from pynntt.synthesis import SynthesisIndex, target_coefficients
+from pynntt.tools.evaluate_catalogue import iter_catalogue
+
+
+def build_index(catalogue=None, max_elements=0, max_reactive=None,
+                bridges=False):
+    """Index the rows of a catalogue CSV by id and enumerated networks by
+    descriptor, skipping rows that do not parse."""
+    index = SynthesisIndex()
+    if catalogue is not None:
+        for row in iter_catalogue(catalogue):
+            try:
+                index.add(row['id'], parse_descriptor(row['desc']))
+            except Exception:
+                continue
+    if max_elements > 0:
+        networks = enumerate_networks(max_elements,
+                                      max_reactive=max_reactive,
+                                      bridges=bridges)
+        index.update((desc, ast) for ast, desc in networks)
+    return index
+
+
+def parse_coefficients(text):
+    """Parse comma-separated coefficients, lowest power of s first."""
+    return [float(c) for c in text.split(',')]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Find networks whose impedance can take a target "
+                    "N(s)/D(s), from a catalogue, the enumerator or a saved "
+                    "index.")
+    parser.add_argument("target", type=str, nargs='?', default=None,
+                        help="Target impedance as an expression in s, e.g. "
+                             "'(s**2+3*s+2)/(s**2+s+1)'")
+    parser.add_argument("--num", type=parse_coefficients, default=None,
+                        help="Target numerator coefficients, lowest power of "
+                             "s first, e.g. 2,3,1")
+    parser.add_argument("--den", type=parse_coefficients, default=None,
+                        help="Target denominator coefficients, lowest power "
+                             "of s first")
+    parser.add_argument("--catalogue", type=str, default=None,
+                        help="Index a descriptor CSV with 'ID' and 'Desc' "
+                             "columns")
+    parser.add_argument("--enumerate", type=int, default=0,
+                        help="Index every network with up to this many "
+                             "elements")
+    parser.add_argument("-k", "--max-reactive", type=int, default=None,
+                        help="Largest number of L and C elements to enumerate")
+    parser.add_argument("--bridges", action="store_true",
+                        help="Enumerate bridge networks too")
+    parser.add_argument("--index", type=str, default=None,
+                        help="Load a saved index (JSON lines) instead of "
+                             "building one")
+    parser.add_argument("--save", type=str, default=None,
+                        help="Save the index to this path")
+    parser.add_argument("--counts", type=str, default=None,
+                        help="Required element counts, e.g. R=2,L=1")
+    parser.add_argument("--fit", action="store_true",
+                        help="Keep only candidates for which positive "
+                             "component values are found, and print them")
+    args = parser.parse_args()
+
+    if args.index is not None:
+        index = SynthesisIndex.load(args.index)
+    else:
+        index = build_index(args.catalogue, args.enumerate, args.max_reactive,
+                            args.bridges)
+    if args.save is not None:
+        index.save(args.save)
+        print(f"Saved {len(index)} networks to {args.save}")
+
+    if args.target is not None:
+        num, den = target_coefficients(args.target)
+    elif args.num is not None and args.den is not None:
+        num, den = args.num, args.den
+    else:
+        return
+    counts = None
+    if args.counts:
+        items = (item.split('=') for item in args.counts.split(','))
+        counts = {label: int(n) for label, n in items}
+
+    start = time.perf_counter()
+    keys = index.query(num, den, counts)
+    elapsed = time.perf_counter() - start
+    print(f"{len(keys)} of {len(index)} networks share the target's support "
+          f"pattern ({elapsed * 1e3:.3f} ms)")
+    for key in keys:
+        if not args.fit:
+            print(f"{key}\t{index.descriptor(key)}")
+            continue
+        values = index.fit(key, num, den)
+        if values is not None:
+            fitted = ', '.join(f"{name}={v:.6g}"
+                               for name, v in values.items())
+            print(f"{key}\t{index.descriptor(key)}\t{fitted}")
+
+
+if __name__ == '__main__':
+    main()
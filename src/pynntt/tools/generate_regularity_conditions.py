@@ -0,0 +1,143 @@
+import argparse
+import sys
+import textwrap
+from pathlib import Path
+import sympy as sp
+
+# Derives the coefficient conditions for the regularity of third-order
+# impedances and writes them as plain Python, so that
+# pynntt.regularity can test them without SymPy. Run again (and commit the
+# result) whenever the derivation changes; --check reports a stale file.
+
+OUTPUT = Path(__file__).resolve().parent.parent / 'regularity_conditions.py'
+
+HEADER = '''"""
+regularity_conditions.py — Coefficient conditions for third-order regularity
+
+Generated by pynntt.tools.generate_regularity_conditions; do not edit.
+
+For Z(s) = N(s)/D(s) with N = a0 + a1 s + a2 s² + a3 s³ and
+D = b0 + b1 s + b2 s² + b3 s³, and w = ω², Re Z(jω) = A(w)/B(w) and
+Re Y(jω) = A(w)/C(w) with B = |D(jω)|² and C = |N(jω)|². When a0, a3, b0
+and b3 are all nonzero, the end values of Re Z are a0/b0 (w → 0) and
+a3/b3 (w → ∞), and of Re Y are b0/a0 and b3/a3. Re Z never falls below
+its value at an end exactly when the matching polynomial
+
+    z_at_zero:      b0·A − a0·B
+    z_at_infinity:  b3·A − a3·B
+    y_at_zero:      a0·A − b0·C
+    y_at_infinity:  a3·A − b3·C
+
+is non-negative for w > 0. The first and third vanish at w = 0 and the
+others have degree 2, so each is w^k·(h0 + h1·w + h2·w²), which is
+non-negative for w > 0 exactly when
+
+    h0 ≥ 0, h2 ≥ 0 and (h1 ≥ 0 or 4·h0·h2 − h1² ≥ 0),
+
+the last being the discriminant condition for no positive root. Each
+function returns (h0, h1, h2, 4·h0·h2 − h1²), each as a list of
+(factor, multiplicity) pairs whose product it is, so that the sign of each
+can be read from the signs of its factors. Arguments may be numbers or
+polynomial-ring elements.
+"""
+
+
+'''
+
+
+def _real_parts():
+    a = sp.symbols('a0:4')
+    b = sp.symbols('b0:4')
+    w = sp.Symbol('w')
+
+    def even_odd(c):
+        even = sum(c[k] * (-w) ** (k // 2) for k in range(0, 4, 2))
+        odd = sum(c[k] * (-w) ** (k // 2) for k in range(1, 4, 2))
+        return even, odd
+
+    Ne, No = even_odd(a)
+    De, Do = even_odd(b)
+    A = sp.expand(Ne * De + w * No * Do)
+    B = sp.expand(De ** 2 + w * Do ** 2)
+    C = sp.expand(Ne ** 2 + w * No ** 2)
+    return a, b, w, A, B, C
+
+
+def derive_conditions():
+    """Return {name: (h0, h1, h2, discriminant)} as SymPy expressions in
+    a0..a3 and b0..b3, checking the shape claimed in the header."""
+    a, b, w, A, B, C = _real_parts()
+    tests = {
+        'z_at_zero': (b[0] * A - a[0] * B, 1),
+        'z_at_infinity': (b[3] * A - a[3] * B, 0),
+        'y_at_zero': (a[0] * A - b[0] * C, 1),
+        'y_at_infinity': (a[3] * A - b[3] * C, 0),
+    }
+    conditions = {}
+    for name, (G, shift) in tests.items():
+        G = sp.Poly(sp.expand(G), w)
+        coeffs = [G.coeff_monomial(w ** k) for k in range(4)]
+        assert all(c == 0 for c in coeffs[:shift] + coeffs[shift + 3:])
+        h0, h1, h2 = coeffs[shift:shift + 3]
+        conditions[name] = (h0, h1, h2, sp.expand(4 * h0 * h2 - h1 ** 2))
+    return conditions
+
+
+def _factor_source(expr, indent=8, width=79):
+    # The factor list, one (factor, multiplicity) per line, each wrapped at
+    # the spaces between terms and aligned inside its parenthesis
+    coeff, factors = sp.factor_list(expr)
+    terms = [(sp.Integer(coeff), 1)] if coeff != 1 or not factors else []
+    terms += factors
+    inner = ' ' * (indent + 4)
+    lines = ['[']
+    for f, k in terms:
+        lines.extend(textwrap.wrap(f"({sp.sstr(f)}, {k}),", width,
+                                   initial_indent=inner,
+                                   subsequent_indent=inner + ' ',
+                                   break_long_words=False,
+                                   break_on_hyphens=False))
+    lines.append(' ' * indent + '],')
+    return '\n'.join(lines)
+
+
+def generate_source():
+    """Return the source of pynntt/regularity_conditions.py."""
+    args = ', '.join([f"a{k}" for k in range(4)] + [f"b{k}" for k in range(4)])
+    parts = [HEADER]
+    conditions = derive_conditions()
+    for name, quantities in conditions.items():
+        parts.append(f"def {name}({args}):\n    return (\n")
+        for label, expr in zip(('h0', 'h1', 'h2', 'disc'), quantities):
+            parts.append(f"        # {label}\n")
+            parts.append(f"        {_factor_source(expr)}\n")
+        parts.append("    )\n\n\n")
+    parts.append(f"TESTS = ({', '.join(conditions)})\n")
+    return ''.join(parts)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Generate the third-order regularity conditions used "
+                    "by pynntt.regularity.")
+    parser.add_argument("-o", "--output", type=str, default=str(OUTPUT),
+                        help="Path to write the generated module")
+    parser.add_argument("--check", action="store_true",
+                        help="Exit non-zero if the module at --output is "
+                             "out of date, without writing it")
+    args = parser.parse_args()
+
+    source = generate_source()
+    output = Path(args.output)
+    if args.check:
+        if not output.exists() or output.read_text() != source:
+            print(f"{output} is out of date; rerun without --check")
+            sys.exit(1)
+        print(f"{output} is up to date")
+        return
+    output.write_text(source)
+    print(f"Wrote {output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+import csv
+import argparse
+from pynntt.networks import parse_descriptor
+from pynntt.equivalence import EquivalenceIndex
+from pynntt.tools.evaluate_catalogue import iter_catalogue
+
+
+def group_catalogue(rows, confirm=False, points=2, seed=0):
+    """Group catalogue rows into impedance equivalence classes.
+
+    Returns the rows, each with 'class' (the id of the first row of its
+    class) and 'class_size', or with an 'error' if it does not parse.
+    """
+    index = EquivalenceIndex(points=points, seed=seed)
+    rows = list(rows)
+    by_id = {}
+    for row in rows:
+        try:
+            index.add(row['id'], parse_descriptor(row['desc']))
+        except Exception as e:
+            row['error'] = str(e)
+        by_id[row['id']] = row
+    for cls in index.classes(confirm=confirm):
+        for key in cls:
+            by_id[key]['class'] = cls[0]
+            by_id[key]['class_size'] = len(cls)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Group a descriptor CSV into classes of networks with "
+                    "the same impedance up to relabelling of components.")
+    parser.add_argument("input_csv", type=str,
+                        help="Path to input CSV with 'ID' and 'Desc' columns")
+    parser.add_argument("output_csv", type=str,
+                        help="Path to write the rows with their class")
+    parser.add_argument("--confirm", action="store_true",
+                        help="Confirm each class symbolically, splitting "
+                             "fingerprint groups that are not equivalent")
+    parser.add_argument("--points", type=int, default=2,
+                        help="Random evaluation points per fingerprint")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="Seed for the evaluation points")
+    args = parser.parse_args()
+
+    rows = group_catalogue(iter_catalogue(args.input_csv),
+                           confirm=args.confirm, points=args.points,
+                           seed=args.seed)
+    keys = ['id', 'desc', 'class', 'class_size', 'error']
+    with open(args.output_csv, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=keys)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow({k: row.get(k, '') for k in keys})
+    classes = {row['class'] for row in rows if 'class' in row}
+    shared = sum(1 for row in rows if row.get('class_size', 1) > 1)
+    print(f"Grouped {len(rows)} entries into {len(classes)} classes; "
+          f"{shared} entries share a class, written to {args.output_csv}")
+
+
+if __name__ == '__main__':
+    main()
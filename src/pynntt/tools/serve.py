@@ -0,0 +1,379 @@
+import argparse
+import asyncio
+import json
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from pynntt.networks import parse_descriptor, format_descriptor
+
+# A local evaluation service. Requests and responses are JSON objects, one
+# per line, over TCP or a Unix socket. Every request names an 'op':
+#
+#   ping                             -> {}
+#   stats                            -> server statistics
+#   parse       desc                 -> {'ast'}
+#   impedance   desc                 -> {'Z'}, from eval_impedance
+#   canonical   desc [engine]        -> {'Zcanon'}
+#   regularity  desc [engine]        -> {'regular', 'Zcanon'}
+#   evaluate    rows [include_ast, include_regular, engine, screen,
+#               timeout]             -> {'rows'}, as from evaluate_catalogue
+#   batch       requests             -> {'results'}, one response each
+#
+# Responses carry 'ok' and, when it is false, an 'error'. SymPy
+# expressions are sent as strings.
+
+# Longest request or response line, in bytes
+LINE_LIMIT = 1 << 26
+
+_worker_cache = None
+
+
+def _init_worker(cache_size):
+    """Import the evaluation stack and create the worker's subtree cache,
+    so that the first request a worker serves is not slowed by either."""
+    global _worker_cache
+    from pynntt.cache import ImpedanceCache
+    import pynntt.polyring  # noqa: F401
+    import pynntt.regularity  # noqa: F401
+    import pynntt.screening  # noqa: F401
+    _worker_cache = ImpedanceCache(cache_size) if cache_size else None
+
+
+def _ready():
+    """Return once a worker has been initialised."""
+
+
+def _work(kind, desc, options):
+    """Evaluate one descriptor in a worker, returning a JSON-ready dict.
+
+    kind 'impedance' gives the uncanonicalised impedance; kind 'row' the
+    fields of evaluate_row for the options, with its 'ast' and with any
+    failure as an 'error'.
+    """
+    from pynntt.tools.evaluate_catalogue import evaluate_row, time_limit
+    if kind == 'impedance':
+        from pynntt.networks import eval_impedance
+        with time_limit(options.get('timeout')):
+            ast = parse_descriptor(desc)
+            if _worker_cache is not None:
+                from pynntt.cache import eval_impedance_cached
+                return {'Z': str(eval_impedance_cached(ast, _worker_cache))}
+            return {'Z': str(eval_impedance(ast))}
+    row = evaluate_row({'desc': desc}, include_ast=True,
+                       include_regular=options.get('include_regular', False),
+                       engine=options.get('engine', 'sympy'),
+                       cache=_worker_cache, timeout=options.get('timeout'),
+                       screen=options.get('screen', 0))
+    del row['desc']
+    if 'Zcanon' in row:
+        row['Zcanon'] = str(row['Zcanon'])
+    return row
+
+
+def _result_key(kind, desc, options):
+    """The result-cache key of a job: its kind, the normalised descriptor
+    and the options that change its result."""
+    try:
+        desc = format_descriptor(parse_descriptor(desc))
+    except ValueError:
+        desc = desc.strip()
+    if kind == 'impedance':
+        return (kind, desc)
+    return (kind, desc, options.get('engine', 'sympy'),
+            bool(options.get('include_regular')), options.get('screen', 0))
+
+
+class EvaluationServer:
+    """Evaluation service with a warm worker pool and result caches.
+
+    jobs worker processes evaluate requests (with jobs=0, one thread of
+    the server process does, and per-row timeouts are not enforced); each
+    keeps a subtree ImpedanceCache of cache_size entries. Results are kept
+    in an LRU cache of result_cache_size entries keyed by normalised
+    descriptor, and identical requests in flight share one evaluation.
+
+    At most max_pending evaluations are queued for the pool. Further
+    requests wait, and since a connection's next line is only read once
+    its current request is answered, clients are slowed down in turn.
+    Batches of more than max_batch requests or rows are refused.
+    """
+
+    def __init__(self, jobs=1, cache_size=4096, result_cache_size=65536,
+                 max_pending=None, max_batch=4096, timeout=None):
+        self.jobs = jobs
+        self.cache_size = cache_size
+        self.result_cache_size = result_cache_size
+        self.max_pending = max_pending or 4 * max(1, jobs)
+        self.max_batch = max_batch
+        self.timeout = timeout
+        self.address = None
+        self.requests = 0
+        self.hits = 0
+        self.misses = 0
+        self._results = OrderedDict()
+        self._inflight = {}
+        self._pending = 0
+        self._slots = None
+        self._pool = None
+        self._server = None
+
+    async def start(self, host='127.0.0.1', port=0, path=None):
+        """Start the worker pool and listen on host:port, or on the Unix
+        socket at path. Port 0 picks a free port; the address actually
+        used is kept as 'host:port' or 'unix:path' in self.address."""
+        if self.jobs > 0:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.jobs, initializer=_init_worker,
+                initargs=(self.cache_size,))
+        else:
+            self._pool = ThreadPoolExecutor(
+                max_workers=1, initializer=_init_worker,
+                initargs=(self.cache_size,))
+        # Start the workers now rather than on the first requests
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self._pool, _ready)
+                               for _ in range(max(1, self.jobs))))
+        self._slots = asyncio.Semaphore(self.max_pending)
+        if path is not None:
+            self._server = await asyncio.start_unix_server(
+                self._handle_connection, path=path, limit=LINE_LIMIT)
+            self.address = f"unix:{path}"
+        else:
+            self._server = await asyncio.start_server(
+                self._handle_connection, host, port, limit=LINE_LIMIT)
+            port = self._server.sockets[0].getsockname()[1]
+            self.address = f"{host}:{port}"
+
+    async def serve_forever(self):
+        await self._server.serve_forever()
+
+    async def close(self):
+        """Stop listening and shut the worker pool down."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+
+    def stats(self):
+        return {'requests': self.requests, 'hits': self.hits,
+                'misses': self.misses, 'cached': len(self._results),
+                'pending': self._pending, 'jobs': self.jobs}
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                except ValueError as e:
+                    response = {'ok': False, 'error': f"Invalid JSON: {e}"}
+                else:
+                    response = await self.handle(request)
+                writer.write(json.dumps(response).encode() + b'\n')
+                await writer.drain()
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def handle(self, request, nested=False):
+        """Answer one request object, never raising."""
+        self.requests += 1
+        try:
+            if not isinstance(request, dict):
+                raise ValueError("Request must be a JSON object")
+            op = request.get('op')
+            if op == 'batch' and not nested:
+                requests = request.get('requests', [])
+                self._check_batch(requests)
+                results = await asyncio.gather(
+                    *(self.handle(r, nested=True) for r in requests))
+                return {'ok': True, 'results': list(results)}
+            return {'ok': True, **await self._dispatch(op, request)}
+        except Exception as e:
+            return {'ok': False, 'error': str(e)}
+
+    def _check_batch(self, items):
+        if not isinstance(items, list):
+            raise ValueError("Batch must be a list")
+        if len(items) > self.max_batch:
+            raise ValueError(f"Batch of {len(items)} exceeds the limit of "
+                             f"{self.max_batch}")
+
+    async def _dispatch(self, op, request):
+        if op == 'ping':
+            return {}
+        if op == 'stats':
+            return self.stats()
+        if op == 'evaluate':
+            rows = request.get('rows', [])
+            self._check_batch(rows)
+            options = {k: request[k] for k in
+                       ('include_regular', 'engine', 'screen', 'timeout')
+                       if k in request}
+            include_ast = request.get('include_ast', False)
+            results = await asyncio.gather(
+                *(self._row(row, options, include_ast) for row in rows))
+            return {'rows': list(results)}
+
+        desc = request.get('desc')
+        if not isinstance(desc, str):
+            raise ValueError("Request needs a 'desc' string")
+        if op == 'parse':
+            return {'ast': str(parse_descriptor(desc))}
+        if op == 'impedance':
+            return await self._evaluate('impedance', desc, {})
+        if op in ('canonical', 'regularity'):
+            options = {'engine': request.get('engine', 'sympy'),
+                       'include_regular': op == 'regularity'}
+            result = await self._evaluate('row', desc, options)
+            if 'error' in result:
+                raise ValueError(result['error'])
+            if op == 'canonical':
+                return {'Zcanon': result['Zcanon']}
+            return {'regular': result['regular'], 'Zcanon': result['Zcanon']}
+        raise ValueError(f"Unknown op: {op}")
+
+    async def _row(self, row, options, include_ast):
+        result = await self._evaluate('row', row['desc'], options)
+        result = {**row, **result}
+        if not include_ast:
+            result.pop('ast', None)
+        return result
+
+    async def _evaluate(self, kind, desc, options):
+        """Evaluate a job through the result cache, sharing evaluations
+        that are already in flight."""
+        if self.timeout is not None and 'timeout' not in options:
+            options = {**options, 'timeout': self.timeout}
+        key = _result_key(kind, desc, options)
+        result = self._results.get(key)
+        if result is not None:
+            self._results.move_to_end(key)
+            self.hits += 1
+            return result
+        future = self._inflight.get(key)
+        if future is not None:
+            self.hits += 1
+            return await asyncio.shield(future)
+
+        self.misses += 1
+        future = asyncio.ensure_future(self._submit(kind, desc, options))
+        self._inflight[key] = future
+        try:
+            result = await asyncio.shield(future)
+        finally:
+            del self._inflight[key]
+        if result.get('error') != 'timeout':
+            self._store(key, result)
+            if kind == 'row' and key[3] and 'Zcanon' in result:
+                # A regularity result also answers the plain request
+                plain = {k: v for k, v in result.items() if k != 'regular'}
+                self._store(key[:3] + (False,) + key[4:], plain)
+        return result
+
+    def _store(self, key, result):
+        self._results[key] = result
+        self._results.move_to_end(key)
+        if len(self._results) > self.result_cache_size:
+            self._results.popitem(last=False)
+
+    async def _submit(self, kind, desc, options):
+        self._pending += 1
+        try:
+            async with self._slots:
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(self._pool, _work, kind,
+                                                  desc, options)
+        finally:
+            self._pending -= 1
+
+
+@contextmanager
+def serve_in_thread(host='127.0.0.1', port=0, path=None, **options):
+    """Run an EvaluationServer on an event loop in a background thread,
+    yielding it once it is listening; its address is server.address."""
+    server = EvaluationServer(**options)
+    loop = asyncio.new_event_loop()
+    started = threading.Event()
+    failure = []
+
+    def run():
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_until_complete(server.start(host, port, path))
+        except Exception as e:
+            failure.append(e)
+            started.set()
+            return
+        started.set()
+        loop.run_forever()
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    started.wait()
+    if failure:
+        raise failure[0]
+    try:
+        yield server
+    finally:
+        asyncio.run_coroutine_threadsafe(server.close(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Serve parse, impedance, canonical form and regularity "
+                    "requests from a warm worker pool, for "
+                    "pynntt.tools.evaluate_remote and other local clients.")
+    parser.add_argument("--host", type=str, default='127.0.0.1',
+                        help="Address to listen on")
+    parser.add_argument("--port", type=int, default=8765,
+                        help="TCP port to listen on (0 picks a free one)")
+    parser.add_argument("--unix", type=str, default=None,
+                        help="Listen on this Unix socket path instead of TCP")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="Number of worker processes (0 evaluates in a "
+                             "thread of the server)")
+    parser.add_argument("--cache-size", type=int, default=4096,
+                        help="Subtree impedance cache entries per worker (0 "
+                             "disables)")
+    parser.add_argument("--result-cache-size", type=int, default=65536,
+                        help="Results kept in the server's LRU cache")
+    parser.add_argument("--max-pending", type=int, default=None,
+                        help="Evaluations queued for the pool before "
+                             "requests wait (default 4 per worker)")
+    parser.add_argument("--max-batch", type=int, default=4096,
+                        help="Largest batch of requests or rows accepted")
+    parser.add_argument("--timeout", type=float, default=None,
+                        help="Wall-clock budget per evaluation in seconds")
+    args = parser.parse_args()
+
+    async def serve():
+        server = EvaluationServer(jobs=args.jobs, cache_size=args.cache_size,
+                                  result_cache_size=args.result_cache_size,
+                                  max_pending=args.max_pending,
+                                  max_batch=args.max_batch,
+                                  timeout=args.timeout)
+        await server.start(args.host, args.port, args.unix)
+        print(f"Serving on {server.address} with {args.jobs} worker(s)",
+              flush=True)
+        try:
+            await server.serve_forever()
+        finally:
+            await server.close()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,366 @@
+"""
+twoport.py — Two-port cascades as products of ABCD matrices
+
+A two-port descriptor is a cascade `b1:b2:...` of blocks, each a series
+arm `[&x]`, a shunt arm `[/x]`, a Tee `T<l,m,r>` (series l, shunt m,
+series r) or a Pi `P<l,m,r>` (shunt l, series m, shunt r). An arm is a
+one-port descriptor, or `O` (open circuit) or `S` (short circuit).
+
+Every arm is one section with a 2x2 chain (ABCD) matrix: a series
+impedance z gives [[1, z], [0, 1]] and a shunt one [[1, 0], [1/z, 1]].
+The cascade's matrix is the product of its sections, taken as a balanced
+tree so that the factors of each product are of similar size. Port 2 is
+left open, so the driving-point impedance at port 1 is A/C; a load x is
+attached by ending the cascade with `[/x]`. Components are numbered left
+to right across the arms, as in `eval_impedance`.
+
+Matrix entries may be SymPy expressions, polynomial ring elements or NumPy
+arrays over a batch of frequencies and component values. The structural
+constants 0 and 1 are kept as ints, so products with them cost nothing
+and an input that is open whatever the component values is detected
+exactly. `eval_impedance` instead folds the sections back from port 2 as
+series and parallel combinations (`fold_impedance`), which `canonical_form`
+expands far faster than a quotient of matrix entries. This module imports
+neither SymPy nor NumPy until a function that needs them is called.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Callable
+from pynntt.networks import ELEMENTS, TERMINALS, TWOPORT_OPS
+
+if TYPE_CHECKING:
+    import numpy as np
+    import sympy as sp
+
+Matrix = tuple[tuple[Any, Any], tuple[Any, Any]]
+
+IDENTITY: Matrix = ((1, 0), (0, 1))
+
+
+def is_twoport(expr: Any) -> bool:
+    """
+    Checks if a network descriptor (AST) is a two-port cascade or block.
+    """
+    return isinstance(expr, tuple) and bool(expr) and expr[0] in TWOPORT_OPS
+
+
+def twoport_sections(expr: Any) -> list[tuple[str, Any]]:
+    """
+    Lists the sections of a two-port descriptor (AST) from port 1 to
+    port 2, as ('&', arm) for a series arm or ('/', arm) for a shunt arm.
+
+    Raises:
+        ValueError: If an unrecognized structure is encountered.
+    """
+    sections = []
+    stack = [expr]
+    while stack:
+        e = stack.pop()
+        op = e[0] if isinstance(e, tuple) and e else None
+        if op == ':' and len(e) == 3:
+            stack.extend(reversed(e[1:]))
+        elif op == 'T' and len(e) == 4:
+            sections.extend([('&', e[1]), ('/', e[2]), ('&', e[3])])
+        elif op == 'P' and len(e) == 4:
+            sections.extend([('/', e[1]), ('&', e[2]), ('/', e[3])])
+        elif op in ('[&]', '[/]') and len(e) == 2:
+            sections.append((op[1], e[1]))
+        else:
+            raise ValueError(f"Unrecognized structure: {e}")
+    return sections
+
+
+def _is_terminal(x: Any, terminal: str) -> bool:
+    return isinstance(x, str) and x == terminal
+
+
+def _is_zero(x: Any) -> bool:
+    return isinstance(x, int) and x == 0
+
+
+def _mul(x: Any, y: Any) -> Any:
+    if _is_zero(x) or _is_zero(y):
+        return 0
+    if isinstance(x, int) and x == 1:
+        return y
+    if isinstance(y, int) and y == 1:
+        return x
+    return x * y
+
+
+def _add(x: Any, y: Any) -> Any:
+    if _is_zero(x):
+        return y
+    if _is_zero(y):
+        return x
+    return x + y
+
+
+def multiply(m1: Matrix, m2: Matrix) -> Matrix:
+    """
+    Multiplies two 2x2 matrices, skipping products with a constant 0 or 1.
+    """
+    (a1, b1), (c1, d1) = m1
+    (a2, b2), (c2, d2) = m2
+    return ((_add(_mul(a1, a2), _mul(b1, c2)),
+             _add(_mul(a1, b2), _mul(b1, d2))),
+            (_add(_mul(c1, a2), _mul(d1, c2)),
+             _add(_mul(c1, b2), _mul(d1, d2))))
+
+
+def chain_product(matrices: list[Matrix]) -> Matrix:
+    """
+    Multiplies a chain of 2x2 matrices in order, pairing neighbours level
+    by level as a balanced tree.
+    """
+    if not matrices:
+        return IDENTITY
+    while len(matrices) > 1:
+        paired = [multiply(matrices[i], matrices[i + 1])
+                  for i in range(0, len(matrices) - 1, 2)]
+        if len(matrices) % 2:
+            paired.append(matrices[-1])
+        matrices = paired
+    return matrices[0]
+
+
+def section_matrix(kind: str, z: Any) -> Matrix:
+    """
+    The ABCD matrix of a series ('&') or shunt ('/') arm of impedance z,
+    which may also be 'O' or 'S'.
+    """
+    if kind == '&':
+        if isinstance(z, str):
+            # 'O' is the limit of [[1, z], [0, 1]] / z
+            return ((0, 1), (0, 0)) if z == 'O' else IDENTITY
+        return ((1, z), (0, 1))
+    if isinstance(z, str):
+        # 'S' is the limit of [[1, 0], [1/z, 1]] * z
+        return IDENTITY if z == 'O' else ((0, 0), (1, 0))
+    return ((1, 0), (1 / z, 1))
+
+
+def projective_section_matrix(kind: str, z: Any) -> Matrix:
+    """
+    A multiple of the ABCD matrix of a series ('&') or shunt ('/') arm,
+    free of division, for an impedance given as a (numerator, denominator)
+    pair; 'O' and 'S' stand for (1, 0) and (0, 1).
+
+    A common factor of the entries leaves every impedance computed from the
+    matrix unchanged.
+    """
+    num, den = z if not isinstance(z, str) else (1, 0) if z == 'O' else (0, 1)
+    if kind == '&':
+        return ((den, num), (0, den))
+    return ((num, 0), (den, num))
+
+
+def chain_matrix(expr: Any, evaluate: Callable[[Any], Any],
+                 section: Callable[[str, Any], Matrix] = section_matrix
+                 ) -> Matrix:
+    """
+    Evaluates the ABCD matrix of a two-port descriptor (AST).
+
+    Args:
+        expr: The two-port descriptor (AST).
+        evaluate: Called on each one-port arm, from port 1 to port 2, to
+            give the value passed to section.
+        section: Builds a section's matrix from its kind and its arm's
+            value, or 'O' or 'S'.
+
+    Raises:
+        ValueError: If an unrecognized structure is encountered.
+    """
+    return chain_product([
+        section(kind, arm if arm in TERMINALS else evaluate(arm))
+        for kind, arm in twoport_sections(expr)])
+
+
+def input_impedance(matrix: Matrix, load: Any = None) -> Any:
+    """
+    The impedance at port 1 of a two-port, open at port 2 or terminated
+    by the load impedance.
+
+    Raises:
+        ValueError: If the input is an open circuit whatever the
+            component values.
+    """
+    (a, b), (c, d) = matrix
+    if load is not None:
+        a, c = _add(_mul(a, load), b), _add(_mul(c, load), d)
+    if _is_zero(c):
+        raise ValueError("Two-port input is an open circuit")
+    return 0 if _is_zero(a) else a / c
+
+
+def fold_impedance(expr: Any, evaluate: Callable[[Any], Any],
+                   series: Callable[[Any, Any], Any],
+                   parallel: Callable[[Any, Any], Any]) -> Any:
+    """
+    Evaluates the impedance at port 1 of a two-port descriptor (AST) with
+    port 2 open, folding its sections back from port 2 as a ladder of
+    series and parallel combinations.
+
+    This gives the same impedance as `input_impedance(chain_matrix(...))`,
+    but as nested combinations of the arms like those of a one-port.
+
+    Args:
+        expr: The two-port descriptor (AST).
+        evaluate: Called on each one-port arm, from port 1 to port 2.
+        series: Combines two impedances in series.
+        parallel: Combines two impedances in parallel.
+
+    Raises:
+        ValueError: If an unrecognized structure is encountered, or the
+            input is an open circuit whatever the component values.
+    """
+    sections = [(kind, arm if arm in TERMINALS else evaluate(arm))
+                for kind, arm in twoport_sections(expr)]
+    z: Any = 'O'
+    for kind, arm in reversed(sections):
+        # An open circuit absorbs anything in series with it and is
+        # neutral in parallel; a short circuit the other way round
+        absorbing, neutral = ('O', 'S') if kind == '&' else ('S', 'O')
+        if _is_terminal(arm, absorbing) or _is_terminal(z, absorbing):
+            z = absorbing
+        elif _is_terminal(z, neutral):
+            z = arm
+        elif not _is_terminal(arm, neutral):
+            z = series(arm, z) if kind == '&' else parallel(arm, z)
+    if _is_terminal(z, 'O'):
+        raise ValueError("Two-port input is an open circuit")
+    return 0 if _is_terminal(z, 'S') else z
+
+
+def abcd_matrix(expr: Any) -> sp.Matrix:
+    """
+    Evaluates the symbolic ABCD matrix of a two-port descriptor (AST), with
+    components numbered as by `eval_impedance`.
+
+    Raises:
+        ValueError: If an unrecognized structure is encountered.
+    """
+    import sympy as sp
+    from pynntt.networks import _impedance_evaluator
+    return sp.Matrix(chain_matrix(expr, _impedance_evaluator()))
+
+
+def _arm_columns(expr: Any) -> list[tuple[Any, list[int]]]:
+    # Each one-port arm with the indices of its components' columns in
+    # the component-value array of the whole two-port
+    from pynntt.numeric import component_names
+    names = {n: i for i, n in enumerate(component_names(expr))}
+    counter = {label: 0 for label in ELEMENTS}
+    arms = []
+    for _, arm in twoport_sections(expr):
+        if arm in TERMINALS:
+            continue
+        columns: list[int] = []
+        arm_names = component_names(arm)
+        for label in ELEMENTS:
+            count = sum(1 for n in arm_names if n[0] == label)
+            columns.extend(names[f"{label}{counter[label] + i}"]
+                           for i in range(1, count + 1))
+            counter[label] += count
+        arms.append((arm, columns))
+    return arms
+
+
+def compile_chain(expr: Any) -> Callable[[Any, Any], Matrix]:
+    """
+    Compiles a two-port descriptor (AST) into a function giving its ABCD
+    matrix entries over a batch, as `chain(omega, values)`.
+
+    Each arm is compiled with `pynntt.numeric.compile_impedance`; omega
+    and values are as for its kernels, with columns following
+    `component_names(expr)`. Entries are complex arrays of the kernels'
+    output shape, or the ints 0 and 1. The arm kernels are kept in the
+    function's `kernels` attribute.
+
+    Raises:
+        ValueError: If an unrecognized structure is encountered.
+    """
+    import numpy as np
+    from pynntt.numeric import compile_impedance
+    arms = [(compile_impedance(arm), np.array(columns, dtype=int))
+            for arm, columns in _arm_columns(expr)]
+
+    def chain(omega: Any, values: Any) -> Matrix:
+        values = np.asarray(values, dtype=float)
+        compiled = iter(arms)
+
+        def evaluate(arm: Any) -> np.ndarray:
+            kernel, columns = next(compiled)
+            return kernel(omega, values[..., columns])
+
+        return chain_matrix(expr, evaluate)
+
+    setattr(chain, 'kernels', [kernel for kernel, _ in arms])
+    return chain
+
+
+def _output_shape(omega: np.ndarray, values: np.ndarray) -> tuple[int, ...]:
+    return omega.shape if values.ndim == 1 else \
+        (values.shape[0],) + omega.shape
+
+
+def compile_abcd(expr: Any) -> Callable[[Any, Any], np.ndarray]:
+    """
+    Compiles a two-port descriptor (AST) into a vectorised NumPy kernel
+    giving its ABCD matrices.
+
+    The kernel is called as `kernel(omega, values)`, like the kernels of
+    `pynntt.numeric`, and returns a complex array of their output shape
+    followed by [2, 2].
+
+    Raises:
+        ValueError: If an unrecognized structure is encountered.
+    """
+    import numpy as np
+    from pynntt.numeric import component_names
+    chain = compile_chain(expr)
+
+    def kernel(omega: Any, values: Any) -> np.ndarray:
+        omega = np.asarray(omega, dtype=float)
+        values = np.asarray(values, dtype=float)
+        out = np.empty(_output_shape(omega, values) + (2, 2), dtype=complex)
+        for i, row in enumerate(chain(omega, values)):
+            for j, entry in enumerate(row):
+                out[..., i, j] = entry
+        return out
+
+    setattr(kernel, 'components', component_names(expr))
+    return kernel
+
+
+def compile_twoport_impedance(expr: Any) -> Callable[[Any, Any], np.ndarray]:
+    """
+    Compiles a two-port descriptor (AST) into a vectorised NumPy kernel of
+    its impedance at port 1 with port 2 open.
+
+    The kernel has the interface of those from
+    `pynntt.numeric.compile_impedance`; its `source` attribute holds the
+    generated code of the arm kernels.
+
+    Raises:
+        ValueError: If an unrecognized structure is encountered, or the
+            input is an open circuit whatever the component values.
+    """
+    import numpy as np
+    from pynntt.numeric import component_names
+    # Any nonzero arm impedance shows which entries are structurally zero
+    input_impedance(chain_matrix(expr, lambda arm: 1))
+    chain = compile_chain(expr)
+
+    def kernel(omega: Any, values: Any) -> np.ndarray:
+        omega = np.asarray(omega, dtype=float)
+        values = np.asarray(values, dtype=float)
+        out = np.empty(_output_shape(omega, values), dtype=complex)
+        out[...] = input_impedance(chain(omega, values))
+        return out
+
+    setattr(kernel, 'components', component_names(expr))
+    setattr(kernel, 'source',
+            '\n'.join(k.source for k in getattr(chain, 'kernels')))
+    return kernel
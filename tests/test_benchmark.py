@@ -0,0 +1,54 @@
+import json
+from pynntt.tools import benchmark as bm
+
+def test_synthetic_descriptors_are_reproducible():
+    first = list(bm.synthetic_descriptors([3, 5], 2, seed=1))
+    assert first == list(bm.synthetic_descriptors([3, 5], 2, seed=1))
+    assert [n for n, _ in first] == [3, 3, 5, 5]
+    assert all(sum(desc.count(c) for c in 'RLC') == n for n, desc in first)
+
+def test_time_row_records_stages_and_errors():
+    times = bm.time_row("R+(L|C)", stages=['parse', 'canonical_form'])
+    assert set(times) == {'parse', 'canonical_form'}
+    assert all(isinstance(t, float) for t in times.values())
+    assert bm.time_row("R+", stages=['parse', 'canonical_form']) == {'parse': 'error'}
+
+def test_time_row_skips_stages_that_do_not_apply():
+    # A third-order impedance has no biquadratic test to time
+    stages = ['parse', 'biquadratic']
+    assert set(bm.time_row("R+(L|C)", stages=stages)) == {'parse', 'biquadratic'}
+    assert set(bm.time_row("(R+L+(R|C))|(R+C)", stages=stages)) == {'parse'}
+    rows = [bm.time_row("(R+L+(R|C))|(R+C)", stages=stages)]
+    assert set(bm.summarise(rows, stages)) == {'parse'}
+
+def test_benchmark_results_are_json(tmp_path):
+    path = tmp_path / 'tiny.csv'
+    path.write_text("ID,Desc\n1,R+L\n2,R|C\n")
+    results = bm.run_benchmark([path], sizes=(2, 4), per_size=2, stages=['parse', 'eval_impedance'], startup_repeat=0)
+    assert set(results['suites']) == {'tiny', 'synthetic'}
+    assert results['suites']['tiny']['parse']['rows'] == 2
+    assert [p['size'] for p in results['scaling']['eval_impedance']] == [2, 4]
+    assert json.loads(json.dumps(results)) == results
+
+def test_compare_results_flags_regressions():
+    def results(total, timeouts=0, errors=0):
+        return {'suites': {'MS': {'parse': {'total': total, 'timeouts': timeouts, 'errors': errors}}}}
+    assert bm.compare_results(results(1.2), results(1.0), threshold=0.25) == []
+    assert bm.compare_results(results(1.3), results(1.0), threshold=0.25) == [('MS', 'parse', 1.0, 1.3)]
+    # Below the noise floor, and stages missing from the baseline, are ignored
+    assert bm.compare_results(results(0.003), results(0.001)) == []
+    assert bm.compare_results(results(1.0), {'suites': {}}) == []
+    assert bm.compare_results(results(1.0, timeouts=1), results(1.0)) == [('MS', 'parse', 1.0, 1.0)]
+    assert bm.compare_results(results(1.0, errors=1), results(1.0)) == [('MS', 'parse', 1.0, 1.0)]
+    assert bm.compare_results(results(1.0), results(1.0, errors=1)) == []
+
+def test_compare_results_flags_sympy_at_startup():
+    def results(sympy):
+        return {'suites': {}, 'startup': {'parse': {'median': 0.03, 'sympy': sympy}}}
+    assert bm.compare_results(results(False), results(False)) == []
+    assert bm.compare_results(results(True), results(False)) == [('startup', 'parse', 0.03, 0.03)]
+
+def test_sympy_free_startup_paths():
+    startup = bm.measure_startup({name: bm.STARTUP_SNIPPETS[name] for name in bm.SYMPY_FREE}, repeat=1)
+    assert set(startup) == set(bm.SYMPY_FREE)
+    assert not any(st['sympy'] for st in startup.values())
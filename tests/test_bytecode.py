@@ -0,0 +1,74 @@
+import pytest
+from pynntt.networks import parse_descriptor
+from pynntt.enumeration import enumerate_networks
+from pynntt.bytecode import encode_ast, decode_ast, write_library, NetworkLibrary, OP_R, OP_L, OP_C, OP_SERIES, OP_PARALLEL, OP_BRIDGE
+
+def test_encode_is_postfix_one_byte_per_opcode():
+    assert encode_ast(parse_descriptor("R+(L|C)")) == bytes([OP_R, OP_L, OP_C, OP_PARALLEL, OP_SERIES])
+    assert encode_ast(parse_descriptor("<(R&L)@(C&R)/L>")) == bytes([OP_R, OP_L, OP_C, OP_R, OP_L, OP_BRIDGE])
+
+def test_round_trip_enumerated_networks():
+    for ast, _ in enumerate_networks(6, bridges=True):
+        assert decode_ast(encode_ast(ast)) == ast
+
+def test_round_trip_deep_network():
+    code = encode_ast(parse_descriptor("+".join("RLC" * 10000)))
+    assert len(code) == 2 * 30000 - 1
+    assert encode_ast(decode_ast(code)) == code
+
+@pytest.mark.parametrize("code, message", [
+    (bytes([OP_R, OP_SERIES]), "operator underflow"),
+    (bytes([OP_R, OP_L]), "expected a single network"),
+    (bytes([OP_R, 99]), "unknown opcode 99"),
+])
+def test_malformed_bytecode(code, message):
+    with pytest.raises(ValueError, match=message):
+        decode_ast(code)
+
+def test_unrecognized_structure():
+    with pytest.raises(ValueError, match=r"Unrecognized structure"):
+        encode_ast(('X', 'Y'))
+
+def test_library_round_trip(tmp_path):
+    asts = [ast for ast, _ in enumerate_networks(5, bridges=True)]
+    path = tmp_path / 'networks.lib'
+    assert write_library(path, iter(asts)) == len(asts)
+    with NetworkLibrary(path) as library:
+        assert len(library) == len(asts)
+        assert library[0] == asts[0]
+        assert library[-1] == asts[-1]
+        assert list(library) == asts
+        codes = [bytes(code) for code in library.iter_codes()]
+        assert codes == [encode_ast(ast) for ast in asts]
+        with pytest.raises(IndexError):
+            library.code(len(asts))
+
+def test_close_releases_held_codes(tmp_path):
+    path = tmp_path / 'networks.lib'
+    write_library(path, [('+', 'R', 'L'), ('|', 'R', 'C')])
+    with NetworkLibrary(path) as library:
+        code = library.code(0)
+        codes = list(library.iter_codes())
+        copy = bytes(code)
+    assert library._map.closed and library._file.closed
+    assert copy == encode_ast(('+', 'R', 'L'))
+    with pytest.raises(ValueError):
+        bytes(code)
+    with pytest.raises(ValueError):
+        bytes(codes[1])
+
+def test_empty_library(tmp_path):
+    path = tmp_path / 'empty.lib'
+    assert write_library(path, []) == 0
+    with NetworkLibrary(path) as library:
+        assert len(library) == 0
+        assert list(library.iter_codes()) == []
+
+def test_not_a_library(tmp_path):
+    path = tmp_path / 'bad.lib'
+    path.write_bytes(b'not a library at all, honestly')
+    with pytest.raises(ValueError, match=r"Not a network library"):
+        NetworkLibrary(path)
+    (tmp_path / 'zero.lib').write_bytes(b'')
+    with pytest.raises(ValueError, match=r"Not a network library"):
+        NetworkLibrary(tmp_path / 'zero.lib')
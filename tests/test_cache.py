@@ -0,0 +1,56 @@
+import pytest
+from pathlib import Path
+from pynntt.networks import parse_descriptor, eval_impedance, DescriptorError
+from pynntt.cache import ImpedanceCache, eval_impedance_cached
+from pynntt.tools.evaluate_catalogue import load_catalogue
+
+CATALOGUES = Path(__file__).resolve().parent.parent / 'catalogues'
+
+@pytest.mark.parametrize("catalogue", ['2012--JS-network-descriptors.csv', '2019--MS-network-descriptors.csv'])
+def test_matches_eval_impedance_on_catalogue(catalogue):
+    cache = ImpedanceCache()
+    for row in load_catalogue(CATALOGUES / catalogue):
+        try:
+            ast = parse_descriptor(row['desc'])
+        except DescriptorError:
+            continue  # malformed rows of the catalogue
+        assert eval_impedance_cached(ast, cache) == eval_impedance(ast), row['id']
+    assert cache.hits > 0
+
+def test_hit_renumbers_symbols():
+    cache = ImpedanceCache()
+    eval_impedance_cached(parse_descriptor("(R+C)|(R+L)"), cache)
+    # L+R and the reordered parallel subtree both hit entries stored above
+    ast = parse_descriptor("L+R+((R+L)|(R+C))")
+    assert eval_impedance_cached(ast, cache) == eval_impedance(ast)
+    assert cache.stats()["hits"] == 2
+
+def test_lru_eviction_and_stats():
+    cache = ImpedanceCache(maxsize=2)
+    for desc in ["R+L", "R|L", "R+C"]:
+        eval_impedance_cached(parse_descriptor(desc), cache)
+    assert len(cache) == 2
+    eval_impedance_cached(parse_descriptor("L+R"), cache)
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['size']) == (0, 4, 2)
+    cache.clear()
+    assert cache.stats()['misses'] == 0
+
+def test_invalid_size():
+    with pytest.raises(ValueError, match=r"Cache size must be at least 1"):
+        ImpedanceCache(0)
+
+@pytest.mark.parametrize("desc", ["P<C,R|L,C>", "[&R+L]:[/R+L]", "T<R+L,C|R,S>:[/R]", "[&<(R&L)@(C&R)/L>]:[/C]"])
+def test_two_ports_fold_through_the_cache(desc):
+    cache = ImpedanceCache()
+    ast = parse_descriptor(desc)
+    assert eval_impedance_cached(ast, cache) == eval_impedance(ast)
+    assert eval_impedance_cached(ast, cache) == eval_impedance(ast)
+    assert cache.hits > 0
+
+def test_catalogue_with_cache_evaluates_two_ports():
+    from pynntt.tools.evaluate_catalogue import evaluate_catalogue
+    rows = [{'id': 't', 'desc': "T<R,L,R>:[/C]"}, {'id': 'x', 'desc': "[&R]"}]
+    results = evaluate_catalogue(rows, include_regular=True, cache=ImpedanceCache(16))
+    assert results == evaluate_catalogue(rows, include_regular=True)
+    assert results[0]['regular'] is True
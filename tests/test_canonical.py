@@ -0,0 +1,62 @@
+import pytest
+from pynntt.networks import parse_descriptor
+from pynntt.canonical import canonical_ast, canonical_descriptor, canonical_leaf_order, canonical_leaf_orders, structural_hash, unique_networks
+from pynntt.enumeration import enumerate_networks
+
+equivalent_pairs = [
+    ("R+(L|C)", "(C|L)+R"),
+    ("R+L+C", "C+(L+R)"),
+    ("(R|L)|(C|R)", "R|(R|(L|C))"),
+    ("<(L&R)@(C&R)/L>", "<(C&R)@(L&R)/L>"),
+    ("<(L&R)@(C&R)/L>", "<(R&L)@(R&C)/L>"),
+    ("<(L&R)@(C&R)/(R+C)>", "<(R&C)@(R&L)/(C+R)>"),
+]
+
+@pytest.mark.parametrize("a, b", equivalent_pairs)
+def test_equivalent_descriptors(a, b):
+    ast_a, ast_b = parse_descriptor(a), parse_descriptor(b)
+    assert canonical_ast(ast_a) == canonical_ast(ast_b)
+    assert structural_hash(ast_a) == structural_hash(ast_b)
+    assert structural_hash(ast_a, 128) == structural_hash(ast_b, 128)
+
+@pytest.mark.parametrize("a, b", [("R+(L|C)", "L+(R|C)"), ("(R+L)|C", "R+(L|C)"), ("<(L&R)@(C&R)/L>", "<(C&R)@(R&L)/L>")])
+def test_distinct_descriptors(a, b):
+    assert structural_hash(parse_descriptor(a)) != structural_hash(parse_descriptor(b))
+
+def test_canonical_descriptor():
+    assert canonical_descriptor(parse_descriptor("(L+R)|C|(R|C)")) == "C|C|(L+R)|R"
+
+def test_hash_is_stable():
+    assert structural_hash("R") == structural_hash(parse_descriptor("R"))
+    assert 0 <= structural_hash(parse_descriptor("R+L")) < 2**64
+    assert 0 <= structural_hash(parse_descriptor("R+L"), 128) < 2**128
+
+def test_enumerated_networks_are_canonical():
+    for ast, desc in enumerate_networks(6, bridges=True):
+        assert canonical_ast(ast) == ast
+        assert canonical_descriptor(ast) == desc
+
+def test_unique_networks():
+    asts = [parse_descriptor(d) for d in ["R+L", "L+R", "R|L", "(R+L)", "L|R"]]
+    assert list(unique_networks(asts)) == [('+', 'R', 'L'), ('|', 'R', 'L')]
+
+def _subtrees(e):
+    if isinstance(e, tuple):
+        yield e
+        children = (e[1][1], e[1][2], e[2][1], e[2][2], e[3]) if e[0] == '/' else e[1:]
+        for child in children:
+            yield from _subtrees(child)
+
+@pytest.mark.parametrize("desc", ["R+(L|C)+(R|C|L)", "((R+L)|(C+R))+R+(L|(R+C))", "<(L&R+C)@(C|R&R)/(R+L)>+L", "R|<(R&L)@(C&R)/(L|(R+C|L))>|C"])
+def test_leaf_orders_built_from_children(desc):
+    ast = parse_descriptor(desc)
+    leaf_order = canonical_leaf_orders()
+    # Root first, so every subtree below is answered from the memo
+    for e in _subtrees(ast):
+        assert leaf_order(e) == canonical_leaf_order(e)
+
+def test_errors():
+    with pytest.raises(ValueError, match=r"Unrecognized structure"):
+        canonical_ast(('X', 'Y'))
+    with pytest.raises(ValueError, match=r"Unsupported hash width"):
+        structural_hash('R', bits=32)
@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+from pathlib import Path
+from pynntt.networks import parse_descriptor, format_descriptor
+from pynntt.numeric import eval_impedance_numeric, component_names
+from pynntt.tools.evaluate_catalogue import load_catalogue
+from pynntt import duality as du
+
+CATALOGUES = Path(__file__).resolve().parent.parent / 'catalogues'
+
+networks = ["(R+L+(R|C))|(R+C)", "<(R&L)@(C&(R+L))/(R|C)>", "<(L&R)@(C&C)/L>"]
+
+def unit_impedance(ast, omega):
+    # With every value 1, inverting the values changes nothing
+    return eval_impedance_numeric(ast, omega, np.ones(len(component_names(ast))))
+
+@pytest.mark.parametrize("desc", networks)
+def test_transforms_match_impedance_relations(desc):
+    ast = parse_descriptor(desc)
+    omega = np.array([0.3, 1.7, 5.0])
+    Z = unit_impedance(ast, omega)
+    # Z(1/jω) is the conjugate of Z(j/ω)
+    Zinv = unit_impedance(ast, 1 / omega).conj()
+    assert np.allclose(unit_impedance(du.dual_ast(ast), omega), 1 / Z)
+    assert np.allclose(unit_impedance(du.inverse_ast(ast), omega), Zinv)
+    assert np.allclose(unit_impedance(du.dual_inverse_ast(ast), omega), 1 / Zinv)
+
+@pytest.mark.parametrize("desc", networks)
+def test_transforms_are_involutions(desc):
+    ast = parse_descriptor(desc)
+    for transform in (du.dual_ast, du.inverse_ast, du.dual_inverse_ast):
+        assert transform(transform(ast)) == ast
+    assert du.dual_ast(du.inverse_ast(ast)) == du.dual_inverse_ast(ast)
+
+def test_js_orbits():
+    # js1a-js1d are the dual, inverse and dual-inverse of each other
+    rows = {row['id']: parse_descriptor(row['desc']) for row in load_catalogue(CATALOGUES / '2012--JS-network-descriptors.csv')}
+    assert format_descriptor(du.dual_ast(rows['js1a'])) == "(R|C|(R+L))+(R|L)"
+    keys = {name: du.orbit_key(ast) for name, ast in rows.items()}
+    assert len({keys[f'js1{x}'] for x in 'abcd'}) == 1
+    assert len({keys[f'js{n}a'] for n in '1234'}) == 4
+
+def test_orbit_verdicts_count_reuse():
+    orbits = du.OrbitVerdicts()
+    assert orbits.get('k') is None
+    orbits.put('k', True)
+    assert orbits.get('k') is True and 'k' in orbits
+    assert orbits.stats() == {'orbits': 1, 'tested': 1, 'reused': 1, 'saved': 0.5}
+
+def test_unrecognized_structure():
+    with pytest.raises(ValueError):
+        du.dual_ast(('?', 'R', 'L'))
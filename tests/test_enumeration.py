@@ -0,0 +1,52 @@
+import pytest
+from pynntt.networks import parse_descriptor, format_descriptor
+from pynntt.enumeration import enumerate_networks, enumerate_descriptors
+
+def count(n, max_reactive=None, bridges=False):
+    return sum(1 for _ in enumerate_networks(n, max_reactive, bridges, min_elements=n))
+
+def test_resistor_only_counts_match_series_parallel_sequence():
+    # OEIS A000084: series-parallel networks with n identical edges
+    assert [count(n, 0) for n in range(1, 9)] == [1, 2, 4, 10, 24, 66, 180, 522]
+
+def test_single_bridge_of_five_resistors():
+    assert count(5, 0, bridges=True) == count(5, 0) + 1
+
+def flatten(t):
+    # Brute-force canonical key: flatten associative chains and sort operands
+    if isinstance(t, str):
+        return t
+    op, parts = t[0], []
+    def collect(x):
+        if isinstance(x, tuple) and x[0] == op:
+            collect(x[1])
+            collect(x[2])
+        else:
+            parts.append(flatten(x))
+    collect(t)
+    return (op, tuple(sorted(map(repr, parts))))
+
+def all_trees(n):
+    if n == 1:
+        yield from 'RLC'
+        return
+    for i in range(1, n):
+        for a in all_trees(i):
+            for b in all_trees(n - i):
+                yield ('+', a, b)
+                yield ('|', a, b)
+
+@pytest.mark.parametrize("n", [1, 2, 3, 4])
+def test_matches_brute_force_deduplication(n):
+    generated = [flatten(ast) for ast, _ in enumerate_networks(n, min_elements=n)]
+    assert len(generated) == len(set(generated))
+    assert set(generated) == {flatten(t) for t in all_trees(n)}
+
+def test_descriptors_round_trip():
+    for ast, desc in enumerate_networks(6, bridges=True):
+        assert format_descriptor(ast) == desc
+        assert parse_descriptor(desc) == ast
+
+def test_max_reactive_limit():
+    for desc in enumerate_descriptors(5, max_reactive=1, bridges=True):
+        assert desc.count('L') + desc.count('C') <= 1
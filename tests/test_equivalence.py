@@ -0,0 +1,69 @@
+import pytest
+from pathlib import Path
+from pynntt.networks import parse_descriptor, DescriptorError
+from pynntt.tools.evaluate_catalogue import load_catalogue
+from pynntt.tools.group_equivalent import group_catalogue
+from pynntt import equivalence as eq
+
+CATALOGUES = Path(__file__).resolve().parent.parent / 'catalogues'
+
+# Pairs realising the same impedance up to relabelling, with different
+# symbol numbering or structure
+equivalent_pairs = [
+    ("R+(L|C)", "(C|L)+R"),
+    ("(R+L)|(R+C)", "(C+R)|(L+R)"),
+    ("R+(R|L)", "(L|R)+R"),
+    ("<(R&L)@(C&R)/(R+C)>", "<(R&C)@(L&R)/(C+R)>"),
+]
+
+inequivalent_pairs = [
+    ("R+(L|C)", "R|(L+C)"),
+    ("R+L", "R+C"),
+    ("R+R", "R"),
+    ("(R+L)|(R+C)", "(R|L)+(R|C)"),
+]
+
+@pytest.mark.parametrize("a, b", equivalent_pairs)
+def test_equivalent_networks(a, b):
+    a, b = parse_descriptor(a), parse_descriptor(b)
+    assert eq.impedance_fingerprint(a) == eq.impedance_fingerprint(b)
+    assert eq.find_relabelling(a, b) is not None
+    assert eq.are_equivalent(a, b)
+
+@pytest.mark.parametrize("a, b", inequivalent_pairs)
+def test_inequivalent_networks(a, b):
+    a, b = parse_descriptor(a), parse_descriptor(b)
+    assert eq.impedance_fingerprint(a) != eq.impedance_fingerprint(b)
+    assert not eq.are_equivalent(a, b)
+
+def test_relabelling_maps_symbols():
+    mapping = eq.find_relabelling(parse_descriptor("(R+L)|(R+C)"), parse_descriptor("(C+R)|(L+R)"))
+    assert mapping == {'R1': 'R2', 'L1': 'L1', 'R2': 'R1', 'C1': 'C1'}
+
+def test_fingerprint_depends_on_seed():
+    ast = parse_descriptor("R+(L|C)")
+    assert eq.impedance_fingerprint(ast, seed=0) != eq.impedance_fingerprint(ast, seed=1)
+    with pytest.raises(ValueError):
+        eq.impedance_fingerprint(ast, bits=32)
+
+def test_index_groups_catalogue():
+    asts = {}
+    for row in load_catalogue(CATALOGUES / '2019--MS-network-descriptors.csv'):
+        try:
+            asts[row['id']] = parse_descriptor(row['desc'])
+        except DescriptorError:
+            continue  # malformed rows of the catalogue
+    index = eq.EquivalenceIndex()
+    index.update(asts.items())
+    assert len(index) == len(asts)
+    groups = index.groups()
+    assert sum(map(len, groups)) == len(asts)
+    assert sorted(map(sorted, index.classes(confirm=True))) == sorted(map(sorted, groups))
+
+def test_group_catalogue_marks_classes():
+    rows = [{'id': '1', 'desc': 'R+(L|C)'}, {'id': '2', 'desc': '(C|L)+R'},
+            {'id': '3', 'desc': 'R|L'}, {'id': '4', 'desc': 'R+'}]
+    grouped = group_catalogue(rows, confirm=True)
+    assert [r.get('class') for r in grouped] == ['1', '1', '3', None]
+    assert grouped[1]['class_size'] == 2
+    assert 'error' in grouped[3]
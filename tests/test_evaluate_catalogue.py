@@ -0,0 +1,123 @@
+import time
+import pytest
+from pathlib import Path
+from pynntt import regularity
+from pynntt.duality import OrbitVerdicts
+from pynntt.tools import evaluate_catalogue as ec
+
+CATALOGUES = Path(__file__).resolve().parent.parent / 'catalogues'
+
+def test_parallel_matches_serial_in_input_order():
+    rows = ec.load_catalogue(CATALOGUES / '2012--JS-network-descriptors.csv')
+    serial = ec.evaluate_catalogue(rows, include_ast=True)
+    parallel = ec.evaluate_catalogue(rows, include_ast=True, jobs=2, chunksize=3)
+    assert [r['id'] for r in parallel] == [r['id'] for r in rows]
+    assert parallel == serial
+
+def test_row_errors_are_recorded():
+    rows = [{'id': '1', 'desc': 'R+'}, {'id': '2', 'desc': 'R'}]
+    results = ec.evaluate_catalogue(rows)
+    assert 'error' in results[0]
+    assert 'error' not in results[1]
+
+def test_timeout_is_recorded(monkeypatch):
+    def stalls(Z):
+        # Mimics the broad exception fallbacks in the regularity tests
+        try:
+            while True:
+                time.sleep(0.01)
+        except Exception:
+            return False
+    monkeypatch.setattr(regularity, 'is_necessarily_regular', stalls)
+    rows = [{'id': '1', 'desc': 'R+L'}]
+    results = ec.evaluate_catalogue(rows, include_regular=True, timeout=0.1)
+    assert results == [{'id': '1', 'desc': 'R+L', 'error': 'timeout'}]
+
+def test_unknown_engine():
+    with pytest.raises(ValueError, match=r"Unknown engine"):
+        ec.evaluate_catalogue([], engine='numeric')
+
+def test_iter_evaluate_catalogue_reads_lazily():
+    pulled = []
+    def rows():
+        for i in range(10):
+            pulled.append(i)
+            yield {'id': str(i), 'desc': 'R+L'}
+    results = ec.iter_evaluate_catalogue(rows(), buffer_size=3)
+    first = next(results)
+    assert first['id'] == '0'
+    assert len(pulled) == 3
+    assert [r['id'] for r in results] == [str(i) for i in range(1, 10)]
+
+def test_streaming_pipeline_matches_list_api(tmp_path):
+    path = CATALOGUES / '2019--MS-network-descriptors.csv'
+    assert list(ec.iter_catalogue(path)) == ec.load_catalogue(path)
+    streamed = ec.iter_evaluate_catalogue(ec.iter_catalogue(path), buffer_size=10)
+    count = ec.save_results_csv(streamed, tmp_path / 'streamed.csv', flush_every=7)
+    ec.save_results_csv(ec.evaluate_catalogue(ec.load_catalogue(path)), tmp_path / 'listed.csv')
+    assert count == 108
+    assert (tmp_path / 'streamed.csv').read_text() == (tmp_path / 'listed.csv').read_text()
+
+def test_screen_refutes_before_exact_test(monkeypatch):
+    def exact(Z):
+        raise AssertionError("refuted rows must skip the exact test")
+    monkeypatch.setattr(regularity, 'is_necessarily_regular', exact)
+    rows = [{'id': '70', 'desc': '<(L&R)@(R&R)/C>'}]
+    results = ec.evaluate_catalogue(rows, include_regular=True, screen=64)
+    assert results[0]['regular'] is False
+    assert '@omega=' in results[0]['counterexample']
+
+def test_profile_records_stages_and_path():
+    rows = [{'id': '1', 'desc': 'R+(L|C)'}, {'id': '2', 'desc': 'R+'}]
+    results = ec.evaluate_catalogue(rows, include_regular=True, profile=True)
+    profile = results[0]['profile']
+    assert {'parse_descriptor', 'eval_impedance', 'canonical_form',
+            'is_necessarily_regular'} <= set(profile['stages'])
+    assert profile['regularity_path'] == ['root_isolation']
+    assert (profile['num_degree'], profile['den_degree']) == (2, 2)
+    assert profile['peak_memory'] > 0
+    assert 'error' in results[1] and 'profile' in results[1]
+    assert 'profile' not in ec.evaluate_catalogue(rows[:1])[0]
+
+def test_write_profiles_keeps_slowest(tmp_path):
+    rows = [{'id': str(i), 'desc': 'R', 'profile': {'total': float(i)}}
+            for i in range(5)]
+    slowest = []
+    with open(tmp_path / 'p.jsonl', 'w') as f:
+        assert list(ec.write_profiles(rows, f, slowest, top=2)) == rows
+    assert sorted(slowest, reverse=True) == [(4.0, '4', 'R'), (3.0, '3', 'R')]
+    assert len((tmp_path / 'p.jsonl').read_text().splitlines()) == 5
+
+def test_parse_only_writes_asts_and_errors(tmp_path):
+    rows = [{'id': '1', 'desc': 'R+(L|C)'}, {'id': '2', 'desc': 'R+'}]
+    parsed = list(ec.iter_parse_catalogue(rows))
+    assert parsed[0]['ast'] == "('+', 'R', ('|', 'L', 'C'))"
+    assert 'error' in parsed[1] and 'ast' not in parsed[1]
+    path = tmp_path / 'parsed.csv'
+    assert ec.save_results_csv(parsed, path, include_ast=True, include_zcanon=False) == 2
+    assert path.read_text().splitlines()[0] == 'id,desc,ast,error'
+
+def test_orbits_test_regularity_once_per_orbit(monkeypatch):
+    calls = []
+    def recording(Z):
+        calls.append(Z)
+        return True
+    monkeypatch.setattr(regularity, 'is_necessarily_regular', recording)
+    rows = ec.load_catalogue(CATALOGUES / '2012--JS-network-descriptors.csv')[:4]
+    orbits = OrbitVerdicts()
+    results = ec.evaluate_catalogue(rows, include_regular=True, orbits=orbits)
+    assert [r['regular'] for r in results] == [True] * 4
+    assert len(calls) == 1
+    assert orbits.stats()['reused'] == 3
+
+def test_orbits_parse_each_descriptor_once(monkeypatch):
+    calls = []
+    original = ec.parse_descriptor
+    def recording(desc):
+        calls.append(desc)
+        return original(desc)
+    monkeypatch.setattr(ec, 'parse_descriptor', recording)
+    rows = ec.load_catalogue(CATALOGUES / '2012--JS-network-descriptors.csv')[:4]
+    results = ec.evaluate_catalogue(rows, include_ast=True, include_regular=True, orbits=OrbitVerdicts())
+    assert sorted(calls) == sorted(row['desc'] for row in rows)
+    assert all('_ast' not in r and r['ast'].startswith('(') for r in results)
@@ -0,0 +1,61 @@
+import itertools
+import pytest
+from pathlib import Path
+import sympy as sp
+from pynntt.networks import parse_descriptor, eval_impedance, DescriptorError, s
+from pynntt.graph import (ast_edges, eval_graph_fraction, eval_graph_impedance, format_edge_list,
+                          parse_edge_list, spanning_tree_count)
+from pynntt.tools.evaluate_catalogue import load_catalogue
+
+CATALOGUES = Path(__file__).resolve().parent.parent / 'catalogues'
+
+R1, L1, C1 = sp.symbols('R1 L1 C1', positive=True)
+
+def test_parse_and_format_edge_list():
+    edges = parse_edge_list("0-2:R; 2 - 1 : L\n0-1:C")
+    assert edges == [(0, 2, 'R'), (2, 1, 'L'), (0, 1, 'C')]
+    assert parse_edge_list(format_edge_list(edges)) == edges
+
+def test_malformed_edge():
+    with pytest.raises(ValueError, match=r"Malformed edge"):
+        parse_edge_list("0-1:R, 1-2")
+
+def test_ast_edges_bridge():
+    assert ast_edges(parse_descriptor("<(R&L)@(C&R)/L>")) == [
+        (0, 2, 'R'), (2, 1, 'L'), (0, 3, 'C'), (3, 1, 'R'), (2, 3, 'L')]
+
+@pytest.mark.parametrize("method", ['trees', 'berkowitz'])
+def test_series_parallel(method):
+    Z = eval_graph_impedance(parse_edge_list("0-2:R, 2-1:L, 0-1:C"), method=method)
+    assert sp.cancel(Z - (R1 + L1 * s) / (C1 * L1 * s**2 + C1 * R1 * s + 1)) == 0
+
+def test_port_not_connected():
+    with pytest.raises(ValueError, match=r"not connected"):
+        eval_graph_fraction(parse_edge_list("0-2:R, 1-3:L"))
+    with pytest.raises(ValueError, match=r"must differ"):
+        eval_graph_fraction(parse_edge_list("0-1:R"), port=(0, 0))
+
+def test_dangling_edges_are_ignored():
+    Z = eval_graph_impedance(parse_edge_list("0-1:R, 1-2:L, 3-4:C, 2-2:C"))
+    assert Z == R1
+
+def test_spanning_tree_count():
+    complete = [(u, v, 'R') for u, v in itertools.combinations(range(5), 2)]
+    assert spanning_tree_count(complete) == 5 ** 3
+    assert spanning_tree_count([(0, 1, 'R'), (2, 3, 'R')]) == 0
+
+def test_methods_agree_on_complete_graph():
+    edges = [(u, v, 'RLC'[i % 3]) for i, (u, v) in enumerate(itertools.combinations(range(5), 2))]
+    trees = eval_graph_fraction(edges, port=(0, 3), method='trees')
+    berkowitz = eval_graph_fraction(edges, port=(0, 3), method='berkowitz')
+    assert trees == berkowitz
+
+@pytest.mark.parametrize("catalogue", ['2012--JS-network-descriptors.csv', '2019--MS-network-descriptors.csv'])
+def test_matches_eval_impedance_on_catalogue(catalogue):
+    for row in load_catalogue(CATALOGUES / catalogue):
+        try:
+            ast = parse_descriptor(row['desc'])
+        except DescriptorError:
+            continue  # malformed rows of the catalogue
+        Z = eval_graph_impedance(ast_edges(ast))
+        assert sp.cancel(Z - eval_impedance(ast)) == 0, row['id']
@@ -0,0 +1,32 @@
+import pytest
+from pynntt import hooks
+
+
+def test_emit_calls_subscribers_until_unsubscribed():
+    seen = []
+    callback = hooks.subscribe('test', lambda event, payload: seen.append((event, payload)))
+    hooks.emit('test', value=1)
+    hooks.unsubscribe('test', callback)
+    hooks.emit('test', value=2)
+    assert seen == [('test', {'value': 1})]
+
+
+def test_unsubscribe_unknown_callback():
+    with pytest.raises(ValueError):
+        hooks.unsubscribe('test', print)
+
+
+def test_stage_reports_wall_time_only_when_subscribed():
+    @hooks.stage
+    def double(x):
+        return 2 * x
+
+    seen = []
+    assert double(1) == 2
+    callback = hooks.subscribe('stage', lambda event, payload: seen.append(payload))
+    try:
+        assert double(2) == 4
+    finally:
+        hooks.unsubscribe('stage', callback)
+    assert [p['stage'] for p in seen] == ['double']
+    assert seen[0]['seconds'] >= 0
@@ -1,7 +1,7 @@
 import pytest
 from sympy import simplify
 import sympy as sp
-from pynntt.networks import parse_descriptor, eval_impedance, canonical_form, s
+from pynntt.networks import parse_descriptor, parse_many, DescriptorError, eval_impedance, canonical_form, format_descriptor, s
 
 def test_parse_simple_series():
     desc = "(R+L)"
@@ -83,10 +83,86 @@ def test_parse_descriptor_bridge_missing_greater_than():
         parse_descriptor("<(R&R)@(R&R)/C")
 
 def test_parse_descriptor_unexpected_token():
-    with pytest.raises(ValueError, match=r"Unexpected token: \)"):
+    with pytest.raises(ValueError, match=r"Unexpected token: \) at position 3"):
+        parse_descriptor("(R+)")
+
+def test_parse_descriptor_unexpected_character():
+    with pytest.raises(DescriptorError, match=r"Unexpected character 'X' at position 3") as info:
         parse_descriptor("(R+X)")
+    assert info.value.position == 3
+
+def test_parse_descriptor_unexpected_end():
+    with pytest.raises(DescriptorError, match=r"Unexpected end of descriptor at position 2"):
+        parse_descriptor("R+")
+
+@pytest.mark.parametrize("desc, token, position", [
+    ("R)", r"\)", 1),
+    ("RL", "L", 1),
+    ("R+L)C", r"\)", 3),
+    ("(R|C) +L)", r"\)", 8),
+    ("T<R,L,R>)", r"\)", 8),
+])
+def test_parse_descriptor_trailing_tokens(desc, token, position):
+    with pytest.raises(DescriptorError, match=rf"Unexpected token: {token} at position {position}") as info:
+        parse_descriptor(desc)
+    assert info.value.position == position
+
+def test_parse_descriptor_ignores_whitespace():
+    assert parse_descriptor(" (R + (L | C)) ") == ('+', 'R', ('|', 'L', 'C'))
+
+def test_parse_descriptor_deeply_nested():
+    depth = 50000
+    assert parse_descriptor("(" * depth + "R|C" + ")" * depth) == ('|', 'R', 'C')
+    ast = parse_descriptor("+".join("R" * depth))
+    for _ in range(depth - 1):
+        assert ast[0] == '+' and ast[2] == 'R'
+        ast = ast[1]
+    assert ast == 'R'
+
+def test_parse_many():
+    results = list(parse_many(["R", "R+", "L|C"]))
+    assert results[0] == 'R'
+    assert isinstance(results[1], DescriptorError)
+    assert (results[1].reason, results[1].position, results[1].descriptor) == ("Unexpected end of descriptor", 2, "R+")
+    assert results[2] == ('|', 'L', 'C')
 
 # New test case for eval_impedance error handling
 def test_eval_impedance_unrecognized_structure():
     with pytest.raises(ValueError, match=r"Unrecognized structure: \('X', 'Y'\)"):
-        eval_impedance(('X', 'Y'))
\ No newline at end of file
+        eval_impedance(('X', 'Y'))
+
+def test_parse_twoport():
+    assert parse_descriptor("T <R, L, R> : [/ C+R]") == (':', ('T', 'R', 'L', 'R'), ('[/]', ('+', 'C', 'R')))
+    assert parse_descriptor("[&R]:P<O,C,S>:[/L]") == (':', ('[&]', 'R'), (':', ('P', 'O', 'C', 'S'), ('[/]', 'L')))
+
+@pytest.mark.parametrize("desc, message", [
+    ("T<R,L>", r"Expected ',' after second arm of 'T' at position 5"),
+    ("P<R,L,C", r"Expected '>' after third arm of 'P' at position 7"),
+    ("[R]", r"Expected '&' or '/' after '\[' at position 1"),
+    ("[&R", r"Expected '\]' after arm at position 3"),
+    ("T<R,L,R>:C", r"Expected two-port block, got: C at position 9"),
+    ("R+O", r"Unexpected token: O at position 2"),
+])
+def test_parse_twoport_errors(desc, message):
+    with pytest.raises(DescriptorError, match=message):
+        parse_descriptor(desc)
+
+def test_eval_impedance_twoport():
+    R1, R2, L1, C1 = sp.symbols('R1 R2 L1 C1', positive=True)
+    Z = eval_impedance(parse_descriptor("T<R,L,R>:[/C]"))
+    assert sp.simplify(Z - (R1 + 1 / (1 / (L1 * s) + 1 / (R2 + 1 / (C1 * s))))) == 0
+    assert eval_impedance(parse_descriptor("P<O,R,L>")) == R1 + L1 * s
+    assert eval_impedance(parse_descriptor("[&R]:[/S]:[/C]")) == R1
+    with pytest.raises(ValueError, match=r"open circuit"):
+        eval_impedance(parse_descriptor("[&R]:[&O]"))
+
+@pytest.mark.parametrize("desc", ["R", "R+L+C", "(R+L)|C", "R+(L|C)", "R|(L+(R|C))", "<(L&R)@(C&R)/L>", "<(R+L&C)@(R&R)/L|C>+R",
+                                  "T<R,L,R>", "P<O,R+L,C>:[&S]:[/<(L&R)@(C&R)/L>]"])
+def test_format_descriptor_round_trip(desc):
+    ast = parse_descriptor(desc)
+    assert format_descriptor(ast) == desc
+    assert parse_descriptor(format_descriptor(ast)) == ast
+
+def test_format_descriptor_unrecognized_structure():
+    with pytest.raises(ValueError, match=r"Unrecognized structure: \('X', 'Y'\)"):
+        format_descriptor(('X', 'Y'))
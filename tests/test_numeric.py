@@ -0,0 +1,73 @@
+import pytest
+import numpy as np
+import sympy as sp
+from pynntt.networks import parse_descriptor, eval_impedance, s
+from pynntt.numeric import compile_impedance, compile_sensitivity, component_names, impedance_source, sensitivity_source, sweep_impedance
+
+def symbolic_reference(ast, omega, values):
+    Z = eval_impedance(ast)
+    syms = {str(sym): sym for sym in Z.free_symbols}
+    f = sp.lambdify([s] + [syms[n] for n in component_names(ast)], Z)
+    return np.array([[complex(f(1j * w, *row)) for w in omega] for row in values])
+
+def test_component_names_order():
+    assert component_names(parse_descriptor("C+(R|L)+R")) == ['R1', 'R2', 'L1', 'C1']
+
+@pytest.mark.parametrize("desc", ["R+L+C", "R|C|L", "(R+L)|(R+C)", "<(L&R)@(R&C)/(R|L)>", "R|(C+(R|(R+L)))"])
+def test_kernel_matches_eval_impedance(desc):
+    ast = parse_descriptor(desc)
+    kernel = compile_impedance(ast)
+    rng = np.random.default_rng(1)
+    omega = np.logspace(-2, 2, 9)
+    values = rng.uniform(0.5, 2.0, (4, len(kernel.components)))
+    Z = kernel(omega, values)
+    assert Z.shape == (4, 9)
+    np.testing.assert_allclose(Z, symbolic_reference(ast, omega, values), rtol=1e-12)
+    np.testing.assert_allclose(kernel(omega, values[0]), Z[0], rtol=1e-12)
+
+def test_resistive_kernel_broadcasts():
+    kernel = compile_impedance(parse_descriptor("R+R"))
+    Z = kernel(np.ones(5), np.array([[1.0, 2.0], [3.0, 4.0]]))
+    np.testing.assert_array_equal(Z, [[3.0] * 5, [7.0] * 5])
+
+def test_sweep_impedance_blocks():
+    kernel = compile_impedance(parse_descriptor("R|(L+C)"))
+    rng = np.random.default_rng(2)
+    omega = np.logspace(-1, 1, 50)
+    values = rng.uniform(0.5, 2.0, (37, 3))
+    np.testing.assert_array_equal(sweep_impedance(kernel, omega, values, block_size=200), kernel(omega, values))
+
+def test_unrecognized_structure():
+    with pytest.raises(ValueError, match=r"Unrecognized structure"):
+        compile_impedance(('X', 'Y'))
+
+def symbolic_jacobian(ast, omega, values):
+    Z = eval_impedance(ast)
+    syms = {str(sym): sym for sym in Z.free_symbols}
+    args = [s] + [syms[n] for n in component_names(ast)]
+    fs = [sp.lambdify(args, sp.diff(Z, syms[n])) for n in component_names(ast)]
+    return np.array([[[complex(f(1j * w, *row)) for f in fs] for w in omega] for row in values])
+
+@pytest.mark.parametrize("desc", ["R", "R+L+C", "R|C|L", "(R+L)|(R+C)", "<(L&R)@(R&C)/(R|L)>", "<(C&L)@(R&(L+R))/(C|R)>"])
+def test_sensitivity_matches_symbolic_derivatives(desc):
+    ast = parse_descriptor(desc)
+    kernel = compile_sensitivity(ast)
+    rng = np.random.default_rng(3)
+    omega = np.logspace(-2, 2, 7)
+    values = rng.uniform(0.5, 2.0, (3, len(kernel.components)))
+    Z, J = kernel(omega, values)
+    assert Z.shape == (3, 7) and J.shape == (3, 7, len(kernel.components))
+    np.testing.assert_allclose(Z, compile_impedance(ast)(omega, values), rtol=1e-12)
+    np.testing.assert_allclose(J, symbolic_jacobian(ast, omega, values), rtol=1e-10, atol=1e-12)
+    Z0, J0 = kernel(omega, values[0])
+    np.testing.assert_allclose(J0, J[0], rtol=1e-12)
+
+@pytest.mark.parametrize("desc", ["R+L+C", "<(C&L)@(R&(L+R))/(C|R)>"])
+def test_sensitivity_shares_forward_pass(desc):
+    ast = parse_descriptor(desc)
+    forward = impedance_source(ast, name='kernel').splitlines()[:-1]
+    assert sensitivity_source(ast, name='kernel').splitlines()[:len(forward)] == forward
+
+def test_sensitivity_rejects_two_ports():
+    with pytest.raises(ValueError, match="two-port"):
+        compile_sensitivity(parse_descriptor("[&R]:[/L]"))
@@ -0,0 +1,37 @@
+import pytest
+from pathlib import Path
+import sympy as sp
+from pynntt.networks import parse_descriptor, eval_impedance, canonical_form, DescriptorError, s
+from pynntt.polyring import eval_canonical_impedance, eval_impedance_fraction, impedance_symbols
+from pynntt.tools.evaluate_catalogue import load_catalogue
+
+CATALOGUES = Path(__file__).resolve().parent.parent / 'catalogues'
+
+R1, R2, L1, C1, C2 = sp.symbols('R1 R2 L1 C1 C2', positive=True)
+
+def test_impedance_symbols_order():
+    ast = parse_descriptor("C+(R|L)+R")
+    assert impedance_symbols(ast) == [R1, R2, L1, C1]
+
+def test_series_capacitors_cancel_s():
+    num, den = eval_impedance_fraction(parse_descriptor("C+C"))
+    assert num.as_expr() == C1 + C2
+    assert den.as_expr() == C1 * C2 * s
+
+def test_canonical_parallel():
+    Z = eval_canonical_impedance(parse_descriptor("R|C"))
+    assert Z == R1 / (C1 * R1 * s + 1)
+
+def test_unrecognized_structure():
+    with pytest.raises(ValueError, match=r"Unrecognized structure"):
+        eval_canonical_impedance(('X', 'Y'))
+
+@pytest.mark.parametrize("catalogue", ['2012--JS-network-descriptors.csv', '2019--MS-network-descriptors.csv'])
+def test_matches_canonical_form_on_catalogue(catalogue):
+    for row in load_catalogue(CATALOGUES / catalogue):
+        try:
+            ast = parse_descriptor(row['desc'])
+        except DescriptorError:
+            continue  # malformed rows of the catalogue
+        expected = canonical_form(eval_impedance(ast))
+        assert sp.cancel(eval_canonical_impedance(ast) - expected) == 0, row['id']
@@ -1,6 +1,15 @@
+import csv
+import random
 import pytest
 import sympy as sp
-from pynntt.regularity import is_necessarily_regular, is_necessarily_regular_biquadratic, is_necessarily_regular_by_definition_optimised, is_necessarily_regular_by_definition, s
+from pathlib import Path
+from pynntt import hooks, regularity, regularity_conditions
+from pynntt.networks import parse_descriptor, eval_impedance, DescriptorError
+from pynntt.polyring import eval_canonical_impedance
+from pynntt.regularity import is_hurwitz, is_positive_real, is_necessarily_regular, is_necessarily_regular_biquadratic, is_necessarily_regular_by_definition_optimised, is_necessarily_regular_by_definition, is_necessarily_regular_by_root_isolation, is_necessarily_regular_triquadratic, s
+from pynntt.tools.generate_regularity_conditions import derive_conditions
+
+CATALOGUES = Path(__file__).resolve().parent.parent / 'catalogues'
 
 R1, C1, L1 = sp.symbols('R1 C1 L1', positive=True)
 
@@ -8,8 +17,8 @@ regularity_test_cases = [
     # (Z_expr, expected_biquadratic_result, expected_optimised_result, expected_definition_result, comment)
 
     # Biquadratic tests
-    ((s**3 + 1) / (s**2 + 1),               False, True,  True,  "Not a biquadratic, (but regular by definition)"),
-    ((s**2 + s + 1) / (s**2 + s + 100),     False, True,  True,  "Biquadratic non-regular (sigma negative, not PR)"),
+    ((s**3 + 1) / (s**2 + 1),               False, False, False, "Not a biquadratic, not PR (j-axis poles with complex residues)"),
+    ((s**2 + s + 1) / (s**2 + s + 100),     False, False, False, "Biquadratic non-regular (sigma negative, not PR)"),
     ((s**2 + 2*s + 1) / (s**2 + 2*s + 1),   True,  True,  True,  "Biquadratic regular (K=0)"),
     ((s**2 + 2*s + 1) / (s**2 + s + 2),     True,  True,  True,  "Biquadratic regular (cond1 True)"),
     ((2*s**2 + s + 1) / (s**2 + 2*s + 1),   True,  True,  True,  "Biquadratic regular (cond2 True)"),
@@ -73,3 +82,203 @@ def test_regularity_functions(Z_expr, expected_biquadratic, expected_optimised,
         assert is_necessarily_regular(Z_expr) == expected_biquadratic, f"Top-level test failed for {comment}"
     elif expected_optimised is not None: # For non-biquadratic, it should behave like optimised
         assert is_necessarily_regular(Z_expr) == expected_optimised, f"Top-level test failed for {comment}"
+
+@pytest.mark.parametrize("Z_expr, expected_result, expected_optimised, expected_definition, comment", regularity_test_cases)
+def test_is_necessarily_regular_by_root_isolation(Z_expr, expected_result, expected_optimised, expected_definition, comment):
+    assert is_necessarily_regular_by_root_isolation(Z_expr) == expected_result, f"Root isolation test failed for {comment}"
+
+def test_root_isolation_undecided_symbolic():
+    # Re Z - min Re Z has coefficients of mixed sign in R1, R2, C1, L1
+    Z = eval_impedance(parse_descriptor("L|R+(R|C)"))
+    assert is_necessarily_regular_by_root_isolation(Z) is None
+
+@pytest.mark.parametrize("desc", ["<(L&R)@(R&R)/C>", "<(C&R)@(R&R)/L>", "L|R+(R|C)", "((C+L)|R)+(C|R)"])
+def test_undecided_symbolic_is_not_reported_regular(desc):
+    # Root isolation leaves these undecided; the fallback tests must see Z
+    # in its own s rather than as a constant, and not claim regularity
+    Z = eval_impedance(parse_descriptor(desc))
+    paths = []
+    callback = hooks.subscribe('regularity_path', lambda event, payload: paths.append(payload['path']))
+    try:
+        assert is_necessarily_regular(Z) is None
+    finally:
+        hooks.unsubscribe('regularity_path', callback)
+    assert 'root_isolation' in paths
+
+@pytest.mark.parametrize("desc", ["L|R+(R|C)", "(C|R)+(L|R)+C", "((C+R)|(L+R))"])
+def test_positive_real_test_runs_once(desc, monkeypatch):
+    # The sub-tests take the verdict computed once up front
+    calls = []
+    positive_real = regularity._positive_real
+    def counted(*polys):
+        calls.append(polys)
+        return positive_real(*polys)
+    monkeypatch.setattr('pynntt.regularity._positive_real', counted)
+    is_necessarily_regular(eval_impedance(parse_descriptor(desc)))
+    assert len(calls) <= 1
+
+def test_biquadratic_symbolic_coefficients():
+    Z = eval_impedance(parse_descriptor("<(L&R)@(R&R)/C>"))
+    assert is_necessarily_regular_biquadratic(Z) is None
+    # Uncancelled common factor
+    assert is_necessarily_regular_biquadratic((s + 1)**2 / ((s + 1) * (s + 2))) is True
+
+def _ms_rows():
+    path = CATALOGUES / '2019--MS-network-descriptors.csv'
+    with open(path, encoding='utf-8-sig') as f:
+        rows = list(csv.DictReader(f))
+    # Every non-regular row, and a spread of the regular ones, except
+    # malformed descriptors
+    rows = [r for r in rows if r['Rg/Nr'] == 'Nr' or int(r['ID']) % 9 == 0]
+    return [r for r in rows if not _malformed(r['Desc'])]
+
+def _malformed(desc):
+    try:
+        parse_descriptor(desc)
+    except DescriptorError:
+        return True
+    return False
+
+@pytest.mark.parametrize("row", _ms_rows(), ids=lambda r: r['ID'])
+def test_root_isolation_agrees_with_ms_catalogue(row):
+    Z = eval_impedance(parse_descriptor(row['Desc']))
+    # Symbolically, root isolation may leave a row undecided but must not
+    # contradict its label
+    symbolic = is_necessarily_regular_by_root_isolation(Z)
+    assert symbolic in (row['Rg/Nr'] == 'Rg', None)
+    if row['ID'] in ('70', '95'):
+        # Bridges whose Re Z - min Re Z has coefficients of mixed sign
+        assert symbolic is None
+    rng = random.Random(int(row['ID']))
+    verdicts = []
+    for _ in range(5 if row['Rg/Nr'] == 'Rg' else 20):
+        values = {x: sp.Rational(rng.randint(1, 20), rng.randint(1, 20))
+                  for x in sorted(Z.free_symbols, key=str) if x.name != 's'}
+        verdicts.append(is_necessarily_regular_by_root_isolation(Z.xreplace(values)))
+    assert None not in verdicts
+    if row['Rg/Nr'] == 'Rg':
+        assert all(verdicts)
+    else:
+        assert not all(verdicts)
+
+positive_real_test_cases = [
+    ((s**2 + 2*s + 1) / (s**2 + s + 2),     True,  "Biquadratic PR"),
+    (R1 + 1/(s*C1),                         True,  "Series RC"),
+    (s*L1 + 1/(s*C1),                       True,  "Series LC, j-axis zeros"),
+    ((s**2 + 1) / (s*(s**2 + 4)),           True,  "Foster form, interlaced poles and zeros"),
+    ((s**2 + 4) / (s*(s**2 + 1)),           False, "Not interlaced, negative residue at j"),
+    ((s + 1) / (s**2 + 1),                  False, "Complex residue at j"),
+    ((s - 1) / (s + 1),                     False, "Zero in the right half-plane"),
+    (1/(s - 1),                             False, "Pole in the right half-plane"),
+    (-s / (s**2 + 1),                       False, "Negative residues"),
+    (s**2 / (s + 1),                        False, "Double pole at infinity"),
+    ((s**2 + s + 1) / (s**2 + s + 100),     False, "Re Z(jw) negative near w = 50"),
+    (sp.sqrt(s),                            False, "Not rational"),
+]
+
+@pytest.mark.parametrize("Z_expr, expected_result, comment", positive_real_test_cases)
+def test_is_positive_real(Z_expr, expected_result, comment):
+    assert is_positive_real(Z_expr) == expected_result, f"PR test failed for {comment}"
+
+@pytest.mark.parametrize("coeffs, expected_result", [
+    ([1, 2, 3, 1], True),       # Routh: 1, 2, 5/2, 1
+    ([1, 1, 1, 5], False),      # Routh: 1, 1, -4, 5
+    ([1, 0, 4, 0], True),       # s(s^2 + 4), simple roots on the axis
+    ([1, 0, 2, 0, 1], False),   # (s^2 + 1)^2, repeated roots on the axis
+    ([1, 0, -1], False),        # s = 1
+    ([1, 0, 0], False),         # double root at zero
+])
+def test_is_hurwitz(coeffs, expected_result):
+    assert is_hurwitz(sp.Poly(coeffs, s)) == expected_result
+
+def test_is_hurwitz_symbolic():
+    assert is_hurwitz(sp.Poly(L1*C1*s**2 + R1*C1*s + 1, s)) is True
+    # Routh entry (R1*C1 - L1)/R1 has undetermined sign
+    assert is_hurwitz(sp.Poly(s**3 + R1*s**2 + C1*s + L1, s)) is None
+
+def test_is_hurwitz_other_domains():
+    # Algebraic (EX) and fraction-field (ZZ(R1)) coefficients
+    assert is_hurwitz(sp.Poly(s**2 + sp.sqrt(2)*s + 1, s)) is True
+    assert is_hurwitz(sp.Poly(s**2 - sp.sqrt(2)*s + 1, s)) is False
+    assert is_hurwitz(sp.Poly((s**2 + 1)*(s + sp.sqrt(2)), s)) is True
+    assert is_hurwitz(sp.Poly((s**2 + 1)*(s + 1/R1), s)) is True
+    # Routh entry 1/R1 - 1 has undetermined sign
+    assert is_hurwitz(sp.Poly(s**3 + s**2/R1 + s + 1, s)) is None
+
+def test_is_necessarily_regular_other_domains():
+    assert is_necessarily_regular(sp.sqrt(2)*s + 1) is True
+    assert is_necessarily_regular((s**2 + sp.sqrt(2)*s + 1) / (s**2 + s + 1)) is True
+    assert is_necessarily_regular((s + 1/R1) / (s + 1)) is True
+    # Regular only for R1 <= 1
+    assert is_necessarily_regular((s**2 + s/R1 + 1) / (s**2 + s + 1)) is None
+
+third_order_test_cases = [
+    ((36*s**3 + 81*s**2 + 13*s + 1) / (36*s**3 + 40*s**2 + 5*s + 1),     False, "Re Z dips just below its end values"),
+    ((576*s**3 + 96*s**2 + 28*s + 2) / (144*s**3 + 156*s**2 + 30*s + 1), False, "Re Y dips just below its value at infinity"),
+    ((36*s**3 + 81*s**2 + 30*s + 24) / (9*s**3 + 42*s**2 + 27*s + 4),    False, "Neither minimum at an end"),
+    ((s**3 + 2*s**2 + 2*s + 1) / (s**3 + s**2 + 2*s + 1),                False, "PR but neither minimum at an end"),
+    ((120*s**3 + 57*s**2 + 23*s + 5) / (30*s**3 + 43*s**2 + 14*s + 1),   True,  "((C+R)|L)+(C|R) at C1..R2 = 1..5"),
+    ((s**2 + 1) / (s**3 + 4*s),                                           True,  "Pole at zero"),
+    ((s**3 + s**2 + 2*s + 1) / (s**2 + s + 1),                            True,  "Pole at infinity"),
+    ((s**3 + 1) / (s**2 + 1),                                             False, "Not PR"),
+]
+
+@pytest.mark.parametrize("Z_expr, expected_result, comment", third_order_test_cases)
+def test_is_necessarily_regular_triquadratic(Z_expr, expected_result, comment):
+    assert is_necessarily_regular_triquadratic(Z_expr) == expected_result, f"Triquadratic test failed for {comment}"
+    assert is_necessarily_regular_by_root_isolation(Z_expr) == expected_result, f"Root isolation test failed for {comment}"
+    assert is_necessarily_regular(Z_expr) == expected_result, f"Top-level test failed for {comment}"
+
+@pytest.mark.parametrize("desc, expected_result", [
+    ("C+(C|L)", True),
+    ("(C+R)|(L+R)|C", True),
+    ("(C|(L+R))+L", True),
+    ("((C+L)|R)+(C|R)", None),
+])
+def test_triquadratic_symbolic(desc, expected_result):
+    Z = eval_canonical_impedance(parse_descriptor(desc))
+    assert is_necessarily_regular_triquadratic(Z) is expected_result
+    if expected_result is not None:
+        paths = []
+        callback = hooks.subscribe('regularity_path', lambda event, payload: paths.append(payload['path']))
+        try:
+            assert is_necessarily_regular(Z) is expected_result
+        finally:
+            hooks.unsubscribe('regularity_path', callback)
+        assert paths == ['triquadratic']
+
+@pytest.mark.parametrize("Z_expr", [
+    (120*s**3 + 57*s**2 + 23*s + 5) / (30*s**3 + 43*s**2 + 14*s + 1),
+    (s**3 + s**2 + 2*s + 1) / (s**2 + s + 1),
+    eval_canonical_impedance(parse_descriptor("(C+R)|(L+R)|C")),
+])
+def test_triquadratic_skips_pr_test_when_coefficients_show_pr(Z_expr, monkeypatch):
+    # Strictly Hurwitz D with positive end residues and Re Z(jω) >= 0 shown
+    # from the coefficients needs no separate positive-real test
+    def fail(*polys):
+        raise AssertionError("Full positive-real test was run")
+    monkeypatch.setattr('pynntt.regularity._positive_real', fail)
+    assert is_necessarily_regular_triquadratic(Z_expr) is True
+
+@pytest.mark.parametrize("desc", ["((C+L)|R)+(L|R)", "((C+L)|R)+(C|R)", "(C|R)+(L|R)+C"])
+def test_triquadratic_agrees_with_root_isolation(desc):
+    # Instances of third-order networks at random values, decided exactly
+    Z = eval_canonical_impedance(parse_descriptor(desc))
+    rng = random.Random(desc)
+    for _ in range(4):
+        values = {x: sp.Rational(rng.randint(1, 20), rng.randint(1, 20))
+                  for x in sorted(Z.free_symbols, key=str) if x.name != 's'}
+        Zn = Z.xreplace(values)
+        assert is_necessarily_regular_triquadratic(Zn) == is_necessarily_regular_by_root_isolation(Zn)
+
+def test_regularity_conditions_match_derivation():
+    # The shipped module is the generator's output, up to factor order
+    conditions = derive_conditions()
+    rng = random.Random(0)
+    names = sp.symbols('a0:4') + sp.symbols('b0:4')
+    for _ in range(3):
+        values = [rng.randint(-9, 9) for _ in names]
+        for test in regularity_conditions.TESTS:
+            got = [sp.Mul(*[f ** k for f, k in factors]) for factors in test(*values)]
+            want = [q.subs(dict(zip(names, values))) for q in conditions[test.__name__]]
+            assert got == want
@@ -0,0 +1,90 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+import pytest
+import sympy as sp
+from pynntt.networks import parse_descriptor, s
+from pynntt.tools import evaluate_catalogue as ec
+from pynntt import results as res
+
+rows = [{'id': '1', 'desc': 'R+(L|C)'}, {'id': '2', 'desc': 'R+'},
+        {'id': '3', 'desc': '(R+L)|(R+C)'}, {'id': '4', 'desc': '<(R&L)@(C&R)/(R+C)>'}]
+
+@pytest.fixture(scope='module')
+def evaluated():
+    return ec.evaluate_catalogue(rows, include_ast=True, include_regular=True, profile='timings')
+
+@pytest.mark.parametrize("suffix, fmt", [('.parquet', 'parquet'), ('.arrow', 'arrow'), ('.feather', 'arrow'), ('.csv', None)])
+def test_format_for_path(suffix, fmt):
+    assert res.format_for_path('results' + suffix) == fmt
+
+@pytest.mark.parametrize("suffix", ['.parquet', '.arrow'])
+def test_round_trip(evaluated, tmp_path, suffix):
+    path = tmp_path / ('results' + suffix)
+    assert res.save_results_columnar(evaluated, path, flush_every=2) == len(rows)
+    frame = res.load_results(path)
+    assert list(frame['id']) == ['1', '2', '3', '4']
+    for (_, row), want in zip(frame.iterrows(), evaluated):
+        if 'error' in want:
+            assert row['error'] == want['error']
+            assert row['num'] is None and res.row_ast(row) is None
+            continue
+        assert sp.cancel(res.impedance_expr(row) - want['Zcanon']) == 0
+        assert res.row_ast(row) == parse_descriptor(want['desc'])
+        # Undecided verdicts are stored as nulls
+        assert (None if row['regular'] is None else bool(row['regular'])) == want['regular']
+        assert row['time_total'] > 0
+        assert 'canonical_form' in dict(row['stage_times'])
+
+def test_impedance_columns_are_integer_coefficients():
+    columns = res.impedance_columns("(C1*L1*s**2 + 1) / (2*C1*s/3)")
+    assert columns['symbols'] == ['L1', 'C1']
+    assert columns['num'] == [{'power': 0, 'coeffs': [3], 'exponents': [[0, 0]]},
+                              {'power': 2, 'coeffs': [3], 'exponents': [[1, 1]]}]
+    assert columns['den'] == [{'power': 1, 'coeffs': [2], 'exponents': [[0, 1]]}]
+
+def test_evaluate_coefficients(evaluated, tmp_path):
+    res.save_results_columnar(evaluated, tmp_path / 'r.parquet')
+    row = res.load_results(tmp_path / 'r.parquet').iloc[2]
+    values = {name: 1.5 + i for i, name in enumerate(row['symbols'])}
+    num, den = res.evaluate_coefficients(row, values)
+    Z = res.impedance_expr(row).subs({sp.Symbol(k, positive=True): v for k, v in values.items()})
+    point = 0.7
+    assert float(Z.subs(s, point)) == pytest.approx(sum(c * point ** k for k, c in enumerate(num)) /
+                                                    sum(c * point ** k for k, c in enumerate(den)))
+
+def test_impedance_fraction_matches_ring_engine(evaluated, tmp_path):
+    from pynntt.polyring import eval_impedance_fraction
+    res.save_results_columnar(evaluated, tmp_path / 'r.arrow')
+    row = res.load_results(tmp_path / 'r.arrow').iloc[3]
+    num, den = res.impedance_fraction(row)
+    want_num, want_den = eval_impedance_fraction(parse_descriptor(row['desc']))
+    assert sp.cancel(num.as_expr() * want_den.as_expr() - den.as_expr() * want_num.as_expr()) == 0
+
+def test_timings_profile_skips_memory(evaluated):
+    profile = evaluated[0]['profile']
+    assert profile['total'] > 0 and 'stages' in profile
+    assert 'peak_memory' not in profile and 'count_ops' not in profile
+
+def test_load_results_does_not_import_sympy(evaluated, tmp_path):
+    path = tmp_path / 'r.parquet'
+    res.save_results_columnar(evaluated, path)
+    code = ("import sys; from pynntt.results import load_results, evaluate_coefficients\n"
+            f"frame = load_results({str(path)!r})\n"
+            "evaluate_coefficients(frame.iloc[0], {'R1': 1, 'L1': 1, 'C1': 1})\n"
+            "print('sympy' in sys.modules)")
+    env = {**os.environ, 'PYTHONPATH': str(Path(res.__file__).resolve().parent.parent)}
+    out = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True, env=env)
+    assert out.stdout.strip() == 'False'
+
+def test_parse_only_writes_the_selected_format(tmp_path, monkeypatch):
+    path = tmp_path / 'in.csv'
+    path.write_text("ID,Desc\n1,R+(L|C)\n2,R+\n")
+    out = tmp_path / 'parsed.out'
+    monkeypatch.setattr(sys, 'argv', ['evaluate_catalogue', str(path), str(out), '--parse-only', '--format', 'parquet'])
+    ec.main()
+    frame = res.load_results(out, fmt='parquet')
+    assert list(frame['ast'])[0] == "('+', 'R', ('|', 'L', 'C'))"
+    assert frame['ast'].isna().tolist() == [False, True]
+    assert frame['error'].isna().tolist() == [True, False]
@@ -0,0 +1,38 @@
+import csv
+import pytest
+from pathlib import Path
+from pynntt.networks import parse_descriptor, DescriptorError
+from pynntt.screening import screen_regularity, format_counterexample
+
+CATALOGUES = Path(__file__).resolve().parent.parent / 'catalogues'
+
+def _rows(name):
+    with open(CATALOGUES / name, encoding='utf-8-sig') as f:
+        return list(csv.DictReader(f))
+
+@pytest.mark.parametrize("name", ['2019--MS-network-descriptors.csv', '2012--JS-network-descriptors.csv'])
+def test_regular_networks_are_never_refuted(name):
+    for row in _rows(name):
+        if row['Rg/Nr'] != 'Rg':
+            continue
+        try:
+            ast = parse_descriptor(row['Desc'])
+        except DescriptorError:
+            continue  # malformed rows of the catalogue
+        assert screen_regularity(ast, seed=0) is None, row['ID']
+
+@pytest.mark.parametrize("desc", ["<(L&R)@(R&R)/C>", "<(C&R)@(R&R)/L>", "(R+L+(R|C))|(R+C)"])
+def test_non_regular_networks_are_refuted(desc):
+    counterexample = screen_regularity(parse_descriptor(desc), seed=0)
+    assert counterexample is not None
+    assert set(counterexample['values']) >= {'R1', 'R2'}
+    assert counterexample['omega'] > 0
+
+def test_seed_makes_screening_reproducible():
+    ast = parse_descriptor("<(L&R)@(R&R)/C>")
+    assert screen_regularity(ast, seed=3) == screen_regularity(ast, seed=3)
+
+def test_format_counterexample():
+    assert format_counterexample(None) == ''
+    text = format_counterexample({'values': {'R1': 2.0, 'C1': 0.5}, 'omega': 3.0})
+    assert text == "R1=2;C1=0.5@omega=3"
@@ -0,0 +1,81 @@
+import sys
+import pytest
+from pathlib import Path
+from pynntt.tools import evaluate_catalogue as ec
+from pynntt.tools.evaluate_remote import EvaluationClient, ServerError, iter_evaluate_remote
+from pynntt.tools.serve import serve_in_thread
+
+CATALOGUES = Path(__file__).resolve().parent.parent / 'catalogues'
+
+@pytest.fixture(scope='module')
+def server():
+    with serve_in_thread(jobs=0, max_batch=64) as server:
+        yield server
+
+def test_ops(server):
+    with EvaluationClient(server.address) as client:
+        client.ping()
+        assert client.parse("R+(L|C)") == "('+', 'R', ('|', 'L', 'C'))"
+        assert client.impedance("R+L") == "L1*s + R1"
+        assert client.canonical("R|C") == "R1/(C1*R1*s + 1)"
+        assert client.canonical("R|C", engine='ring') == "R1/(C1*R1*s + 1)"
+        assert client.regularity("R+(L|C)") is True
+
+def test_errors_keep_the_connection(server):
+    with EvaluationClient(server.address) as client:
+        with pytest.raises(ServerError, match=r"Unexpected end of descriptor"):
+            client.canonical("R+")
+        with pytest.raises(ServerError, match=r"Unexpected token: \) at position 1"):
+            client.parse("R)")
+        with pytest.raises(ServerError, match=r"Unknown op"):
+            client.request('frobnicate', desc='R')
+        with pytest.raises(ServerError, match=r"exceeds the limit of 64"):
+            client.evaluate([{'id': str(i), 'desc': 'R'} for i in range(65)])
+        client.ping()
+
+def test_batch(server):
+    with EvaluationClient(server.address) as client:
+        results = client.batch([{'op': 'parse', 'desc': 'R'}, {'op': 'canonical', 'desc': 'R+'},
+                                {'op': 'regularity', 'desc': 'R|(L+C)'}])
+    assert results[0] == {'ok': True, 'ast': 'R'}
+    assert results[1]['ok'] is False
+    assert results[2]['ok'] is True and results[2]['regular'] is True
+
+def test_two_ports(server):
+    rows = [{'id': 't', 'desc': "T<R,L,R>:[/C]"}, {'id': 'p', 'desc': "P<C,R|L,C>"}, {'id': 'x', 'desc': "[&R]"}]
+    expected = ec.evaluate_catalogue(rows, include_regular=True)
+    with EvaluationClient(server.address) as client:
+        assert client.canonical("T<R,L,R>:[/C]") == str(expected[0]['Zcanon'])
+        results = client.evaluate(rows, include_regular=True)
+    assert results[:2] == [{**want, 'Zcanon': str(want['Zcanon'])} for want in expected[:2]]
+    assert results[2]['error'] == "Two-port input is an open circuit"
+
+def test_results_are_cached_by_normalised_descriptor(server):
+    with EvaluationClient(server.address) as client:
+        client.regularity("((R+L))|C")
+        before = client.stats()
+        assert client.regularity("(R+L)|C") is True
+        assert client.canonical("(R+L) | C") == client.canonical("(R+L)|C")
+        after = client.stats()
+    assert after['hits'] == before['hits'] + 3
+    assert after['misses'] == before['misses']
+
+def test_matches_evaluate_catalogue(server):
+    rows = ec.load_catalogue(CATALOGUES / '2012--JS-network-descriptors.csv')
+    expected = ec.evaluate_catalogue(rows, include_ast=True, include_regular=True)
+    with EvaluationClient(server.address) as client:
+        remote = list(iter_evaluate_remote(client, rows, batch_size=5, include_ast=True, include_regular=True))
+    assert [r['id'] for r in remote] == [r['id'] for r in rows]
+    for got, want in zip(remote, expected):
+        assert got == {**want, 'Zcanon': str(want['Zcanon'])}
+
+@pytest.mark.skipif(sys.platform == 'win32', reason="Unix sockets")
+def test_worker_pool_on_unix_socket(tmp_path):
+    with serve_in_thread(path=str(tmp_path / 'pynntt.sock'), jobs=2, max_pending=2) as server:
+        assert server.address.startswith('unix:')
+        with EvaluationClient(server.address) as client:
+            rows = [{'id': str(i), 'desc': desc} for i, desc in enumerate(["R+L", "R|C", "<(R&L)@(C&R)/L>", "R+"] * 3)]
+            results = client.evaluate(rows, include_regular=True)
+            assert [r['id'] for r in results] == [r['id'] for r in rows]
+            assert 'error' in results[3] and 'regular' in results[2]
+            assert client.stats()['misses'] == 4
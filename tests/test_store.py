@@ -0,0 +1,76 @@
+import sqlite3
+import sympy as sp
+from pynntt.networks import parse_descriptor, eval_impedance, canonical_form
+from pynntt.store import ResultStore, normalise_descriptor
+from pynntt.tools import evaluate_catalogue as ec
+
+def test_normalise_descriptor():
+    assert normalise_descriptor(" (R + (L|C)) ") == "R+(L|C)"
+    assert normalise_descriptor("(L|C)+R") == "(L|C)+R"
+    assert normalise_descriptor("R+") == "R+"
+
+def test_round_trip(tmp_path):
+    Z = canonical_form(eval_impedance(parse_descriptor("R|C")))
+    with ResultStore(tmp_path / 'results.db') as store:
+        assert store.get("R|C") is None
+        store.put("R|C", Z, ('|', 'R', 'C'))
+        store.put("(R|C)", Z, ('|', 'R', 'C'), regular=True)
+        store.put("R|C", Z, ('|', 'R', 'C'))
+        assert len(store) == 1
+    with ResultStore(tmp_path / 'results.db') as store:
+        stored = store.get("(R|C)")
+        assert stored == {'Zcanon': Z, 'ast': "('|', 'R', 'C')", 'regular': True, 'counterexample': None}
+        assert store.get("R|C", engine='ring') is None
+    with ResultStore(tmp_path / 'results.db', version='0') as store:
+        assert store.get("R|C") is None
+
+def test_resumes_from_store(tmp_path, monkeypatch):
+    rows = [{'id': '1', 'desc': 'R+L'}, {'id': '2', 'desc': 'R|C'}, {'id': '3', 'desc': 'R+'}]
+    with ResultStore(tmp_path / 'results.db') as store:
+        first = ec.evaluate_catalogue(rows[:1], store=store)
+    assert 'ast' not in first[0]
+    evaluated = []
+    original = ec.evaluate_row
+    def recording(row, **options):
+        evaluated.append(row['id'])
+        return original(row, **options)
+    monkeypatch.setattr(ec, 'evaluate_row', recording)
+    with ResultStore(tmp_path / 'results.db') as store:
+        results = ec.evaluate_catalogue(rows, include_ast=True, store=store)
+        assert store.hits == 1
+    assert evaluated == ['2', '3']
+    assert [r['id'] for r in results] == ['1', '2', '3']
+    assert results[0]['Zcanon'] == sp.Symbol('L1', positive=True) * sp.Symbol('s') + sp.Symbol('R1', positive=True)
+    assert results[0]['ast'] == "('+', 'R', 'L')"
+    assert 'error' in results[2]
+
+def test_counterexample_kept_with_verdict(tmp_path):
+    Z = canonical_form(eval_impedance(parse_descriptor("R|C")))
+    with ResultStore(tmp_path / 'results.db') as store:
+        store.put("R|C", Z, ('|', 'R', 'C'), regular=False, counterexample='R1=1;C1=1@omega=1')
+        # A write without a verdict keeps the stored one and its counterexample
+        store.put("R|C", Z, ('|', 'R', 'C'))
+        assert store.get("R|C")['counterexample'] == 'R1=1;C1=1@omega=1'
+        store.put("R|C", Z, ('|', 'R', 'C'), regular=True)
+        assert store.get("R|C")['counterexample'] is None
+
+def test_store_hit_restores_counterexample(tmp_path):
+    rows = [{'id': '70', 'desc': '<(L&R)@(R&R)/C>'}]
+    with ResultStore(tmp_path / 'results.db') as store:
+        first = ec.evaluate_catalogue(rows, include_regular=True, screen=64, store=store)
+    with ResultStore(tmp_path / 'results.db') as store:
+        again = ec.evaluate_catalogue(rows, include_regular=True, screen=64, store=store)
+        assert store.hits == 1
+    assert again[0]['regular'] is False
+    assert again[0]['counterexample'] == first[0]['counterexample']
+
+def test_opens_store_without_counterexample_column(tmp_path):
+    path = tmp_path / 'results.db'
+    with sqlite3.connect(str(path)) as conn:
+        conn.execute("CREATE TABLE results (descriptor TEXT NOT NULL, engine TEXT NOT NULL, version TEXT NOT NULL, "
+                     "zcanon TEXT NOT NULL, ast TEXT NOT NULL, regular INTEGER, PRIMARY KEY (descriptor, engine, version))")
+    conn.close()
+    Z = canonical_form(eval_impedance(parse_descriptor("R|C")))
+    with ResultStore(path) as store:
+        store.put("R|C", Z, ('|', 'R', 'C'), regular=False, counterexample='R1=1;C1=1@omega=1')
+        assert store.get("R|C")['counterexample'] == 'R1=1;C1=1@omega=1'
@@ -0,0 +1,97 @@
+import time
+import pytest
+import sympy as sp
+from pathlib import Path
+from pynntt.networks import parse_descriptor, s
+from pynntt.enumeration import enumerate_networks
+from pynntt.polyring import eval_canonical_impedance
+from pynntt.tools.evaluate_catalogue import load_catalogue, iter_parse_catalogue
+from pynntt.tools.find_realisations import build_index
+from pynntt import synthesis as syn
+
+CATALOGUES = Path(__file__).resolve().parent.parent / 'catalogues'
+
+invariant_cases = [
+    ("R", ((0,), (0,)), 0, 0, 0, (1, 0, 0)),
+    ("R+(L|C)", ((0, 1, 2), (0, 2)), 2, 2, 2, (1, 1, 1)),
+    ("C+L", ((0, 2), (1,)), 2, 1, 2, (0, 1, 1)),
+    ("(R+L)|(R+C)", ((0, 1, 2), (0, 1, 2)), 2, 2, 2, (2, 1, 1)),
+]
+
+@pytest.mark.parametrize("desc, signature, num_degree, den_degree, mcmillan, counts", invariant_cases)
+def test_impedance_invariants(desc, signature, num_degree, den_degree, mcmillan, counts):
+    inv = syn.impedance_invariants(parse_descriptor(desc))
+    assert inv.signature == signature
+    assert (inv.num_degree, inv.den_degree, inv.mcmillan_degree) == (num_degree, den_degree, mcmillan)
+    assert inv.counts == counts
+
+def test_target_signature_divides_common_power_of_s():
+    assert syn.target_signature([0, 1, 0, 1], [0, 0, 1]) == ((0, 2), (1,))
+    assert syn.target_signature([2, 3, 1], [1, 1, 1, 0]) == ((0, 1, 2), (0, 1, 2))
+    with pytest.raises(ValueError):
+        syn.target_signature([1], [0, 0])
+
+def test_target_coefficients():
+    assert syn.target_coefficients("(s**2 + 3*s + 2)/(s**2 + s + 1)") == ([2.0, 3.0, 1.0], [1.0, 1.0, 1.0])
+    assert syn.target_coefficients(1 / (s + 2)) == ([1.0], [2.0, 1.0])
+
+@pytest.fixture(scope='module')
+def index():
+    index = syn.SynthesisIndex()
+    index.update((desc, ast) for ast, desc in enumerate_networks(4))
+    return index
+
+@pytest.mark.parametrize("desc", ["(C|L)+R", "(C+R)|(L+R)", "(C|L)+R+R"])
+def test_query_finds_network_and_fit_realises_target(index, desc):
+    # A target taken from the network itself at known values is found
+    ast = parse_descriptor(desc)
+    Z = eval_canonical_impedance(ast)
+    values = {x: sp.Rational(k + 2, k + 1) for k, x in enumerate(sorted(Z.free_symbols - {s}, key=str))}
+    num, den = syn.target_coefficients(Z.subs(values))
+    assert desc in index.query(num, den)
+    fitted = index.fit(desc, num, den)
+    assert fitted is not None
+    Zfit = Z.subs({sp.Symbol(name, positive=True): v for name, v in fitted.items()})
+    for point in (0.5, 1.0, 3.0):
+        assert float(Zfit.subs(s, point)) == pytest.approx(float(Z.subs(values).subs(s, point)), rel=1e-6)
+
+def test_query_filters_counts(index):
+    num, den = [1, 0, 1], [0, 1]
+    keys = index.query(num, den)
+    assert 'C+L' in keys
+    assert index.query(num, den, counts={'L': 1, 'C': 1}) == ['C+L']
+    assert all(index.invariants(key).counts[0] == 0 for key in keys)
+    assert index.query([1, 1], [1, 1, 1, 1, 1, 1]) == []
+
+def test_fit_rejects_unrealisable_targets(index):
+    # Z(0) = 2 but Z(inf) = 1 needs a falling resistance, which R+(L|C) cannot give
+    assert index.fit('(C|L)+R', [2, 3, 1], [1, 0, 1]) is None
+    # Coefficients of mixed sign, and a target with another support pattern
+    assert index.fit('(C|L)+R', [1, -1, 1], [1, 0, 1]) is None
+    assert index.fit('C+L', [1, 1], [1]) is None
+
+def test_save_and_load_round_trip(index, tmp_path):
+    path = tmp_path / 'index.jsonl'
+    index.save(path)
+    loaded = syn.SynthesisIndex.load(path)
+    assert len(loaded) == len(index)
+    assert loaded.signatures() == index.signatures()
+    num, den = [2, 3, 1], [1, 1, 1]
+    assert loaded.query(num, den) == index.query(num, den)
+    assert loaded.invariants('C+L') == index.invariants('C+L')
+    assert [key for key, _ in loaded.realisations([1, 0, 1], [0, 1], counts={'L': 1, 'C': 1})] == ['C+L']
+
+def test_query_is_sub_millisecond(index):
+    num, den = [2, 3, 1], [1, 1, 1]
+    start = time.perf_counter()
+    for _ in range(1000):
+        index.query(num, den, counts={'R': 2})
+    assert (time.perf_counter() - start) / 1000 < 1e-3
+
+def test_build_index_from_catalogue():
+    rows = load_catalogue(CATALOGUES / '2019--MS-network-descriptors.csv')
+    index = build_index(CATALOGUES / '2019--MS-network-descriptors.csv')
+    # Rows whose descriptors do not parse are left out
+    parsed = [row for row in iter_parse_catalogue(rows) if 'error' not in row]
+    assert 0 < len(index) == len(parsed) < len(rows)
+    assert sum(index.signatures().values()) == len(parsed)
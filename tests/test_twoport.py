@@ -0,0 +1,82 @@
+import pytest
+import numpy as np
+import sympy as sp
+from pynntt.networks import parse_descriptor, eval_impedance, canonical_form, s
+from pynntt.numeric import compile_impedance, component_names
+from pynntt.polyring import eval_canonical_impedance
+from pynntt.twoport import abcd_matrix, chain_product, compile_abcd, input_impedance, twoport_sections
+
+R1, R2, L1, C1 = sp.symbols('R1 R2 L1 C1', positive=True)
+
+DESCRIPTORS = ["T<R,L,R>:[/C]", "P<C,R,C>", "[&R]:[/L]:[&C]:[/R]", "P<O,R,L>", "T<R+L,C|R,S>:[/R]",
+               "[&<(R&L)@(C&R)/L>]:[/C]", "[/S]:[/R]", "[/R]:[&O]:[/L]", "T<R,L,R>:[/C]:T<R,L,R>:[/C]"]
+
+def test_sections():
+    assert twoport_sections(parse_descriptor("T<R,L,C>:P<O,R,S>:[/L]")) == [
+        ('&', 'R'), ('/', 'L'), ('&', 'C'), ('/', 'O'), ('&', 'R'), ('/', 'S'), ('/', 'L')]
+
+def test_chain_product_is_ordered():
+    rng = np.random.default_rng(0)
+    mats = [tuple(map(tuple, rng.normal(size=(2, 2)))) for _ in range(7)]
+    expected = np.linalg.multi_dot([np.array(m) for m in mats])
+    np.testing.assert_allclose(np.array(chain_product(mats)), expected)
+
+def test_abcd_matrix_tee():
+    M = abcd_matrix(parse_descriptor("T<R,L,R>"))
+    Y = 1 / (L1 * s)
+    expected = sp.Matrix([[1, R1], [0, 1]]) * sp.Matrix([[1, 0], [Y, 1]]) * sp.Matrix([[1, R2], [0, 1]])
+    assert sp.simplify(M - expected) == sp.zeros(2, 2)
+    assert sp.simplify(M.det()) == 1
+
+def test_input_impedance_with_load():
+    M = abcd_matrix(parse_descriptor("T<R,L,R>"))
+    Z = input_impedance(tuple(map(tuple, M.tolist())), 1 / (C1 * s))
+    assert sp.cancel(Z - eval_impedance(parse_descriptor("T<R,L,R>:[/C]"))) == 0
+
+def test_open_input():
+    with pytest.raises(ValueError, match=r"open circuit"):
+        eval_canonical_impedance(parse_descriptor("[&O]:[/R]"))
+    with pytest.raises(ValueError, match=r"open circuit"):
+        compile_impedance(parse_descriptor("[&R]"))
+
+@pytest.mark.parametrize("desc", DESCRIPTORS)
+def test_engines_agree(desc):
+    ast = parse_descriptor(desc)
+    Z = canonical_form(eval_impedance(ast))
+    assert sp.cancel(eval_canonical_impedance(ast) - Z) == 0
+
+    kernel = compile_impedance(ast)
+    rng = np.random.default_rng(1)
+    omega = np.logspace(-2, 2, 7)
+    values = rng.uniform(0.5, 2.0, (5, len(kernel.components)))
+    symbols = [sp.Symbol(n, positive=True) for n in component_names(ast)]
+    f = sp.lambdify([s] + symbols, Z)
+    expected = np.array([[complex(f(1j * w, *row)) for w in omega] for row in values])
+    np.testing.assert_allclose(kernel(omega, values), expected, rtol=1e-10)
+    np.testing.assert_allclose(kernel(omega, values[0]), expected[0], rtol=1e-10)
+
+def test_ring_result_is_cancelled():
+    num, den = sp.fraction(eval_canonical_impedance(parse_descriptor("T<R,L,R>:[/C]:T<R,L,R>:[/C]")))
+    assert sp.degree(num, s) == 4 and sp.degree(den, s) == 4
+
+def test_compile_abcd_matches_symbolic():
+    ast = parse_descriptor("T<R,L,R+C>:P<C,R|L,O>")
+    kernel = compile_abcd(ast)
+    M = abcd_matrix(ast)
+    symbols = [sp.Symbol(n, positive=True) for n in kernel.components]
+    f = sp.lambdify([s] + symbols, M)
+    omega = np.array([0.3, 1.0, 4.0])
+    values = np.random.default_rng(2).uniform(0.5, 2.0, (3, len(symbols)))
+    out = kernel(omega, values)
+    assert out.shape == (3, 3, 2, 2)
+    for i, row in enumerate(values):
+        for j, w in enumerate(omega):
+            np.testing.assert_allclose(out[i, j], np.array(f(1j * w, *row), dtype=complex), rtol=1e-10)
+
+def test_catalogue_pipeline():
+    from pynntt.tools.evaluate_catalogue import evaluate_catalogue
+    rows = [{'id': 't', 'desc': "T<R,L,R>:[/C]"}, {'id': 'x', 'desc': "[&R]"}]
+    for engine in ('sympy', 'ring'):
+        results = evaluate_catalogue(rows, include_regular=True, engine=engine, screen=8)
+        assert results[0]['regular'] is True
+        assert results[1]['error'] == "Two-port input is an open circuit"